@@ -5,7 +5,6 @@ Arquitetura em camadas para melhor organização e manutenibilidade
 
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-from flasgger import Swagger
 
 # Instâncias globais
 db = SQLAlchemy()
@@ -21,78 +20,32 @@ def create_app():
     app.config.from_object(DatabaseConfig)
     app.config.from_object(AppConfig)
     
+    # Serialização JSON (orjson quando disponível, datas em ISO 8601)
+    from app.utils.json_provider import JSONProvider
+    app.json = JSONProvider(app, encoder=AppConfig.JSON_ENCODER)
+    
     # Inicializar extensões
     db.init_app(app)
     
-    # Configurar Swagger
-    swagger_config = {
-        "headers": [],
-        "specs": [
-            {
-                "endpoint": 'apispec',
-                "route": '/apispec.json',
-                "rule_filter": lambda rule: True,
-                "model_filter": lambda tag: True,
-            }
-        ],
-        "static_url_path": "/flasgger_static",
-        "swagger_ui": True,
-        "specs_route": "/docs"
-    }
+    # PRAGMAs do SQLite (WAL, busy_timeout, cache) em cada nova conexão
+    from app.core.sqlite import init_sqlite_pragmas
+    init_sqlite_pragmas(app, db, DatabaseConfig.SQLITE_PROFILE, {
+        'busy_timeout': DatabaseConfig.SQLITE_BUSY_TIMEOUT,
+        'cache_size': DatabaseConfig.SQLITE_CACHE_SIZE,
+        'mmap_size': DatabaseConfig.SQLITE_MMAP_SIZE
+    })
+    
+    # Documentação (Swagger UI e especificação OpenAPI)
+    from app.utils.api_docs import init_docs
+    init_docs(app)
     
-    swagger_template = {
-        "swagger": "2.0",
-        "info": {
-            "title": "Hello World Flask API",
-            "description": "API REST com autenticação JWT, API Keys e sistema de roles",
-            "version": "1.0.0",
-            "contact": {
-                "name": "API Support",
-                "email": "admin@system.com"
-            }
-        },
-        "host": "localhost:5000",
-        "basePath": "/",
-        "schemes": ["http", "https"],
-        "securityDefinitions": {
-            "Bearer": {
-                "type": "apiKey",
-                "name": "Authorization",
-                "in": "header",
-                "description": "JWT token no formato: Bearer {token}"
-            },
-            "ApiKey": {
-                "type": "apiKey",
-                "name": "X-API-Key",
-                "in": "header",
-                "description": "API Key para autenticação"
-            }
-        },
-        "tags": [
-            {
-                "name": "Main",
-                "description": "Endpoints principais da aplicação"
-            },
-            {
-                "name": "Auth",
-                "description": "Autenticação e autorização"
-            },
-            {
-                "name": "Users",
-                "description": "Gerenciamento de usuários"
-            },
-            {
-                "name": "API Keys",
-                "description": "Gerenciamento de API Keys"
-            },
-            {
-                "name": "Roles",
-                "description": "Sistema de roles e permissões"
-            }
-        ]
-    }
+    # Autenticação: credenciais lidas uma única vez por requisição
+    from app.utils.auth_context import init_auth
+    init_auth(app)
     
-    Swagger(app, config=swagger_config, template=swagger_template)
+    # Compressão gzip/brotli das respostas grandes
+    from app.utils.compression import init_compression
+    init_compression(app)
     
     # Registrar blueprints
     from app.controllers.main_controller import main_bp
@@ -100,19 +53,26 @@ def create_app():
     from app.controllers.auth_controller import auth_bp
     from app.controllers.api_key_controller import api_key_bp
     from app.controllers.role_controller import role_bp
+    from app.controllers.export_controller import export_bp
     
     app.register_blueprint(main_bp)
     app.register_blueprint(auth_bp, url_prefix='/api')
     app.register_blueprint(user_bp, url_prefix='/api')
     app.register_blueprint(api_key_bp, url_prefix='/api')
     app.register_blueprint(role_bp, url_prefix='/api')
+    app.register_blueprint(export_bp, url_prefix='/api')
+    
+    # Gravação em lote do último uso das API Keys
+    from app.services.api_key_usage_service import ApiKeyUsageService
+    ApiKeyUsageService.init_app(app)
+    
+    # Registrar comandos CLI
+    from app.cli import register_commands
+    register_commands(app)
     
-    # Criar tabelas do banco de dados
+    # Banco: só confere os carimbos de schema/seed (criação via flask init-db ou AUTO_INIT_DB)
+    from app.services.setup_service import SetupService
     with app.app_context():
-        db.create_all()
-        
-        # Inicializar dados padrão se necessário
-        from app.utils.seed_data import initialize_default_data
-        initialize_default_data()
+        SetupService.ensure_ready()
     
     return app
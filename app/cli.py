@@ -0,0 +1,106 @@
+"""
+Comandos de linha de comando da aplicação (flask <comando>)
+"""
+import os
+import click
+
+def register_commands(app):
+    """Registra os comandos CLI na aplicação"""
+    app.cli.add_command(calibrate_password_hash_command)
+    app.cli.add_command(export_command)
+    app.cli.add_command(build_spec_command)
+    app.cli.add_command(init_db_command)
+    app.cli.add_command(seed_command)
+
+def _write_env_value(env_file: str, name: str, value: str):
+    """Define (ou substitui) uma variável em um arquivo .env"""
+    lines = []
+    if os.path.exists(env_file):
+        with open(env_file, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    
+    entry = f'{name}={value}'
+    for index, line in enumerate(lines):
+        if line.split('=', 1)[0].strip() == name:
+            lines[index] = entry
+            break
+    else:
+        lines.append(entry)
+    
+    with open(env_file, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+
+@click.command('calibrate-password-hash')
+@click.option('--target-ms', default=50.0, show_default=True, help='Latência alvo por hash (ms)')
+@click.option('--algorithm', type=click.Choice(['scrypt', 'pbkdf2']), default='scrypt', show_default=True)
+@click.option('--samples', default=3, show_default=True, help='Medições por candidato')
+@click.option('--write-env', 'env_file', default=None, help='Grava PASSWORD_HASH_METHOD no arquivo .env informado')
+def calibrate_password_hash_command(target_ms, algorithm, samples, env_file):
+    """Mede o custo de hash neste host e sugere PASSWORD_HASH_METHOD"""
+    from app.core.hashing import calibrate
+    
+    method, elapsed = calibrate(target_ms, algorithm=algorithm, samples=samples)
+    
+    click.echo(f'Método escolhido: {method} ({elapsed:.1f} ms por hash, alvo {target_ms:.0f} ms)')
+    click.echo(f'PASSWORD_HASH_METHOD={method}')
+    
+    if env_file:
+        _write_env_value(env_file, 'PASSWORD_HASH_METHOD', method)
+        click.echo(f'Gravado em {env_file}. Hashes antigos serão atualizados no próximo login.')
+
+@click.command('export')
+@click.argument('entity', type=click.Choice(['users', 'roles', 'api_keys']))
+@click.option('--format', 'export_format', type=click.Choice(['ndjson', 'csv']), default='ndjson', show_default=True)
+@click.option('--output', '-o', type=click.File('w', encoding='utf-8', lazy=True), default='-', help='Arquivo de saída (padrão: stdout)')
+def export_command(entity, export_format, output):
+    """Exporta usuários, roles ou API Keys em stream (memória constante)"""
+    from app.services.export_service import ExportService
+    
+    for chunk in ExportService.stream(entity, export_format):
+        output.write(chunk)
+
+@click.command('build-spec')
+@click.option('--output', '-o', default=None, help='Arquivo de saída (padrão: OPENAPI_SPEC_FILE ou openapi.json)')
+def build_spec_command(output):
+    """Gera a especificação OpenAPI em um arquivo (servido em /apispec.json via OPENAPI_SPEC_FILE)"""
+    from flask import current_app
+    from app.config.app import AppConfig
+    from app.utils.api_docs import build_spec
+    
+    output = output or AppConfig.OPENAPI_SPEC_FILE or 'openapi.json'
+    spec = build_spec(current_app)
+    
+    with open(output, 'w', encoding='utf-8') as f:
+        f.write(current_app.json.dumps(spec))
+    
+    click.echo(f'Especificação OpenAPI gravada em {output} ({len(spec.get("paths", {}))} rotas)')
+    click.echo(f'OPENAPI_SPEC_FILE={output}')
+
+@click.command('init-db')
+@click.option('--seed/--no-seed', default=True, show_default=True, help='Aplica também os dados padrão (roles e admin)')
+def init_db_command(seed):
+    """Cria tabelas, índices e dados padrão e registra os carimbos de versão (executar uma vez por deploy)"""
+    from app.services.setup_service import SetupService
+    
+    success, message = SetupService.init_db()
+    click.echo(message)
+    if not success:
+        raise SystemExit(1)
+    
+    if seed:
+        seed_command.callback(test_client=False)
+
+@click.command('seed')
+@click.option('--test-client', is_flag=True, help='Cria também o usuário client@test.com')
+def seed_command(test_client):
+    """Aplica os dados padrão (roles e administrador) e registra o carimbo de seed"""
+    from app.services.setup_service import SetupService
+    
+    success, message = SetupService.seed()
+    click.echo(message)
+    if not success:
+        raise SystemExit(1)
+    
+    if test_client:
+        from app.utils.seed_data import create_test_client
+        create_test_client()
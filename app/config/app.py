@@ -21,6 +21,13 @@ class AppConfig:
     HOST = os.getenv('HOST', '0.0.0.0')
     PORT = int(os.getenv('PORT', 5000))
     
+    # Servidor de produção (gunicorn.conf.py): 0 = automático ((2 x CPUs) + 1 workers, 2 threads)
+    SERVER_WORKERS = int(os.getenv('SERVER_WORKERS', 0))
+    SERVER_THREADS = int(os.getenv('SERVER_THREADS', 0))
+    SERVER_TIMEOUT = int(os.getenv('SERVER_TIMEOUT', 30))
+    SERVER_KEEPALIVE = int(os.getenv('SERVER_KEEPALIVE', 5))
+    SERVER_ACCESS_LOG = os.getenv('SERVER_ACCESS_LOG', 'True').lower() == 'true'
+    
     # Configurações da API
     API_TITLE = 'Hello World Flask API'
     API_VERSION = '1.0.0'
@@ -31,6 +38,79 @@ class AppConfig:
     JWT_ALGORITHM = os.getenv('JWT_ALGORITHM', 'HS256')
     JWT_ACCESS_TOKEN_EXPIRES = int(os.getenv('JWT_ACCESS_TOKEN_EXPIRES', 3600))
     
+    # Cache de tokens JWT verificados
+    JWT_CACHE_ENABLED = os.getenv('JWT_CACHE_ENABLED', 'True').lower() == 'true'
+    JWT_CACHE_MAX_SIZE = int(os.getenv('JWT_CACHE_MAX_SIZE', 4096))
+    JWT_CACHE_TTL = int(os.getenv('JWT_CACHE_TTL', 300))
+    
+    # Cache de snapshots de usuários autenticados (principals); reutilizados só enquanto a versão
+    # de autorização não muda: entre workers, mudanças valem em até AUTHZ_VERSION_CACHE_TTL segundos
+    PRINCIPAL_CACHE_ENABLED = os.getenv('PRINCIPAL_CACHE_ENABLED', 'True').lower() == 'true'
+    PRINCIPAL_CACHE_MAX_SIZE = int(os.getenv('PRINCIPAL_CACHE_MAX_SIZE', 4096))
+    PRINCIPAL_CACHE_TTL = int(os.getenv('PRINCIPAL_CACHE_TTL', 60))
+    
+    # Roles/permissões embutidos no JWT (autorização sem consulta ao banco)
+    JWT_AUTHZ_CLAIMS_ENABLED = os.getenv('JWT_AUTHZ_CLAIMS_ENABLED', 'False').lower() == 'true'
+    AUTHZ_VERSION_CACHE_MAX_SIZE = int(os.getenv('AUTHZ_VERSION_CACHE_MAX_SIZE', 16384))
+    AUTHZ_VERSION_CACHE_TTL = int(os.getenv('AUTHZ_VERSION_CACHE_TTL', 5))
+    
+    # Catálogo de roles em memória (intervalo, em segundos, entre verificações de versão)
+    ROLE_CATALOG_CHECK_INTERVAL = float(os.getenv('ROLE_CATALOG_CHECK_INTERVAL', 5))
+    
+    # Hashing de senhas (pool de processos com fila limitada)
+    # Método/custo no formato do werkzeug; use "flask calibrate-password-hash" para escolher
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'scrypt')
+    PASSWORD_HASH_EXECUTOR = os.getenv('PASSWORD_HASH_EXECUTOR', 'process')
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 0))
+    PASSWORD_HASH_QUEUE_SIZE = int(os.getenv('PASSWORD_HASH_QUEUE_SIZE', 64))
+    PASSWORD_HASH_QUEUE_TIMEOUT = float(os.getenv('PASSWORD_HASH_QUEUE_TIMEOUT', 1.0))
+    
+    # Paginação da listagem de usuários
+    USERS_PAGE_SIZE = int(os.getenv('USERS_PAGE_SIZE', 50))
+    USERS_PAGE_MAX = int(os.getenv('USERS_PAGE_MAX', 200))
+    # Máximo de ocorrências de uma busca textual para ordenar por relevância (bm25)
+    USER_SEARCH_RANK_WINDOW = int(os.getenv('USER_SEARCH_RANK_WINDOW', 1000))
+    
+    # Importação de usuários em lote (linhas por transação e erros detalhados no resumo)
+    USER_IMPORT_CHUNK_SIZE = int(os.getenv('USER_IMPORT_CHUNK_SIZE', 500))
+    USER_IMPORT_MAX_ERRORS = int(os.getenv('USER_IMPORT_MAX_ERRORS', 1000))
+    
+    # Exportação em stream (linhas lidas do banco e enviadas por lote)
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 1000))
+    
+    # Preparação do banco: cria schema e dados padrão na inicialização se os carimbos estiverem desatualizados
+    # (desabilite em produção e rode flask init-db uma vez antes de subir os workers)
+    AUTO_INIT_DB = os.getenv('AUTO_INIT_DB', 'True').lower() == 'true'
+    
+    # Documentação: Swagger UI em /docs (importa o flasgger) e especificação pré-gerada (flask build-spec)
+    DOCS_ENABLED = os.getenv('DOCS_ENABLED', 'True').lower() == 'true'
+    OPENAPI_SPEC_FILE = os.getenv('OPENAPI_SPEC_FILE', '')
+    
+    # Encoder das respostas JSON: 'auto' (orjson se instalado), 'orjson' ou 'stdlib'
+    JSON_ENCODER = os.getenv('JSON_ENCODER', 'auto')
+    
+    # Compressão de respostas (gzip/brotli) acima de COMPRESSION_MIN_SIZE bytes
+    COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'True').lower() == 'true'
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+    COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', 6))
+    COMPRESSION_BROTLI_LEVEL = int(os.getenv('COMPRESSION_BROTLI_LEVEL', 4))
+    
     # Configurações API Key
     API_KEY_HEADER_NAME = os.getenv('API_KEY_HEADER_NAME', 'X-API-Key')
     API_KEY_DEFAULT_EXPIRES_DAYS = int(os.getenv('API_KEY_DEFAULT_EXPIRES_DAYS', 365))
+    
+    # Formato das novas API Keys: 'opaque' (aleatória) ou 'signed' (HMAC, validada sem banco)
+    API_KEY_FORMAT = os.getenv('API_KEY_FORMAT', 'opaque')
+    # Chaves de assinatura "kid:segredo,kid_antigo:segredo_antigo" (a primeira assina)
+    API_KEY_SIGNING_KEYS = os.getenv('API_KEY_SIGNING_KEYS', f'default:{SECRET_KEY}')
+    API_KEY_REVOCATION_REFRESH = int(os.getenv('API_KEY_REVOCATION_REFRESH', 30))
+    
+    # Cache de validação de API Keys (positivo e negativo)
+    API_KEY_CACHE_ENABLED = os.getenv('API_KEY_CACHE_ENABLED', 'True').lower() == 'true'
+    API_KEY_CACHE_MAX_SIZE = int(os.getenv('API_KEY_CACHE_MAX_SIZE', 4096))
+    API_KEY_CACHE_TTL = int(os.getenv('API_KEY_CACHE_TTL', 60))
+    API_KEY_NEGATIVE_CACHE_TTL = int(os.getenv('API_KEY_NEGATIVE_CACHE_TTL', 10))
+    
+    # Gravação em lote do último uso das API Keys (intervalo em segundos; 0 = só por tamanho)
+    API_KEY_USAGE_FLUSH_INTERVAL = float(os.getenv('API_KEY_USAGE_FLUSH_INTERVAL', 30))
+    API_KEY_USAGE_FLUSH_SIZE = int(os.getenv('API_KEY_USAGE_FLUSH_SIZE', 500))
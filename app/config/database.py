@@ -34,3 +34,15 @@ class DatabaseConfig:
     
     # Propriedade para a URL do banco
     SQLALCHEMY_DATABASE_URI = get_database_url()
+    
+    @staticmethod
+    def get_optional_int(name):
+        """Inteiro da variável de ambiente, ou None se não definida (usa o valor do perfil)"""
+        value = os.getenv(name, '')
+        return int(value) if value else None
+    
+    # Perfil de PRAGMAs do SQLite aplicado a cada conexão: performance (WAL), durable ou default
+    SQLITE_PROFILE = os.getenv('SQLITE_PROFILE', 'performance')
+    SQLITE_BUSY_TIMEOUT = get_optional_int('SQLITE_BUSY_TIMEOUT')
+    SQLITE_CACHE_SIZE = get_optional_int('SQLITE_CACHE_SIZE')
+    SQLITE_MMAP_SIZE = get_optional_int('SQLITE_MMAP_SIZE')
@@ -7,5 +7,6 @@ from .user_controller import user_bp
 from .auth_controller import auth_bp
 from .api_key_controller import api_key_bp
 from .role_controller import role_bp
+from .export_controller import export_bp
 
-__all__ = ['main_bp', 'user_bp', 'auth_bp', 'api_key_bp', 'role_bp']
\ No newline at end of file
+__all__ = ['main_bp', 'user_bp', 'auth_bp', 'api_key_bp', 'role_bp', 'export_bp']
\ No newline at end of file
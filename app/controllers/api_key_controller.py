@@ -2,6 +2,8 @@
 Controlador de API Key - Endpoints relacionados às API Keys
 """
 from flask import Blueprint, jsonify, request
+from app.core.fieldsets import parse_list_param
+from app.models.api_key import ApiKey
 from app.services.api_key_service import ApiKeyService
 from app.utils.auth_decorators import admin_required, token_required
 from app.utils.response_utils import ResponseUtils
@@ -9,13 +11,21 @@ from app.utils.response_utils import ResponseUtils
 # Criar blueprint
 api_key_bp = Blueprint('api_keys', __name__)
 
+# Relacionamentos aceitos em ?include=
+API_KEY_INCLUDES = ('user',)
+
 @api_key_bp.route('/api-keys', methods=['GET'])
 @admin_required
 def get_api_keys(current_user):
-    """Listar todas as API Keys (requer privilégios de admin)"""
+    """Listar todas as API Keys (requer privilégios de admin; aceita ?fields=id,name e ?include=user)"""
     try:
-        api_keys = ApiKeyService.get_all_api_keys()
-        api_keys_data = [api_key.to_dict() for api_key in api_keys]
+        try:
+            fields = parse_list_param(request.args.get('fields'), ApiKey.FIELDS, 'fields')
+            include = parse_list_param(request.args.get('include'), API_KEY_INCLUDES, 'include') or []
+        except ValueError as e:
+            return ResponseUtils.error_response(str(e), status_code=400)
+        
+        api_keys_data = ApiKeyService.list_api_keys(fields=fields, include_user='user' in include)
         total = ApiKeyService.get_api_keys_count()
         active_count = ApiKeyService.get_active_api_keys_count()
         
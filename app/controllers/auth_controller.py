@@ -2,6 +2,7 @@
 Controlador de autenticação - Endpoints relacionados à autenticação
 """
 from flask import Blueprint, jsonify, request
+from app.core.hashing import HashingBusyError
 from app.services.auth_service import AuthService
 from app.services.user_service import UserService
 from app.models.user import User
@@ -78,6 +79,8 @@ def register():
         description: Dados inválidos ou email já cadastrado
       500:
         description: Erro interno do servidor
+      503:
+        description: Servidor ocupado (fila de hashing de senhas cheia)
     """
     try:
         data = request.get_json()
@@ -98,7 +101,7 @@ def register():
         
         if success:
             # Criar token de acesso
-            access_token = AuthService.create_access_token(user.id)
+            access_token = AuthService.create_access_token(user.id, user=user)
             
             return ResponseUtils.success_response(
                 data={
@@ -112,6 +115,11 @@ def register():
         else:
             return ResponseUtils.error_response(message, status_code=400)
     
+    except HashingBusyError:
+        return ResponseUtils.unavailable_response(
+            'Servidor ocupado processando autenticações. Tente novamente em instantes.'
+        )
+    
     except Exception as e:
         return ResponseUtils.error_response(
             f'Erro interno do servidor: {str(e)}',
@@ -182,6 +190,8 @@ def login():
         description: Credenciais inválidas
       400:
         description: Dados inválidos
+      503:
+        description: Servidor ocupado (fila de hashing de senhas cheia)
     """
     try:
         data = request.get_json()
@@ -219,6 +229,11 @@ def login():
                 status_code=401
             )
     
+    except HashingBusyError:
+        return ResponseUtils.unavailable_response(
+            'Servidor ocupado processando autenticações. Tente novamente em instantes.'
+        )
+    
     except Exception as e:
         return ResponseUtils.error_response(
             f'Erro interno do servidor: {str(e)}',
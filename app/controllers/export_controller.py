@@ -0,0 +1,65 @@
+"""
+Controlador de exportação - Endpoints de exportação em stream
+"""
+from datetime import datetime
+from flask import Blueprint, Response, request, stream_with_context
+from app.services.export_service import ExportService, EXPORTS, EXPORT_FORMATS
+from app.utils.auth_decorators import admin_required
+from app.utils.response_utils import ResponseUtils
+
+# Criar blueprint
+export_bp = Blueprint('export', __name__)
+
+@export_bp.route('/export/<entity>', methods=['GET'])
+@admin_required
+def export_entity(current_user, entity):
+    """
+    Exportar usuários, roles ou API Keys (requer privilégios de admin)
+    ---
+    tags:
+      - Export
+    summary: Exportação em stream (NDJSON ou CSV)
+    description: Percorre a tabela em lotes e envia as linhas à medida que são lidas, com memória constante
+    security:
+      - Bearer: []
+    produces:
+      - application/x-ndjson
+      - text/csv
+    parameters:
+      - name: entity
+        in: path
+        type: string
+        required: true
+        enum: [users, roles, api_keys]
+      - name: format
+        in: query
+        type: string
+        enum: [ndjson, csv]
+        default: ndjson
+    responses:
+      200:
+        description: Arquivo exportado (uma linha por registro)
+      400:
+        description: Formato não suportado
+      404:
+        description: Entidade não encontrada
+    """
+    if entity not in EXPORTS:
+        return ResponseUtils.error_response(
+            f'Entidade não suportada. Use: {", ".join(EXPORTS)}',
+            status_code=404
+        )
+    
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return ResponseUtils.error_response(
+            'Formato não suportado. Use ndjson ou csv',
+            status_code=400
+        )
+    
+    filename = f'{entity}-{datetime.utcnow():%Y%m%d%H%M%S}.{export_format}'
+    return Response(
+        stream_with_context(ExportService.stream(entity, export_format)),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
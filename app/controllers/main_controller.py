@@ -1,12 +1,74 @@
 """
 Controlador principal - Endpoints gerais da API
 """
-from flask import Blueprint, jsonify
+from flask import Blueprint, current_app
 from app.config.app import AppConfig
+from app.core.hashing import password_hasher
+from app.services.api_key_service import ApiKeyService
+from app.services.api_key_usage_service import ApiKeyUsageService
+from app.services.auth_service import AuthService
+from app.services.authz_version_service import AuthzVersionService
+from app.services.role_service import RoleService
+from app.utils.auth_decorators import admin_required
+from app.utils.precomputed_response import PrecomputedResponse
+from app.utils.response_utils import ResponseUtils
 
 # Criar blueprint
 main_bp = Blueprint('main', __name__)
 
+# Conteúdo fixo de / e /health
+HELLO_PAYLOAD = {
+    'message': 'Hello, World!',
+    'status': 'success',
+    'api': 'Flask API com SQLite - Arquitetura em Camadas'
+}
+
+HEALTH_PAYLOAD = {
+    'status': 'healthy',
+    'message': 'API está funcionando corretamente',
+    'database': 'SQLite conectado',
+    'architecture': 'Layered Architecture'
+}
+
+@main_bp.record_once
+def _precompute_responses(state):
+    """Codifica as respostas constantes uma única vez, no registro do blueprint"""
+    state.app.extensions['main_responses'] = {
+        'hello': PrecomputedResponse.from_json(state.app, HELLO_PAYLOAD),
+        'health': PrecomputedResponse.from_json(state.app, HEALTH_PAYLOAD)
+    }
+
+def _build_info(app) -> dict:
+    """Monta as informações da API a partir das rotas registradas (app.url_map)"""
+    endpoints = []
+    for rule in sorted(app.url_map.iter_rules(), key=lambda rule: rule.rule):
+        if rule.endpoint.endswith('static'):
+            continue
+        
+        view = app.view_functions.get(rule.endpoint)
+        doc = (getattr(view, '__doc__', None) or '').strip()
+        description = doc.splitlines()[0].strip() if doc else ''
+        
+        for method in sorted(rule.methods - {'HEAD', 'OPTIONS'}):
+            endpoints.append({'path': rule.rule, 'method': method, 'description': description})
+    
+    return {
+        'name': AppConfig.API_TITLE,
+        'version': AppConfig.API_VERSION,
+        'description': AppConfig.API_DESCRIPTION,
+        'database': 'SQLite',
+        'architecture': 'Layered Architecture (Models, Services, Controllers)',
+        'endpoints': endpoints
+    }
+
+def get_info_response(app) -> PrecomputedResponse:
+    """Resposta de /info, gerada na primeira chamada, quando todas as rotas já estão registradas"""
+    responses = app.extensions['main_responses']
+    info = responses.get('info')
+    if info is None:
+        info = responses['info'] = PrecomputedResponse.from_json(app, _build_info(app))
+    return info
+
 @main_bp.route('/')
 def hello_world():
     """
@@ -32,11 +94,7 @@ def hello_world():
               type: string
               example: Flask API com SQLite - Arquitetura em Camadas
     """
-    return jsonify({
-        'message': 'Hello, World!',
-        'status': 'success',
-        'api': 'Flask API com SQLite - Arquitetura em Camadas'
-    })
+    return current_app.extensions['main_responses']['hello'].make_response()
 
 @main_bp.route('/health')
 def health_check():
@@ -66,30 +124,26 @@ def health_check():
               type: string
               example: Layered Architecture
     """
-    return jsonify({
-        'status': 'healthy',
-        'message': 'API está funcionando corretamente',
-        'database': 'SQLite conectado',
-        'architecture': 'Layered Architecture'
-    })
+    return current_app.extensions['main_responses']['health'].make_response()
 
 @main_bp.route('/info')
 def api_info():
-    """Endpoint que retorna informações sobre a API"""
-    return jsonify({
-        'name': AppConfig.API_TITLE,
-        'version': AppConfig.API_VERSION,
-        'description': AppConfig.API_DESCRIPTION,
-        'database': 'SQLite',
-        'architecture': 'Layered Architecture (Models, Services, Controllers)',
-        'endpoints': [
-            {'path': '/', 'method': 'GET', 'description': 'Mensagem de boas-vindas'},
-            {'path': '/health', 'method': 'GET', 'description': 'Verificação de saúde da API'},
-            {'path': '/info', 'method': 'GET', 'description': 'Informações sobre a API'},
-            {'path': '/api/users', 'method': 'GET', 'description': 'Listar todos os usuários'},
-            {'path': '/api/users', 'method': 'POST', 'description': 'Criar novo usuário'},
-            {'path': '/api/users/<id>', 'method': 'GET', 'description': 'Buscar usuário por ID'},
-            {'path': '/api/users/<id>', 'method': 'PUT', 'description': 'Atualizar usuário'},
-            {'path': '/api/users/<id>', 'method': 'DELETE', 'description': 'Deletar usuário'}
-        ]
-    })
+    """Endpoint que retorna informações sobre a API (rotas lidas do url_map na primeira chamada)"""
+    return get_info_response(current_app).make_response()
+
+@main_bp.route('/metrics')
+@admin_required
+def metrics(current_user):
+    """Métricas internas de caches e filas (requer privilégios de admin)"""
+    return ResponseUtils.success_response(
+        data={
+            'token_cache': AuthService.get_token_cache_stats(),
+            'principal_cache': AuthService.get_principal_cache_stats(),
+            'authz_version_cache': AuthzVersionService.get_cache_stats(),
+            'api_key_cache': ApiKeyService.get_api_key_cache_stats(),
+            'role_catalog': RoleService.get_role_catalog_stats(),
+            'password_hashing': password_hasher.stats(),
+            'api_key_usage': ApiKeyUsageService.get_stats()
+        },
+        message='Métricas obtidas com sucesso'
+    )
@@ -2,6 +2,8 @@
 Controlador de Role - Endpoints relacionados aos roles
 """
 from flask import Blueprint, jsonify, request
+from app.core.fieldsets import parse_list_param
+from app.models.role import Role
 from app.services.role_service import RoleService
 from app.utils.auth_decorators import admin_required, token_required
 from app.utils.response_utils import ResponseUtils
@@ -22,6 +24,11 @@ def get_roles(current_user):
     description: Retorna todos os roles do sistema (requer privilégios de admin)
     security:
       - Bearer: []
+    parameters:
+      - name: fields
+        in: query
+        type: string
+        description: "Campos a retornar, separados por vírgula (ex: id,name)"
     responses:
       200:
         description: Lista de roles obtida com sucesso
@@ -63,14 +70,22 @@ def get_roles(current_user):
                 total:
                   type: integer
                   example: 3
+      400:
+        description: Parâmetro fields inválido
       401:
         description: Token JWT obrigatório
       403:
         description: Privilégios de administrador necessários
     """
     try:
+        try:
+            fields = parse_list_param(request.args.get('fields'), Role.FIELDS, 'fields')
+        except ValueError as e:
+            return ResponseUtils.error_response(str(e), status_code=400)
+        
+        # Os roles vêm do catálogo em memória: fields só reduz a serialização
         roles = RoleService.get_all_roles()
-        roles_data = [role.to_dict() for role in roles]
+        roles_data = [role.to_dict(fields=fields) for role in roles]
         total = RoleService.get_roles_count()
         
         return ResponseUtils.success_response(
@@ -1,7 +1,13 @@
 """
 Controlador de usuário - Endpoints relacionados aos usuários
 """
+from datetime import datetime
 from flask import Blueprint, jsonify, request
+from app.core.fieldsets import parse_list_param
+from app.core.hashing import HashingBusyError
+from app.models.user import User
+from app.services.user_import_service import UserImportService
+from app.services.user_search_service import UserSearchService
 from app.services.user_service import UserService
 from app.utils.auth_decorators import token_required, admin_required, auth_or_api_key_required
 from app.utils.response_utils import ResponseUtils
@@ -9,19 +15,113 @@ from app.utils.response_utils import ResponseUtils
 # Criar blueprint
 user_bp = Blueprint('users', __name__)
 
+# Relacionamentos aceitos em ?include=
+USER_INCLUDES = ('roles', 'api_keys')
+
+def _parse_list_args(args):
+    """
+    Interpreta os parâmetros de listagem de usuários
+    
+    Raises:
+        ValueError: Se algum parâmetro for inválido
+    """
+    def parse_bool(name):
+        value = args.get(name)
+        if value is None:
+            return None
+        if value.lower() in ('true', '1'):
+            return True
+        if value.lower() in ('false', '0'):
+            return False
+        raise ValueError(f'Parâmetro {name} deve ser true ou false')
+    
+    def parse_datetime(name):
+        value = args.get(name)
+        if not value:
+            return None
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            raise ValueError(f'Parâmetro {name} deve estar no formato ISO 8601')
+    
+    limit = args.get('limit')
+    if limit is not None and not limit.isdigit():
+        raise ValueError('Parâmetro limit deve ser um número inteiro')
+    
+    filters = {
+        'is_active': parse_bool('is_active'),
+        'email_domain': args.get('email_domain'),
+        'created_from': parse_datetime('created_from'),
+        'created_to': parse_datetime('created_to')
+    }
+    
+    include = parse_list_param(args.get('include'), USER_INCLUDES, 'include') or []
+    
+    return {
+        'filters': filters,
+        'limit': int(limit) if limit is not None else None,
+        'cursor': args.get('cursor'),
+        'include_total': bool(parse_bool('include_total')),
+        'include_roles': bool(parse_bool('include_roles')) or 'roles' in include,
+        'include_api_keys': 'api_keys' in include,
+        'fields': parse_list_param(args.get('fields'), User.FIELDS, 'fields')
+    }
+
 @user_bp.route('/users', methods=['GET'])
 @auth_or_api_key_required
 def get_users(current_user=None, current_api_key=None):
     """
-    Listar todos os usuários
+    Listar usuários (paginação por cursor)
     ---
     tags:
       - Users
     summary: Obter lista de usuários
-    description: Retorna todos os usuários do sistema (requer JWT token ou API Key)
+    description: Retorna os usuários em páginas ordenadas por data de criação (requer JWT token ou API Key)
     security:
       - Bearer: []
       - ApiKey: []
+    parameters:
+      - name: limit
+        in: query
+        type: integer
+        description: Itens por página (limitado por USERS_PAGE_MAX)
+      - name: cursor
+        in: query
+        type: string
+        description: Valor de next_cursor da página anterior
+      - name: is_active
+        in: query
+        type: boolean
+      - name: email_domain
+        in: query
+        type: string
+        example: email.com
+      - name: created_from
+        in: query
+        type: string
+        format: date-time
+        description: Criados a partir de (inclusivo)
+      - name: created_to
+        in: query
+        type: string
+        format: date-time
+        description: Criados antes de (exclusivo)
+      - name: include_total
+        in: query
+        type: boolean
+        description: Inclui a contagem exata de usuários que atendem aos filtros
+      - name: include_roles
+        in: query
+        type: boolean
+        description: Inclui roles, nomes dos roles e permissões de cada usuário
+      - name: fields
+        in: query
+        type: string
+        description: "Campos a retornar, separados por vírgula (ex: id,email)"
+      - name: include
+        in: query
+        type: string
+        description: "Relacionamentos a incluir: roles, api_keys (ex: roles,api_keys)"
     responses:
       200:
         description: Lista de usuários obtida com sucesso
@@ -57,26 +157,96 @@ def get_users(current_user=None, current_api_key=None):
                       created_at:
                         type: string
                         format: date-time
+                next_cursor:
+                  type: string
+                  description: Cursor da próxima página (null na última)
+                limit:
+                  type: integer
+                  example: 50
                 total:
                   type: integer
                   example: 5
+                  description: Presente apenas com include_total=true
+      400:
+        description: Parâmetros de listagem inválidos
       401:
         description: Token JWT ou API Key obrigatório
       403:
         description: Usuário sem roles atribuídos
     """
     try:
-        users = UserService.get_all_users()
-        users_data = [user.to_dict() for user in users]
-        total = UserService.get_users_count()
+        try:
+            list_args = _parse_list_args(request.args)
+        except ValueError as e:
+            return ResponseUtils.error_response(str(e), status_code=400)
         
-        return ResponseUtils.success_response(
-            data={
-                'users': users_data,
-                'total': total
-            },
-            message='Usuários listados com sucesso'
+        page, success, message = UserService.list_users(**list_args)
+        if not success:
+            return ResponseUtils.error_response(message, status_code=400)
+        
+        return ResponseUtils.success_response(data=page, message=message)
+    
+    except Exception as e:
+        return ResponseUtils.error_response(
+            f'Erro interno do servidor: {str(e)}',
+            status_code=500
         )
+
+@user_bp.route('/users/search', methods=['GET'])
+@auth_or_api_key_required
+def search_users(current_user=None, current_api_key=None):
+    """
+    Buscar usuários por nome ou email
+    ---
+    tags:
+      - Users
+    summary: Busca textual de usuários
+    description: Busca por prefixo de palavras do nome ou do email, com resultados ordenados por relevância (requer JWT token ou API Key)
+    security:
+      - Bearer: []
+      - ApiKey: []
+    parameters:
+      - name: q
+        in: query
+        type: string
+        required: true
+        example: joa silva
+      - name: limit
+        in: query
+        type: integer
+        description: Itens por página (limitado por USERS_PAGE_MAX)
+      - name: offset
+        in: query
+        type: integer
+        description: Valor de next_offset da página anterior
+    responses:
+      200:
+        description: Busca realizada com sucesso
+      400:
+        description: Parâmetros de busca inválidos
+      401:
+        description: Token JWT ou API Key obrigatório
+    """
+    try:
+        limit = request.args.get('limit')
+        offset = request.args.get('offset', '0')
+        if (limit is not None and not limit.isdigit()) or not offset.isdigit():
+            return ResponseUtils.error_response(
+                'Parâmetros limit e offset devem ser números inteiros',
+                status_code=400
+            )
+        
+        page, success, message = UserSearchService.search(
+            request.args.get('q', ''),
+            limit=int(limit) if limit is not None else None,
+            offset=int(offset)
+        )
+        if not success:
+            return ResponseUtils.error_response(message, status_code=400)
+        
+        page['users'] = [user.to_dict() for user in page['users']]
+        
+        return ResponseUtils.success_response(data=page, message=message)
     
     except Exception as e:
         return ResponseUtils.error_response(
@@ -108,6 +278,68 @@ def create_user(current_user):
         else:
             return ResponseUtils.error_response(message, status_code=400)
     
+    except HashingBusyError:
+        return ResponseUtils.unavailable_response(
+            'Servidor ocupado processando senhas. Tente novamente em instantes.'
+        )
+    
+    except Exception as e:
+        return ResponseUtils.error_response(
+            f'Erro interno do servidor: {str(e)}',
+            status_code=500
+        )
+
+@user_bp.route('/users/import', methods=['POST'])
+@admin_required
+def import_users(current_user):
+    """
+    Importar usuários em lote (requer privilégios de admin)
+    ---
+    tags:
+      - Users
+    summary: Importação de usuários via NDJSON ou CSV
+    description: |
+      O corpo é lido como stream, uma linha por usuário (campos name, email, password
+      e opcionalmente is_active). Cada usuário recebe o role client. Linhas inválidas
+      são relatadas no resumo sem interromper a importação.
+    security:
+      - Bearer: []
+    consumes:
+      - application/x-ndjson
+      - text/csv
+    parameters:
+      - name: format
+        in: query
+        type: string
+        enum: [ndjson, csv]
+        description: Formato do corpo (padrão - deduzido do Content-Type)
+    responses:
+      200:
+        description: Importação processada (ver created, failed e errors)
+      400:
+        description: Formato não suportado
+      403:
+        description: Acesso negado
+    """
+    try:
+        import_format = UserImportService.detect_format(request.mimetype, request.args.get('format'))
+        if not import_format:
+            return ResponseUtils.error_response(
+                'Formato não suportado. Use application/x-ndjson ou text/csv (ou ?format=ndjson|csv)',
+                status_code=400
+            )
+        
+        rows = UserImportService.iter_rows(request.stream, import_format)
+        summary = UserImportService.import_users(rows)
+        
+        return ResponseUtils.success_response(
+            data=summary,
+            message=f'Importação concluída: {summary["created"]} criados, {summary["failed"]} com erro'
+        )
+    
+    except UnicodeDecodeError:
+        return ResponseUtils.error_response('O arquivo deve estar em UTF-8', status_code=400)
+    
     except Exception as e:
         return ResponseUtils.error_response(
             f'Erro interno do servidor: {str(e)}',
@@ -117,9 +349,10 @@ def create_user(current_user):
 @user_bp.route('/users/<int:user_id>', methods=['GET'])
 @token_required
 def get_user(current_user, user_id):
-    """Buscar usuário por ID (requer autenticação)"""
+    """Buscar usuário por ID (requer autenticação; ?include_roles=true inclui roles e permissões)"""
     try:
-        user = UserService.get_user_by_id(user_id)
+        include_roles = request.args.get('include_roles', 'false').lower() in ('true', '1')
+        user = UserService.get_user_by_id(user_id, include_roles=include_roles)
         
         if not user:
             return ResponseUtils.error_response(
@@ -128,7 +361,7 @@ def get_user(current_user, user_id):
             )
         
         return ResponseUtils.success_response(
-            data={'user': user.to_dict()},
+            data={'user': user.to_dict(include_roles=include_roles)},
             message='Usuário encontrado com sucesso'
         )
     
@@ -169,6 +402,11 @@ def update_user(current_user, user_id):
             status_code = 404 if 'não encontrado' in message.lower() else 400
             return ResponseUtils.error_response(message, status_code=status_code)
     
+    except HashingBusyError:
+        return ResponseUtils.unavailable_response(
+            'Servidor ocupado processando senhas. Tente novamente em instantes.'
+        )
+    
     except Exception as e:
         return ResponseUtils.error_response(
             f'Erro interno do servidor: {str(e)}',
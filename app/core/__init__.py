@@ -0,0 +1,11 @@
+"""
+Infraestrutura compartilhada - Componentes usados por modelos e serviços
+"""
+
+from .cache import TTLCache
+from .hashing import PasswordHasher, HashingBusyError, password_hasher
+from .permissions import PermissionRegistry, permission_registry
+from .projection import Projection, get_projection
+
+__all__ = ['TTLCache', 'PasswordHasher', 'HashingBusyError', 'password_hasher', 'PermissionRegistry', 'permission_registry',
+           'Projection', 'get_projection']
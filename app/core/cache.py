@@ -0,0 +1,93 @@
+"""
+Cache em memória LRU com limite de tamanho e expiração por entrada
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+class TTLCache:
+    """Cache LRU thread-safe com tempo de vida (TTL) por entrada"""
+    
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        """
+        Args:
+            maxsize: Número máximo de entradas antes de descartar as menos usadas
+            ttl: Tempo de vida padrão das entradas em segundos (None = sem expiração)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Retorna o valor armazenado ou default se ausente/expirado"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._data[key]
+                self.misses += 1
+                return default
+            
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, expires_at: Optional[float] = None):
+        """
+        Armazena um valor no cache
+        
+        Args:
+            key: Chave da entrada
+            value: Valor a armazenar
+            ttl: TTL específico da entrada (sobrepõe o padrão)
+            expires_at: Instante absoluto (epoch) máximo de validade da entrada
+        """
+        if self.maxsize <= 0:
+            return
+        
+        ttl = self.ttl if ttl is None else ttl
+        deadline = time.time() + ttl if ttl is not None else None
+        if expires_at is not None:
+            deadline = expires_at if deadline is None else min(deadline, expires_at)
+        
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+            self._data[key] = (value, deadline)
+            
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+    
+    def delete(self, key: Hashable):
+        """Remove uma entrada do cache, se existir"""
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def clear(self):
+        """Remove todas as entradas do cache"""
+        with self._lock:
+            self._data.clear()
+    
+    def __len__(self):
+        return len(self._data)
+    
+    def stats(self) -> dict:
+        """Retorna os contadores de uso do cache"""
+        with self._lock:
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
@@ -0,0 +1,45 @@
+"""
+Fieldsets - Seleção de campos (?fields=) e inclusões (?include=) nas listagens
+"""
+from typing import Callable, Dict, Iterable, List, Optional
+from sqlalchemy.orm import load_only
+
+def parse_list_param(value: Optional[str], allowed: Iterable[str], name: str) -> Optional[List[str]]:
+    """
+    Interpreta um parâmetro separado por vírgulas (ex: "id,email")
+    
+    Returns:
+        Optional[List[str]]: Itens na ordem informada, sem repetição (None se ausente)
+    
+    Raises:
+        ValueError: Se algum item não for permitido
+    """
+    if value is None:
+        return None
+    
+    items = list(dict.fromkeys(item.strip() for item in value.split(',') if item.strip()))
+    invalid = [item for item in items if item not in allowed]
+    if invalid:
+        raise ValueError(f"Parâmetro {name} inválido: {', '.join(invalid)} (use {', '.join(allowed)})")
+    return items
+
+def load_only_fields(model, fields: Iterable[str], required: Iterable[str] = ('id',)):
+    """
+    Opção load_only com apenas as colunas necessárias para os campos pedidos
+    
+    Campos calculados declaram suas colunas em model.FIELD_COLUMNS
+    (ex: is_expired depende de expires_at); os demais são a própria coluna.
+    """
+    field_columns = getattr(model, 'FIELD_COLUMNS', {})
+    columns = dict.fromkeys(required)
+    for field in fields:
+        columns.update(dict.fromkeys(field_columns.get(field, (field,))))
+    return load_only(*(getattr(model, column) for column in columns))
+
+def serialize_fields(obj, fields: Iterable[str], computed: Dict[str, Callable] = None) -> dict:
+    """Serializa apenas os campos pedidos (datas ficam como datetime, como em to_dict)"""
+    computed = computed or {}
+    return {
+        field: computed[field](obj) if field in computed else getattr(obj, field)
+        for field in fields
+    }
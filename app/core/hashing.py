@@ -0,0 +1,258 @@
+"""
+Executor dedicado para hashing de senhas com concorrência limitada
+"""
+import multiprocessing
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import List, Tuple
+from werkzeug.security import generate_password_hash, check_password_hash
+from app.config.app import AppConfig
+
+class HashingBusyError(Exception):
+    """Fila de hashing de senhas cheia: a requisição deve ser recusada (503)"""
+
+class PasswordHasher:
+    """Executa hash/verificação de senhas fora da thread da requisição"""
+    
+    def __init__(self, workers: int = 0, queue_size: int = 64, queue_timeout: float = 1.0, executor: str = 'process'):
+        """
+        Args:
+            workers: Processos do pool (0 = número de CPUs)
+            queue_size: Operações que podem aguardar além das em execução
+            queue_timeout: Tempo máximo (s) aguardando uma vaga antes de recusar
+            executor: 'process' (pool de processos) ou 'inline' (thread da requisição)
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.executor = executor
+        self._lock = threading.Lock()
+        self._reset()
+    
+    def _reset(self):
+        """(Re)inicializa o estado do processo atual (também após um fork)"""
+        self._pid = os.getpid()
+        self._pool = None
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+    
+    def _get_pool(self):
+        """
+        Cria o pool de processos sob demanda
+        
+        Com fork, o executor cria todos os processos no primeiro submit. Se
+        houver outras threads nesse momento (threads da requisição, flusher de
+        uso das API Keys), um lock mantido por elas pode ficar preso nos filhos:
+        no servidor de produção o pool é iniciado antes, por start().
+        """
+        if self.executor != 'process':
+            return None
+        
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    # fork evita reimportar o módulo principal (e recriar a aplicação) nos filhos
+                    methods = multiprocessing.get_all_start_methods()
+                    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+                    self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        return self._pool
+    
+    def _acquire(self):
+        """Ocupa uma vaga da fila, aguardando no máximo queue_timeout"""
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self.rejected += 1
+            raise HashingBusyError('Fila de hashing de senhas cheia')
+        
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+    
+    def _release(self, start: float):
+        """Libera a vaga de uma operação concluída e registra sua latência"""
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+            self.total_latency += elapsed
+            self.max_latency = max(self.max_latency, elapsed)
+        self._slots.release()
+    
+    def _run(self, fn, *args):
+        """Executa uma operação respeitando o limite de concorrência"""
+        if self._pid != os.getpid():
+            self._reset()
+        
+        self._acquire()
+        start = time.perf_counter()
+        try:
+            pool = self._get_pool()
+            if pool is None:
+                return fn(*args)
+            return pool.submit(fn, *args).result()
+        finally:
+            self._release(start)
+    
+    def hash(self, password: str, method: str = None) -> str:
+        """Gera o hash de uma senha (método padrão do werkzeug se omitido)"""
+        if method is None:
+            return self._run(generate_password_hash, password)
+        return self._run(generate_password_hash, password, method)
+    
+    def hash_many(self, passwords: List[str], method: str = None) -> List[str]:
+        """
+        Gera os hashes de várias senhas (método padrão do werkzeug se omitido)
+        
+        Cada senha ocupa sua própria vaga, com o mesmo timeout das operações
+        interativas, e no máximo `workers` ficam em andamento ao mesmo tempo:
+        logins intercalam com o lote em vez de esperar por ele inteiro.
+        
+        Raises:
+            HashingBusyError: Fila cheia além do timeout (o restante do lote é cancelado)
+        """
+        if not passwords:
+            return []
+        
+        args = () if method is None else (method,)
+        if self._pid != os.getpid():
+            self._reset()
+        
+        pool = self._get_pool()
+        if pool is None:
+            return [self._run(generate_password_hash, password, *args) for password in passwords]
+        
+        results = []
+        pending = deque()
+        try:
+            for password in passwords:
+                if len(pending) >= self.workers:
+                    results.append(pending.popleft().result())
+                
+                self._acquire()
+                start = time.perf_counter()
+                try:
+                    future = pool.submit(generate_password_hash, password, *args)
+                except BaseException:
+                    self._release(start)
+                    raise
+                future.add_done_callback(lambda _, start=start: self._release(start))
+                pending.append(future)
+            
+            while pending:
+                results.append(pending.popleft().result())
+            return results
+        
+        finally:
+            # Erro no meio do lote: não deixar hashes pendentes ocupando o pool
+            for future in pending:
+                future.cancel()
+    
+    def check(self, password_hash: str, password: str) -> bool:
+        """Verifica uma senha contra o hash armazenado"""
+        return self._run(check_password_hash, password_hash, password)
+    
+    def start(self):
+        """
+        Cria o pool e seus processos agora, enquanto o processo tem uma só thread
+        
+        Chamado no post_fork do gunicorn, antes das threads do worker existirem.
+        """
+        if self._pid != os.getpid():
+            self._reset()
+        
+        pool = self._get_pool()
+        if pool is not None:
+            # Uma tarefa vazia força o fork de todos os processos do pool
+            pool.submit(int).result()
+    
+    def shutdown(self):
+        """Encerra o pool deste processo (ex: no mestre do servidor, antes do fork dos workers)"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None and self._pid == os.getpid():
+            pool.shutdown(wait=True)
+    
+    def stats(self) -> dict:
+        """Retorna as métricas de fila e latência do hashing"""
+        with self._lock:
+            return {
+                'executor': self.executor,
+                'workers': self.workers,
+                'queue_size': self.queue_size,
+                'in_flight': self.in_flight,
+                'queue_depth': max(0, self.in_flight - self.workers),
+                'max_in_flight': self.max_in_flight,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'avg_latency_ms': round(self.total_latency / self.completed * 1000, 2) if self.completed else 0.0,
+                'max_latency_ms': round(self.max_latency * 1000, 2)
+            }
+
+@lru_cache(maxsize=None)
+def normalize_method(method: str) -> str:
+    """
+    Retorna o método completo (com parâmetros) que o werkzeug grava no hash
+    
+    Ex.: 'scrypt' -> 'scrypt:32768:8:1', 'pbkdf2' -> 'pbkdf2:sha256:1000000'
+    """
+    return generate_password_hash('', method).split('$', 1)[0]
+
+def measure_method(method: str, samples: int = 3) -> float:
+    """Mede o tempo mediano (ms) de um hash com o método informado"""
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        generate_password_hash('calibration-password', method)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+def calibrate(target_ms: float, algorithm: str = 'scrypt', samples: int = 3) -> Tuple[str, float]:
+    """
+    Escolhe o maior custo de hash que cabe no orçamento de latência neste host
+    
+    Args:
+        target_ms: Latência alvo por hash em milissegundos
+        algorithm: 'scrypt' ou 'pbkdf2'
+        samples: Medições por candidato (usa a mediana)
+    
+    Returns:
+        Tuple[str, float]: (método para PASSWORD_HASH_METHOD, tempo medido em ms)
+    """
+    if algorithm == 'scrypt':
+        # Custo dobra a cada potência de 2; r=8, p=1 como no padrão do werkzeug
+        best = None
+        for exponent in range(10, 19):
+            method = f'scrypt:{2 ** exponent}:8:1'
+            elapsed = measure_method(method, samples)
+            if best is not None and elapsed > target_ms:
+                break
+            best = (method, elapsed)
+        return best
+    
+    if algorithm == 'pbkdf2':
+        # Custo linear no número de iterações: extrapola a partir de uma amostra
+        base_iterations = 10000
+        elapsed = measure_method(f'pbkdf2:sha256:{base_iterations}', samples)
+        iterations = max(base_iterations, int(base_iterations * target_ms / elapsed) // 1000 * 1000)
+        method = f'pbkdf2:sha256:{iterations}'
+        return method, measure_method(method, samples)
+    
+    raise ValueError(f'Algoritmo de hash não suportado: {algorithm}')
+
+# Instância global usada pelos modelos
+password_hasher = PasswordHasher(
+    workers=AppConfig.PASSWORD_HASH_WORKERS,
+    queue_size=AppConfig.PASSWORD_HASH_QUEUE_SIZE,
+    queue_timeout=AppConfig.PASSWORD_HASH_QUEUE_TIMEOUT,
+    executor=AppConfig.PASSWORD_HASH_EXECUTOR
+)
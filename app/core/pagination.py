@@ -0,0 +1,26 @@
+"""
+Paginação por keyset - Cursores opacos para listagens ordenadas por (created_at, id)
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """Gera o cursor opaco que aponta para o último item de uma página"""
+    payload = json.dumps([created_at.isoformat(), id], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(payload).rstrip(b'=').decode()
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Interpreta um cursor gerado por encode_cursor
+    
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, id = json.loads(payload)
+        return datetime.fromisoformat(created_at), int(id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError('Cursor inválido') from e
@@ -0,0 +1,53 @@
+"""
+Registro de permissões - Cada permissão recebe um bit para verificações por máscara
+"""
+import threading
+from typing import Iterable, List
+
+class PermissionRegistry:
+    """Associa cada permissão (ex: 'users:read') a um bit de uma máscara inteira"""
+    
+    def __init__(self):
+        self._bits = {}
+        self._names = []
+        self._lock = threading.Lock()
+    
+    def register(self, permission: str) -> int:
+        """Retorna o bit da permissão, registrando-a se ainda não existir"""
+        bit = self._bits.get(permission)
+        if bit is None:
+            with self._lock:
+                bit = self._bits.get(permission)
+                if bit is None:
+                    bit = 1 << len(self._names)
+                    self._names.append(permission)
+                    self._bits[permission] = bit
+        return bit
+    
+    def bit(self, permission: str) -> int:
+        """Retorna o bit da permissão (0 se nunca registrada: nenhuma máscara a contém)"""
+        return self._bits.get(permission, 0)
+    
+    def mask(self, permissions: Iterable[str]) -> int:
+        """Compila uma lista de permissões em uma máscara"""
+        mask = 0
+        for permission in permissions or ():
+            mask |= self.register(permission)
+        return mask
+    
+    def names(self, mask: int) -> List[str]:
+        """Retorna as permissões contidas em uma máscara (na ordem de registro)"""
+        names = []
+        index = 0
+        while mask:
+            if mask & 1:
+                names.append(self._names[index])
+            mask >>= 1
+            index += 1
+        return names
+    
+    def __len__(self):
+        return len(self._names)
+
+# Registro global usado por modelos e decoradores
+permission_registry = PermissionRegistry()
@@ -0,0 +1,69 @@
+"""
+Projeções - Serializa linhas de SELECTs Core direto em dicionários, sem objetos ORM
+
+Para listagens somente leitura: nada de identity map nem construção de
+instâncias, apenas as colunas necessárias e acessores pré-compilados por campo.
+A saída é idêntica à de to_dict() para os mesmos campos.
+"""
+from functools import lru_cache
+from operator import itemgetter
+from typing import Iterable, Sequence, Tuple
+from sqlalchemy import select
+
+def _computed(getters, function):
+    """Acessor de campo calculado a partir de outras colunas da linha"""
+    def accessor(row):
+        return function(*(getter(row) for getter in getters))
+    return accessor
+
+class Projection:
+    """SELECT de um subconjunto de campos de um modelo e conversão das linhas em dicionários"""
+    
+    def __init__(self, model, fields: Sequence[str], required: Iterable[str] = ()):
+        """
+        Args:
+            model: Modelo com FIELDS (e, se houver campos calculados, FIELD_COLUMNS e COMPUTED_FIELDS)
+            fields: Campos da saída, na ordem desejada
+            required: Colunas lidas mesmo fora de fields (ex: as do cursor de paginação)
+        """
+        table = model.__table__
+        field_columns = getattr(model, 'FIELD_COLUMNS', {})
+        computed = getattr(model, 'COMPUTED_FIELDS', {})
+        
+        columns = dict.fromkeys(required)
+        for field in fields:
+            columns.update(dict.fromkeys(field_columns.get(field, (field,))))
+        
+        self.fields = tuple(fields)
+        self.columns = tuple(table.c[name] for name in columns)
+        self.positions = {name: position for position, name in enumerate(columns)}
+        
+        accessors = []
+        for field in self.fields:
+            if field in computed:
+                getters = [itemgetter(self.positions[name]) for name in field_columns[field]]
+                accessor = _computed(getters, computed[field])
+            else:
+                accessor = itemgetter(self.positions[field])
+            accessors.append((field, accessor))
+        self._accessors = tuple(accessors)
+    
+    def select(self):
+        """SELECT apenas das colunas da projeção"""
+        return select(*self.columns)
+    
+    def to_dict(self, row) -> dict:
+        """Converte uma linha do SELECT em dicionário"""
+        return {field: accessor(row) for field, accessor in self._accessors}
+    
+    def value(self, row, column: str):
+        """Valor bruto de uma coluna lida (ex: para montar cursores)"""
+        return row[self.positions[column]]
+
+@lru_cache(maxsize=256)
+def _cached_projection(model, fields: Tuple[str, ...], required: Tuple[str, ...]) -> Projection:
+    return Projection(model, fields, required)
+
+def get_projection(model, fields: Sequence[str] = None, required: Sequence[str] = ()) -> Projection:
+    """Projeção (compilada uma vez e reutilizada) dos campos pedidos; padrão: model.FIELDS"""
+    return _cached_projection(model, tuple(model.FIELDS if fields is None else fields), tuple(required))
@@ -0,0 +1,85 @@
+"""
+API Keys assinadas (HMAC) verificáveis sem consulta ao banco
+
+Formato: sk1.<kid>.<payload>.<assinatura>
+    kid        - identificador da chave de assinatura do servidor (rotação)
+    payload    - base64url de (id da API Key, id do usuário, expiração em epoch; 0 = sem expiração)
+    assinatura - base64url do HMAC-SHA256 de "sk1.<kid>.<payload>"
+"""
+import base64
+import hashlib
+import hmac
+import struct
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+PREFIX = 'sk1'
+_PAYLOAD = struct.Struct('>QQQ')
+
+class SignedKeyClaims(NamedTuple):
+    """Dados embutidos em uma API Key assinada"""
+    kid: str
+    key_id: int
+    user_id: Optional[int]
+    expires_at: Optional[int]
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode()
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+
+def parse_signing_keys(spec: str) -> List[Tuple[str, bytes]]:
+    """
+    Interpreta a lista de chaves de assinatura "kid:segredo,kid2:segredo2"
+    
+    A primeira chave é usada para assinar; todas são aceitas na verificação.
+    """
+    keys = []
+    for item in (spec or '').split(','):
+        item = item.strip()
+        if not item:
+            continue
+        kid, _, secret = item.partition(':')
+        if not kid or not secret or '.' in kid:
+            raise ValueError(f'Chave de assinatura inválida: {kid!r}')
+        keys.append((kid, secret.encode()))
+    return keys
+
+def is_signed_key(key: str) -> bool:
+    """Verifica se a chave está no formato assinado"""
+    return key.startswith(PREFIX + '.')
+
+def _signature(secret: bytes, message: str) -> bytes:
+    return hmac.new(secret, message.encode(), hashlib.sha256).digest()
+
+def sign_key(key_id: int, user_id: Optional[int], expires_at: Optional[int], kid: str, secret: bytes) -> str:
+    """Gera uma API Key assinada"""
+    payload = _b64encode(_PAYLOAD.pack(key_id, user_id or 0, expires_at or 0))
+    message = f'{PREFIX}.{kid}.{payload}'
+    return f'{message}.{_b64encode(_signature(secret, message))}'
+
+def verify_key(key: str, secrets: Dict[str, bytes]) -> Optional[SignedKeyClaims]:
+    """
+    Verifica a assinatura de uma API Key (não checa expiração nem revogação)
+    
+    Returns:
+        Optional[SignedKeyClaims]: Dados da chave, ou None se malformada/forjada
+    """
+    parts = key.split('.')
+    if len(parts) != 4 or parts[0] != PREFIX:
+        return None
+    
+    _, kid, payload, signature = parts
+    secret = secrets.get(kid)
+    if secret is None:
+        return None
+    
+    try:
+        expected = _signature(secret, f'{PREFIX}.{kid}.{payload}')
+        if not hmac.compare_digest(expected, _b64decode(signature)):
+            return None
+        key_id, user_id, expires_at = _PAYLOAD.unpack(_b64decode(payload))
+    except (ValueError, struct.error):
+        return None
+    
+    return SignedKeyClaims(kid, key_id, user_id or None, expires_at or None)
@@ -0,0 +1,26 @@
+"""
+Expressões SQL compartilhadas, compiladas conforme o banco em uso
+"""
+from sqlalchemy import String
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+
+class email_domain(FunctionElement):
+    """
+    Domínio (em minúsculas) de uma coluna de email
+    
+    A mesma expressão é usada no índice e nos filtros, para que o banco use o índice.
+    """
+    type = String()
+    inherit_cache = True
+    name = 'email_domain'
+
+@compiles(email_domain)
+def _email_domain_default(element, compiler, **kw):
+    column = compiler.process(element.clauses, **kw)
+    return f"lower(substr({column}, instr({column}, '@') + 1))"
+
+@compiles(email_domain, 'postgresql')
+def _email_domain_postgresql(element, compiler, **kw):
+    column = compiler.process(element.clauses, **kw)
+    return f"lower(split_part({column}, '@', 2))"
@@ -0,0 +1,73 @@
+"""
+Perfis de ajuste do SQLite - PRAGMAs aplicados a cada nova conexão do pool
+
+O perfil 'performance' usa WAL (leitores não bloqueiam atrás dos commits),
+synchronous=NORMAL (durável em WAL, sem fsync a cada commit), busy_timeout
+para esperar o lock de escrita em vez de falhar com "database is locked", e
+cache/mmap/temp_store em memória. 'default' mantém os valores do SQLite.
+"""
+from typing import Dict, List, Tuple
+from sqlalchemy import event
+
+# PRAGMAs por perfil, na ordem de aplicação (journal_mode primeiro)
+SQLITE_PROFILES = {
+    'default': {},
+    'performance': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'cache_size': -64000,
+        'mmap_size': 268435456,
+        'temp_store': 'MEMORY'
+    },
+    'durable': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'busy_timeout': 5000
+    }
+}
+
+def resolve_pragmas(profile: str, overrides: Dict[str, object] = None) -> List[Tuple[str, object]]:
+    """
+    PRAGMAs do perfil com os valores configurados individualmente
+    
+    Args:
+        profile: Nome em SQLITE_PROFILES
+        overrides: Valores que substituem os do perfil (None = manter o do perfil)
+    
+    Raises:
+        ValueError: Perfil desconhecido
+    """
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Perfil SQLite inválido: {profile} (use {', '.join(SQLITE_PROFILES)})")
+    
+    pragmas = dict(SQLITE_PROFILES[profile])
+    pragmas.update({name: value for name, value in (overrides or {}).items() if value is not None})
+    return list(pragmas.items())
+
+def apply_pragmas(engine, pragmas: List[Tuple[str, object]]):
+    """Registra o evento connect que executa os PRAGMAs em cada conexão nova do engine"""
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+    
+    statements = [f'PRAGMA {name} = {value}' for name, value in pragmas]
+    
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+def read_pragmas(connection, names) -> Dict[str, object]:
+    """Valores atuais dos PRAGMAs em uma conexão (verificação e benchmarks)"""
+    return {name: connection.exec_driver_sql(f'PRAGMA {name}').scalar() for name in names}
+
+def init_sqlite_pragmas(app, db, profile: str, overrides: Dict[str, object] = None):
+    """Aplica o perfil a todos os engines SQLite da aplicação (antes da primeira conexão)"""
+    pragmas = resolve_pragmas(profile, overrides)
+    with app.app_context():
+        for engine in db.engines.values():
+            apply_pragmas(engine, pragmas)
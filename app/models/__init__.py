@@ -5,5 +5,10 @@ Camada de modelos - Define as entidades do banco de dados
 from .user import User
 from .api_key import ApiKey
 from .role import Role
+from .principal import Principal
+from .authz_version import AuthzVersion
+from .api_key_record import ApiKeyRecord
+from .api_key_revocation import ApiKeyRevocation
+from .version_stamp import VersionStamp
 
-__all__ = ['User', 'ApiKey', 'Role']
+__all__ = ['User', 'ApiKey', 'Role', 'Principal', 'AuthzVersion', 'ApiKeyRecord', 'ApiKeyRevocation', 'VersionStamp']
@@ -3,14 +3,24 @@ Modelo API Key - Define a entidade API Key no banco de dados
 """
 from datetime import datetime
 from app import db
+from app.core.fieldsets import serialize_fields
 import secrets
 import hashlib
 
+def is_expired_at(expires_at):
+    """Verifica se uma data de expiração já passou (None = nunca expira)"""
+    if expires_at is None:
+        return False
+    return datetime.utcnow() > expires_at
+
 class ApiKey(db.Model):
     """Modelo de API Key para autenticação de serviços"""
     
     __tablename__ = 'api_keys'
     
+    # AUTOINCREMENT: ids de chaves removidas nunca são reutilizados (revogações são por id)
+    __table_args__ = {'sqlite_autoincrement': True}
+    
     # Campos da tabela
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -25,6 +35,11 @@ class ApiKey(db.Model):
     # Relacionamento com usuário
     user = db.relationship('User', backref=db.backref('api_keys', lazy=True))
     
+    # Campos públicos de to_dict (aceitos em ?fields=) e colunas dos campos calculados
+    FIELDS = ('id', 'name', 'description', 'is_active', 'user_id', 'created_at', 'expires_at', 'last_used_at', 'is_expired')
+    FIELD_COLUMNS = {'is_expired': ('expires_at',)}
+    COMPUTED_FIELDS = {'is_expired': is_expired_at}
+    
     def __repr__(self):
         """Representação string do objeto"""
         return f'<ApiKey {self.name}>'
@@ -49,9 +64,7 @@ class ApiKey(db.Model):
     
     def is_expired(self):
         """Verifica se a API Key expirou"""
-        if self.expires_at is None:
-            return False
-        return datetime.utcnow() > self.expires_at
+        return is_expired_at(self.expires_at)
     
     def is_valid(self):
         """Verifica se a API Key é válida (ativa e não expirada)"""
@@ -62,24 +75,35 @@ class ApiKey(db.Model):
         self.last_used_at = datetime.utcnow()
         db.session.commit()
     
-    def to_dict(self, include_key=False):
-        """Converte o objeto para dicionário"""
-        data = {
-            'id': self.id,
-            'name': self.name,
-            'description': self.description,
-            'is_active': self.is_active,
-            'user_id': self.user_id,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'expires_at': self.expires_at.isoformat() if self.expires_at else None,
-            'last_used_at': self.last_used_at.isoformat() if self.last_used_at else None,
-            'is_expired': self.is_expired()
-        }
+    def to_dict(self, include_key=False, include_user=False, fields=None):
+        """
+        Converte o objeto para dicionário
+        
+        Args:
+            fields: Subconjunto de FIELDS a serializar (padrão: todos)
+        """
+        if fields is not None:
+            data = serialize_fields(self, fields, computed={'is_expired': ApiKey.is_expired})
+        else:
+            data = {
+                'id': self.id,
+                'name': self.name,
+                'description': self.description,
+                'is_active': self.is_active,
+                'user_id': self.user_id,
+                'created_at': self.created_at,
+                'expires_at': self.expires_at,
+                'last_used_at': self.last_used_at,
+                'is_expired': self.is_expired()
+            }
+        
+        if include_user:
+            data['user'] = self.user.to_dict() if self.user else None
         
         # Só incluir a key se fornecida e for a primeira vez
         if include_key and hasattr(self, '_plain_key'):
             data['key'] = self._plain_key
-            
+        
         return data
     
     @classmethod
@@ -0,0 +1,49 @@
+"""
+Modelo ApiKeyRecord - Snapshot imutável de uma API Key para validação
+"""
+from datetime import datetime
+
+class ApiKeyRecord:
+    """Snapshot compacto de uma API Key, seguro para compartilhar entre requisições"""
+    
+    __slots__ = ('id', 'name', 'user_id', 'key_hash', 'is_active', 'expires_at')
+    
+    def __init__(self, id, name, user_id, key_hash, is_active, expires_at):
+        object.__setattr__(self, 'id', id)
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'user_id', user_id)
+        object.__setattr__(self, 'key_hash', key_hash)
+        object.__setattr__(self, 'is_active', is_active)
+        object.__setattr__(self, 'expires_at', expires_at)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError('ApiKeyRecord é imutável')
+    
+    def __delattr__(self, name):
+        raise AttributeError('ApiKeyRecord é imutável')
+    
+    def __repr__(self):
+        """Representação string do objeto"""
+        return f'<ApiKeyRecord {self.name}>'
+    
+    @classmethod
+    def from_api_key(cls, api_key):
+        """Cria um snapshot a partir de uma ApiKey"""
+        return cls(
+            api_key.id,
+            api_key.name,
+            api_key.user_id,
+            api_key.key_hash,
+            api_key.is_active,
+            api_key.expires_at
+        )
+    
+    def is_expired(self):
+        """Verifica se a API Key expirou"""
+        if self.expires_at is None:
+            return False
+        return datetime.utcnow() > self.expires_at
+    
+    def is_valid(self):
+        """Verifica se a API Key é válida (ativa e não expirada)"""
+        return self.is_active and not self.is_expired()
@@ -0,0 +1,18 @@
+"""
+Modelo ApiKeyRevocation - API Keys revogadas (desativadas ou removidas)
+"""
+from datetime import datetime
+from app import db
+
+class ApiKeyRevocation(db.Model):
+    """Registro de revogação consultado na validação de API Keys assinadas"""
+    
+    __tablename__ = 'api_key_revocations'
+    
+    # Campos da tabela (sem FK: a API Key pode ter sido removida)
+    api_key_id = db.Column(db.Integer, primary_key=True)
+    revoked_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        """Representação string do objeto"""
+        return f'<ApiKeyRevocation {self.api_key_id}>'
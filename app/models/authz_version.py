@@ -0,0 +1,24 @@
+"""
+Modelo AuthzVersion - Versão de autorização de cada usuário
+"""
+from datetime import datetime
+from app import db
+
+class AuthzVersion(db.Model):
+    """
+    Versão das permissões de um usuário, renovada a cada mudança de roles ou de status
+    
+    Os valores vêm de um contador global (version_stamps 'authz'): um id de usuário
+    reutilizado após uma remoção nunca volta a uma versão já emitida em tokens.
+    """
+    
+    __tablename__ = 'authz_versions'
+    
+    # Campos da tabela
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=1)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        """Representação string do objeto"""
+        return f'<AuthzVersion {self.user_id}:{self.version}>'
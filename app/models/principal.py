@@ -0,0 +1,61 @@
+"""
+Modelo Principal - Snapshot imutável da identidade autenticada
+"""
+from app.core.permissions import permission_registry
+
+class Principal:
+    """Snapshot compacto e imutável de um usuário para decisões de autorização"""
+    
+    __slots__ = ('id', 'is_active', 'role_names', 'permissions', 'permission_mask')
+    
+    def __init__(self, id, is_active, role_names, permissions, permission_mask=None):
+        if permission_mask is None:
+            permission_mask = permission_registry.mask(permissions)
+        object.__setattr__(self, 'id', id)
+        object.__setattr__(self, 'is_active', is_active)
+        object.__setattr__(self, 'role_names', frozenset(role_names))
+        object.__setattr__(self, 'permissions', frozenset(permissions))
+        object.__setattr__(self, 'permission_mask', permission_mask)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError('Principal é imutável')
+    
+    def __delattr__(self, name):
+        raise AttributeError('Principal é imutável')
+    
+    def __repr__(self):
+        """Representação string do objeto"""
+        return f'<Principal {self.id}>'
+    
+    @classmethod
+    def from_user(cls, user):
+        """Cria um snapshot a partir de um User, percorrendo os roles uma única vez"""
+        role_names = []
+        mask = 0
+        for role in user.roles:
+            if role.is_active:
+                role_names.append(role.name)
+                mask |= role.permission_mask
+        
+        return cls(user.id, user.is_active, role_names, permission_registry.names(mask), mask)
+    
+    @property
+    def roles(self):
+        """Nomes dos roles ativos (compatível com verificações de "tem roles")"""
+        return self.role_names
+    
+    def has_role(self, role_name):
+        """Verifica se o usuário tem um role específico"""
+        return role_name in self.role_names
+    
+    def has_permission(self, permission):
+        """Verifica se o usuário tem uma permissão específica"""
+        return bool(self.permission_mask & permission_registry.bit(permission))
+    
+    def get_role_names(self):
+        """Retorna uma lista com os nomes dos roles ativos do usuário"""
+        return list(self.role_names)
+    
+    def get_all_permissions(self):
+        """Retorna todas as permissões do usuário (baseadas nos roles)"""
+        return list(self.permissions)
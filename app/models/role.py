@@ -2,7 +2,11 @@
 Modelo Role - Define os roles/perfis de usuário no sistema
 """
 from datetime import datetime
+from sqlalchemy import event
+from sqlalchemy.orm import validates
 from app import db
+from app.core.fieldsets import serialize_fields
+from app.core.permissions import permission_registry
 from .user import user_roles
 
 class Role(db.Model):
@@ -23,12 +27,39 @@ class Role(db.Model):
     # Relacionamento com usuários (many-to-many)
     users = db.relationship('User', secondary=user_roles, back_populates='roles', primaryjoin='Role.id == user_roles.c.role_id', secondaryjoin='User.id == user_roles.c.user_id')
     
+    # Campos públicos de to_dict (aceitos em ?fields=)
+    FIELDS = ('id', 'name', 'display_name', 'description', 'permissions', 'is_active', 'created_at', 'updated_at')
+    
+    # Máscara de permissões compilada sob demanda (ver permission_mask)
+    _permission_mask = None
+    
     def __repr__(self):
         """Representação string do objeto"""
         return f'<Role {self.name}>'
     
-    def to_dict(self):
-        """Converte o objeto para dicionário"""
+    @validates('permissions')
+    def _validate_permissions(self, key, permissions):
+        """Descarta a máscara compilada quando a lista de permissões é substituída"""
+        self._permission_mask = None
+        return permissions
+    
+    @property
+    def permission_mask(self):
+        """Permissões do role compiladas em uma máscara de bits"""
+        if self._permission_mask is None:
+            self._permission_mask = permission_registry.mask(self.permissions)
+        return self._permission_mask
+    
+    def to_dict(self, fields=None):
+        """
+        Converte o objeto para dicionário
+        
+        Args:
+            fields: Subconjunto de FIELDS a serializar (padrão: todos)
+        """
+        if fields is not None:
+            return serialize_fields(self, fields)
+        
         return {
             'id': self.id,
             'name': self.name,
@@ -36,8 +67,8 @@ class Role(db.Model):
             'description': self.description,
             'permissions': self.permissions,
             'is_active': self.is_active,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
     
     @classmethod
@@ -69,18 +100,19 @@ class Role(db.Model):
     
     def has_permission(self, permission):
         """Verifica se o role tem uma permissão específica"""
-        return permission in self.permissions
+        return bool(self.permission_mask & permission_registry.bit(permission))
     
     def add_permission(self, permission):
         """Adiciona uma permissão ao role"""
         if permission not in self.permissions:
-            self.permissions.append(permission)
+            # Nova lista: a coluna JSON não rastreia alterações in-place
+            self.permissions = self.permissions + [permission]
             self.updated_at = datetime.utcnow()
     
     def remove_permission(self, permission):
         """Remove uma permissão do role"""
         if permission in self.permissions:
-            self.permissions.remove(permission)
+            self.permissions = [p for p in self.permissions if p != permission]
             self.updated_at = datetime.utcnow()
     
     @staticmethod
@@ -126,3 +158,13 @@ class Role(db.Model):
                 ]
             }
         ]
+
+@event.listens_for(Role, 'load')
+@event.listens_for(Role, 'refresh')
+def _reset_permission_mask(role, *args):
+    """Descarta a máscara compilada quando o role é (re)carregado do banco"""
+    role._permission_mask = None
+
+# Bits das permissões padrão registrados em ordem estável
+for _role in Role.get_default_roles():
+    permission_registry.mask(_role['permissions'])
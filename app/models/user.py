@@ -2,7 +2,11 @@
 Modelo User - Define a entidade usuário no banco de dados
 """
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.config.app import AppConfig
+from app.core.fieldsets import serialize_fields
+from app.core.hashing import password_hasher, normalize_method
+from app.core.permissions import permission_registry
+from app.core.sql import email_domain
 from app import db
 
 # Tabela de relacionamento many-to-many
@@ -25,43 +29,83 @@ class User(db.Model):
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
     is_active = db.Column(db.Boolean, default=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Obrigatório: chave da paginação por keyset (created_at, id)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relacionamento com roles (many-to-many)
     roles = db.relationship('Role', secondary=user_roles, back_populates='users', primaryjoin='User.id == user_roles.c.user_id', secondaryjoin='Role.id == user_roles.c.role_id')
     
+    # Campos públicos de to_dict (aceitos em ?fields=)
+    FIELDS = ('id', 'name', 'email', 'is_active', 'created_at', 'updated_at')
+    
     def __repr__(self):
         """Representação string do objeto"""
         return f'<User {self.name}>'
     
     def set_password(self, password):
-        """Define a senha do usuário com hash"""
-        self.password_hash = generate_password_hash(password)
+        """
+        Define a senha do usuário com hash
+        
+        Raises:
+            HashingBusyError: Se a fila de hashing estiver cheia
+        """
+        self.password_hash = password_hasher.hash(password, AppConfig.PASSWORD_HASH_METHOD)
     
     def check_password(self, password):
-        """Verifica se a senha está correta"""
-        return check_password_hash(self.password_hash, password)
-    
-    def to_dict(self, include_sensitive=False, include_roles=False):
-        """Converte o objeto para dicionário"""
-        data = {
-            'id': self.id,
-            'name': self.name,
-            'email': self.email,
-            'is_active': self.is_active,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+        """
+        Verifica se a senha está correta
+        
+        Raises:
+            HashingBusyError: Se a fila de hashing estiver cheia
+        """
+        return password_hasher.check(self.password_hash, password)
+    
+    def needs_rehash(self):
+        """Verifica se o hash armazenado usa parâmetros diferentes dos atuais"""
+        current_method = normalize_method(AppConfig.PASSWORD_HASH_METHOD)
+        return self.password_hash.split('$', 1)[0] != current_method
+    
+    def to_dict(self, include_sensitive=False, include_roles=False, include_api_keys=False, fields=None):
+        """
+        Converte o objeto para dicionário
+        
+        Args:
+            fields: Subconjunto de FIELDS a serializar (padrão: todos)
+        """
+        if fields is not None:
+            data = serialize_fields(self, fields)
+        else:
+            data = {
+                'id': self.id,
+                'name': self.name,
+                'email': self.email,
+                'is_active': self.is_active,
+                'created_at': self.created_at,
+                'updated_at': self.updated_at
+            }
         
         if include_sensitive:
             data['password_hash'] = self.password_hash
         
         if include_roles:
-            data['roles'] = [role.to_dict() for role in self.roles if role.is_active]
-            data['role_names'] = self.get_role_names()
-            data['permissions'] = self.get_all_permissions()
+            # Uma única passada pelos roles (carregue-os com selectinload em listagens)
+            roles = []
+            role_names = []
+            mask = 0
+            for role in self.roles:
+                if role.is_active:
+                    roles.append(role.to_dict())
+                    role_names.append(role.name)
+                    mask |= role.permission_mask
             
+            data['roles'] = roles
+            data['role_names'] = role_names
+            data['permissions'] = permission_registry.names(mask)
+        
+        if include_api_keys:
+            data['api_keys'] = [api_key.to_dict() for api_key in self.api_keys]
+        
         return data
     
     @classmethod
@@ -122,12 +166,18 @@ class User(db.Model):
         """Verifica se o usuário tem um role específico"""
         return any(role.name == role_name for role in self.roles if role.is_active)
     
+    @property
+    def permission_mask(self):
+        """Máscara das permissões efetivas: OR das máscaras dos roles ativos"""
+        mask = 0
+        for role in self.roles:
+            if role.is_active:
+                mask |= role.permission_mask
+        return mask
+    
     def has_permission(self, permission):
         """Verifica se o usuário tem uma permissão específica"""
-        for role in self.roles:
-            if role.is_active and role.has_permission(permission):
-                return True
-        return False
+        return bool(self.permission_mask & permission_registry.bit(permission))
     
     def add_role(self, role):
         """Adiciona um role ao usuário"""
@@ -147,8 +197,9 @@ class User(db.Model):
     
     def get_all_permissions(self):
         """Retorna todas as permissões do usuário (baseadas nos roles)"""
-        permissions = set()
-        for role in self.roles:
-            if role.is_active:
-                permissions.update(role.permissions)
-        return list(permissions)
+        return permission_registry.names(self.permission_mask)
+
+# Índices da listagem paginada por (created_at, id), com e sem filtros
+db.Index('ix_users_created_at_id', User.created_at, User.id)
+db.Index('ix_users_is_active_created_at_id', User.is_active, User.created_at, User.id)
+db.Index('ix_users_email_domain_created_at_id', email_domain(User.__table__.c.email), User.created_at, User.id)
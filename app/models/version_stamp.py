@@ -0,0 +1,19 @@
+"""
+Modelo VersionStamp - Contadores de versão de dados compartilhados entre processos
+"""
+from datetime import datetime
+from app import db
+
+class VersionStamp(db.Model):
+    """Versão nomeada (ex: 'roles'), incrementada a cada alteração do conjunto de dados"""
+    
+    __tablename__ = 'version_stamps'
+    
+    # Campos da tabela
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=1)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        """Representação string do objeto"""
+        return f'<VersionStamp {self.name}:{self.version}>'
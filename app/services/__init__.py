@@ -6,5 +6,7 @@ from .user_service import UserService
 from .auth_service import AuthService
 from .api_key_service import ApiKeyService
 from .role_service import RoleService
+from .authz_version_service import AuthzVersionService
+from .api_key_usage_service import ApiKeyUsageService
 
-__all__ = ['UserService', 'AuthService', 'ApiKeyService', 'RoleService']
\ No newline at end of file
+__all__ = ['UserService', 'AuthService', 'ApiKeyService', 'RoleService', 'AuthzVersionService', 'ApiKeyUsageService']
\ No newline at end of file
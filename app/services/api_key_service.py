@@ -1,18 +1,78 @@
 """
 Serviço de API Key - Contém a lógica de negócio para operações com API Keys
 """
+import calendar
+import threading
+import time
+from functools import lru_cache
 from typing import List, Tuple, Optional
 from datetime import datetime, timedelta
+from sqlalchemy.orm import selectinload
+from app.config.app import AppConfig
+from app.core.cache import TTLCache
+from app.core.fieldsets import load_only_fields
+from app.core.projection import get_projection
+from app.core.signed_keys import is_signed_key, parse_signing_keys, sign_key, verify_key
 from app.models.api_key import ApiKey
+from app.models.api_key_record import ApiKeyRecord
+from app.models.api_key_revocation import ApiKeyRevocation
+from app.services.api_key_usage_service import ApiKeyUsageService
 from app import db
 
+# Marcador para chaves inexistentes (cache negativo)
+_NOT_FOUND = object()
+
+# Cache de API Keys validadas e de buscas sem resultado (chave: hash da API Key)
+_api_key_cache = TTLCache(maxsize=AppConfig.API_KEY_CACHE_MAX_SIZE, ttl=AppConfig.API_KEY_CACHE_TTL)
+
+# IDs de API Keys revogadas (consultados na validação de chaves assinadas)
+_revocations = {'ids': frozenset(), 'loaded_at': None}
+_revocations_lock = threading.Lock()
+
+@lru_cache(maxsize=None)
+def _signing_keys(spec: str):
+    """Chaves de assinatura configuradas (a primeira assina novas chaves)"""
+    keys = parse_signing_keys(spec)
+    if not keys:
+        raise ValueError('API_KEY_SIGNING_KEYS não configurado')
+    return keys, dict(keys)
+
 class ApiKeyService:
     """Serviço responsável pelas operações de API Key"""
     
     @staticmethod
-    def get_all_api_keys() -> List[ApiKey]:
-        """Retorna todas as API Keys"""
-        return ApiKey.query.all()
+    def get_all_api_keys(fields: List[str] = None, include_user: bool = False) -> List[ApiKey]:
+        """
+        Retorna todas as API Keys
+        
+        Args:
+            fields: Campos de ApiKey.FIELDS a carregar (padrão: todos)
+            include_user: Carrega os donos das keys em uma única consulta (IN)
+        """
+        query = ApiKey.query
+        if fields is not None:
+            # user_id é necessário para carregar o dono mesmo fora de fields
+            required = ('id', 'user_id') if include_user else ('id',)
+            query = query.options(load_only_fields(ApiKey, fields, required=required))
+        if include_user:
+            query = query.options(selectinload(ApiKey.user))
+        return query.all()
+    
+    @staticmethod
+    def list_api_keys(fields: List[str] = None, include_user: bool = False) -> List[dict]:
+        """
+        Lista as API Keys já serializadas (mesmo formato de to_dict)
+        
+        Sem include_user, lê apenas as colunas necessárias com um SELECT Core,
+        sem construir objetos ORM.
+        """
+        if include_user:
+            api_keys = ApiKeyService.get_all_api_keys(fields=fields, include_user=True)
+            return [api_key.to_dict(include_user=True, fields=fields) for api_key in api_keys]
+        
+        projection = get_projection(ApiKey, fields)
+        rows = db.session.execute(projection.select().order_by(ApiKey.id)).all()
+        return [projection.to_dict(row) for row in rows]
     
     @staticmethod
     def get_api_key_by_id(api_key_id: int) -> Optional[ApiKey]:
@@ -25,6 +85,49 @@ class ApiKeyService:
         key_hash = ApiKey.hash_key(api_key)
         return ApiKey.query.filter_by(key_hash=key_hash).first()
     
+    @staticmethod
+    def get_api_key_record(api_key: str) -> Optional[ApiKeyRecord]:
+        """
+        Busca o snapshot de uma API Key pelo valor da chave, usando o cache
+        
+        Chaves encontradas (ativas ou não) ficam em cache por API_KEY_CACHE_TTL;
+        chaves inexistentes, por API_KEY_NEGATIVE_CACHE_TTL.
+        """
+        key_hash = ApiKey.hash_key(api_key)
+        
+        if AppConfig.API_KEY_CACHE_ENABLED:
+            record = _api_key_cache.get(key_hash)
+            if record is _NOT_FOUND:
+                return None
+            if record is not None:
+                return record
+        
+        api_key_obj = ApiKey.query.filter_by(key_hash=key_hash).first()
+        
+        if api_key_obj is None:
+            if AppConfig.API_KEY_CACHE_ENABLED:
+                _api_key_cache.set(key_hash, _NOT_FOUND, ttl=AppConfig.API_KEY_NEGATIVE_CACHE_TTL)
+            return None
+        
+        record = ApiKeyRecord.from_api_key(api_key_obj)
+        if AppConfig.API_KEY_CACHE_ENABLED:
+            _api_key_cache.set(key_hash, record)
+        
+        return record
+    
+    @staticmethod
+    def invalidate_api_key_cache(key_hash: str = None):
+        """Remove uma API Key (pelo hash) ou todas do cache de validação"""
+        if key_hash is None:
+            _api_key_cache.clear()
+        else:
+            _api_key_cache.delete(key_hash)
+    
+    @staticmethod
+    def get_api_key_cache_stats() -> dict:
+        """Retorna os contadores do cache de validação de API Keys"""
+        return _api_key_cache.stats()
+    
     @staticmethod
     def get_user_api_keys(user_id: int) -> List[ApiKey]:
         """Busca todas as API Keys de um usuário"""
@@ -35,6 +138,9 @@ class ApiKeyService:
         """
         Cria uma nova API Key
         
+        O formato ('opaque' ou 'signed') vem de api_key_data['format'] ou de
+        API_KEY_FORMAT. Chaves assinadas embutem id, usuário e expiração.
+        
         Returns:
             Tuple[ApiKey, bool, str]: (api_key, sucesso, mensagem)
         """
@@ -43,11 +149,32 @@ class ApiKeyService:
         if not is_valid:
             return None, False, error_message
         
+        key_format = api_key_data.get('format') or AppConfig.API_KEY_FORMAT
+        if key_format not in ('opaque', 'signed'):
+            return None, False, 'Formato de API Key inválido (use opaque ou signed)'
+        
         try:
             # Criar API Key
             api_key = ApiKey.from_dict(api_key_data)
             db.session.add(api_key)
+            
+            if key_format == 'signed' or not api_key.is_active:
+                # O id é parte da chave assinada e da revogação: obtê-lo antes
+                db.session.flush()
+            
+            if key_format == 'signed':
+                key = ApiKeyService._sign_api_key(api_key)
+                api_key.set_key(key)
+                api_key._plain_key = key
+            
+            # Criada desativada: revogada desde o início, como as opacas inativas
+            if not api_key.is_active:
+                ApiKeyService._set_revoked(api_key, True)
+            
             db.session.commit()
+            ApiKeyService.invalidate_api_key_cache(api_key.key_hash)
+            if not api_key.is_active:
+                ApiKeyService._mark_revoked(api_key.id, True)
             
             return api_key, True, 'API Key criada com sucesso'
         
@@ -60,6 +187,9 @@ class ApiKeyService:
         """
         Atualiza uma API Key existente
         
+        Em chaves assinadas a expiração embutida na chave continua valendo;
+        para encurtá-la, desative a chave e emita uma nova.
+        
         Returns:
             Tuple[Optional[ApiKey], bool, str]: (api_key, sucesso, mensagem)
         """
@@ -67,10 +197,17 @@ class ApiKeyService:
         if not api_key:
             return None, False, 'API Key não encontrada'
         
+        key_hash = api_key.key_hash
+        
         try:
             # Atualizar API Key
             api_key.update_from_dict(api_key_data)
+            if 'is_active' in api_key_data:
+                ApiKeyService._set_revoked(api_key, not api_key.is_active)
             db.session.commit()
+            ApiKeyService.invalidate_api_key_cache(key_hash)
+            if 'is_active' in api_key_data:
+                ApiKeyService._mark_revoked(api_key_id, not api_key.is_active)
             
             return api_key, True, 'API Key atualizada com sucesso'
         
@@ -90,9 +227,14 @@ class ApiKeyService:
         if not api_key:
             return False, 'API Key não encontrada'
         
+        key_hash = api_key.key_hash
+        
         try:
             db.session.delete(api_key)
+            ApiKeyService._set_revoked(api_key, True)
             db.session.commit()
+            ApiKeyService.invalidate_api_key_cache(key_hash)
+            ApiKeyService._mark_revoked(api_key_id, True)
             
             return True, 'API Key deletada com sucesso'
         
@@ -112,9 +254,14 @@ class ApiKeyService:
         if not api_key:
             return False, 'API Key não encontrada'
         
+        key_hash = api_key.key_hash
+        
         try:
             api_key.is_active = False
+            ApiKeyService._set_revoked(api_key, True)
             db.session.commit()
+            ApiKeyService.invalidate_api_key_cache(key_hash)
+            ApiKeyService._mark_revoked(api_key_id, True)
             
             return True, 'API Key desativada com sucesso'
         
@@ -134,9 +281,14 @@ class ApiKeyService:
         if not api_key:
             return False, 'API Key não encontrada'
         
+        key_hash = api_key.key_hash
+        
         try:
             api_key.is_active = True
+            ApiKeyService._set_revoked(api_key, False)
             db.session.commit()
+            ApiKeyService.invalidate_api_key_cache(key_hash)
+            ApiKeyService._mark_revoked(api_key_id, False)
             
             return True, 'API Key ativada com sucesso'
         
@@ -145,18 +297,22 @@ class ApiKeyService:
             return False, f'Erro ao ativar API Key: {str(e)}'
     
     @staticmethod
-    def validate_api_key(api_key: str) -> Tuple[Optional[ApiKey], bool, str]:
+    def validate_api_key(api_key: str) -> Tuple[Optional[ApiKeyRecord], bool, str]:
         """
         Valida uma API Key
         
         Returns:
-            Tuple[Optional[ApiKey], bool, str]: (api_key, válida, mensagem)
+            Tuple[Optional[ApiKeyRecord], bool, str]: (snapshot da api_key, válida, mensagem)
         """
         if not api_key:
             return None, False, 'API Key é obrigatória'
         
-        # Buscar API Key
-        api_key_obj = ApiKeyService.get_api_key_by_key(api_key)
+        # Chaves assinadas são validadas sem consulta ao banco
+        if is_signed_key(api_key):
+            return ApiKeyService._validate_signed_api_key(api_key)
+        
+        # Buscar API Key (cache positivo/negativo antes do banco)
+        api_key_obj = ApiKeyService.get_api_key_record(api_key)
         if not api_key_obj:
             return None, False, 'API Key inválida'
         
@@ -168,11 +324,82 @@ class ApiKeyService:
         if api_key_obj.is_expired():
             return None, False, 'API Key expirada'
         
-        # Atualizar último uso
-        api_key_obj.update_last_used()
+        # Registrar último uso (gravado em lote, fora do caminho da requisição)
+        ApiKeyUsageService.record_usage(api_key_obj.id)
         
         return api_key_obj, True, 'API Key válida'
     
+    @staticmethod
+    def _validate_signed_api_key(api_key: str) -> Tuple[Optional[ApiKeyRecord], bool, str]:
+        """Valida assinatura, expiração e revogação de uma API Key assinada"""
+        _, secrets = _signing_keys(AppConfig.API_KEY_SIGNING_KEYS)
+        claims = verify_key(api_key, secrets)
+        if claims is None:
+            return None, False, 'API Key inválida'
+        
+        if claims.expires_at is not None and time.time() > claims.expires_at:
+            return None, False, 'API Key expirada'
+        
+        if claims.key_id in ApiKeyService._get_revoked_ids():
+            return None, False, 'API Key desativada'
+        
+        expires_at = datetime.utcfromtimestamp(claims.expires_at) if claims.expires_at else None
+        record = ApiKeyRecord(claims.key_id, None, claims.user_id, None, True, expires_at)
+        
+        ApiKeyUsageService.record_usage(record.id)
+        
+        return record, True, 'API Key válida'
+    
+    @staticmethod
+    def _sign_api_key(api_key: ApiKey) -> str:
+        """Gera a chave assinada de uma API Key já com id"""
+        keys, _ = _signing_keys(AppConfig.API_KEY_SIGNING_KEYS)
+        kid, secret = keys[0]
+        expires_at = calendar.timegm(api_key.expires_at.utctimetuple()) if api_key.expires_at else None
+        return sign_key(api_key.id, api_key.user_id, expires_at, kid, secret)
+    
+    @staticmethod
+    def _get_revoked_ids() -> frozenset:
+        """IDs revogados, recarregados do banco a cada API_KEY_REVOCATION_REFRESH segundos"""
+        loaded_at = _revocations['loaded_at']
+        if loaded_at is None or time.monotonic() - loaded_at > AppConfig.API_KEY_REVOCATION_REFRESH:
+            ids = frozenset(db.session.execute(db.select(ApiKeyRevocation.api_key_id)).scalars())
+            with _revocations_lock:
+                _revocations.update(ids=ids, loaded_at=time.monotonic())
+        return _revocations['ids']
+    
+    @staticmethod
+    def _set_revoked(api_key: ApiKey, revoked: bool):
+        """
+        Registra (ou remove) a revogação de uma API Key existente na transação atual
+        
+        Só é removida a revogação registrada durante a vida desta chave: um registro
+        anterior à criação dela (de outra chave que já teve o mesmo id) nunca é apagado.
+        """
+        if revoked:
+            # Mantém o revoked_at original: uma revogação mais antiga que a chave continua permanente
+            if db.session.get(ApiKeyRevocation, api_key.id) is None:
+                db.session.add(ApiKeyRevocation(api_key_id=api_key.id, revoked_at=datetime.utcnow()))
+        else:
+            ApiKeyRevocation.query.filter(
+                ApiKeyRevocation.api_key_id == api_key.id,
+                ApiKeyRevocation.revoked_at >= api_key.created_at
+            ).delete(synchronize_session=False)
+    
+    @staticmethod
+    def _mark_revoked(api_key_id: int, revoked: bool):
+        """
+        Aplica imediatamente a revogação no conjunto em memória deste processo
+        
+        Na reativação o id não é simplesmente descartado: o conjunto é recarregado
+        do banco, que decide se a revogação foi mesmo removida (ver _set_revoked).
+        """
+        with _revocations_lock:
+            if revoked:
+                _revocations['ids'] = _revocations['ids'] | {api_key_id}
+            else:
+                _revocations['loaded_at'] = None
+    
     @staticmethod
     def get_api_keys_count() -> int:
         """Retorna o total de API Keys"""
@@ -0,0 +1,170 @@
+"""
+Serviço de uso de API Keys - Grava last_used_at em lote (write-behind)
+"""
+import atexit
+import os
+import threading
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import bindparam
+from app.config.app import AppConfig
+from app.models.api_key import ApiKey
+from app import db
+
+# Último uso pendente de gravação por API Key (chave: id da API Key)
+_pending = {}
+_lock = threading.Lock()
+_stats = {'recorded': 0, 'flushes': 0, 'rows_flushed': 0, 'errors': 0, 'last_flush_at': None}
+
+# Estado do processo atual (refeito após fork)
+_state = {'app': None, 'thread': None, 'pid': None, 'stop': threading.Event(), 'wake': threading.Event(), 'atexit': False}
+
+class ApiKeyUsageService:
+    """Serviço responsável por acumular e gravar o último uso das API Keys"""
+    
+    @staticmethod
+    def init_app(app):
+        """Associa a aplicação usada nas gravações e garante o flush no encerramento"""
+        _state['app'] = app
+        if not _state['atexit']:
+            atexit.register(ApiKeyUsageService._flush_on_exit)
+            _state['atexit'] = True
+    
+    @staticmethod
+    def record_usage(api_key_id: int, used_at: datetime = None):
+        """
+        Registra o uso de uma API Key em memória
+        
+        A gravação ocorre periodicamente (API_KEY_USAGE_FLUSH_INTERVAL) ou quando
+        o buffer atinge API_KEY_USAGE_FLUSH_SIZE entradas.
+        """
+        used_at = used_at or datetime.utcnow()
+        
+        with _lock:
+            previous = _pending.get(api_key_id)
+            if previous is None or previous < used_at:
+                _pending[api_key_id] = used_at
+            _stats['recorded'] += 1
+            should_flush = len(_pending) >= AppConfig.API_KEY_USAGE_FLUSH_SIZE
+        
+        flusher_running = ApiKeyUsageService._ensure_flusher()
+        
+        if should_flush:
+            if flusher_running:
+                # Buffer cheio: a thread de gravação é acordada, fora da requisição
+                _state['wake'].set()
+            else:
+                ApiKeyUsageService._flush_safely()
+    
+    @staticmethod
+    def flush() -> int:
+        """
+        Grava todos os usos pendentes em uma única transação
+        
+        Returns:
+            int: Quantidade de API Keys atualizadas
+        """
+        with _lock:
+            if not _pending:
+                return 0
+            batch = dict(_pending)
+            _pending.clear()
+        
+        app = _state['app'] or current_app._get_current_object()
+        statement = (
+            ApiKey.__table__.update()
+            .where(ApiKey.__table__.c.id == bindparam('key_id'))
+            .values(last_used_at=bindparam('used_at'))
+        )
+        
+        try:
+            with app.app_context():
+                with db.engine.begin() as connection:
+                    connection.execute(
+                        statement,
+                        [{'key_id': key_id, 'used_at': used_at} for key_id, used_at in batch.items()]
+                    )
+        
+        except Exception:
+            # Devolver ao buffer sem sobrescrever usos mais recentes
+            with _lock:
+                for key_id, used_at in batch.items():
+                    if key_id not in _pending or _pending[key_id] < used_at:
+                        _pending[key_id] = used_at
+                _stats['errors'] += 1
+            raise
+        
+        with _lock:
+            _stats['flushes'] += 1
+            _stats['rows_flushed'] += len(batch)
+            _stats['last_flush_at'] = datetime.utcnow().isoformat()
+        
+        return len(batch)
+    
+    @staticmethod
+    def _ensure_flusher():
+        """
+        Inicia (uma vez por processo) a thread de gravação periódica
+        
+        Returns:
+            bool: True se a thread está ativa (False com API_KEY_USAGE_FLUSH_INTERVAL <= 0)
+        """
+        interval = AppConfig.API_KEY_USAGE_FLUSH_INTERVAL
+        if interval <= 0:
+            return False
+        if _state['pid'] == os.getpid() and _state['thread'] is not None:
+            return True
+        
+        with _lock:
+            if _state['pid'] == os.getpid() and _state['thread'] is not None:
+                return True
+            
+            if _state['app'] is None:
+                _state['app'] = current_app._get_current_object()
+            
+            stop = threading.Event()
+            wake = threading.Event()
+            thread = threading.Thread(
+                target=ApiKeyUsageService._flush_loop,
+                args=(stop, wake, interval),
+                name='api-key-usage-flusher',
+                daemon=True
+            )
+            _state.update(thread=thread, pid=os.getpid(), stop=stop, wake=wake)
+            thread.start()
+            return True
+    
+    @staticmethod
+    def _flush_loop(stop: threading.Event, wake: threading.Event, interval: float):
+        """Laço da thread de gravação: a cada intervalo ou quando acordada pelo buffer cheio"""
+        while not stop.is_set():
+            wake.wait(interval)
+            wake.clear()
+            if stop.is_set():
+                return
+            ApiKeyUsageService._flush_safely()
+    
+    @staticmethod
+    def _flush_safely():
+        """Grava os usos pendentes sem propagar erros (o buffer é mantido para a próxima tentativa)"""
+        try:
+            ApiKeyUsageService.flush()
+        except Exception as e:
+            app = _state['app'] or current_app._get_current_object()
+            app.logger.warning(f'Erro ao gravar uso de API Keys: {str(e)}')
+    
+    @staticmethod
+    def _flush_on_exit():
+        """Grava os usos pendentes no encerramento do processo"""
+        _state['stop'].set()
+        _state['wake'].set()
+        try:
+            ApiKeyUsageService.flush()
+        except Exception as e:
+            print(f"Erro ao gravar uso de API Keys no encerramento: {str(e)}")
+    
+    @staticmethod
+    def get_stats() -> dict:
+        """Retorna as métricas do buffer de uso"""
+        with _lock:
+            return dict(_stats, pending=len(_pending))
@@ -2,24 +2,38 @@
 Serviço de autenticação - Contém a lógica de autenticação JWT
 """
 import os
+import hashlib
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
 from app.config.app import AppConfig
+from app.core.cache import TTLCache
 from app.models.user import User
+from app.models.principal import Principal
+from app.services.authz_version_service import AuthzVersionService
 from app import db
 
+# Cache de payloads de tokens já verificados (chave: digest do token)
+_token_cache = TTLCache(maxsize=AppConfig.JWT_CACHE_MAX_SIZE, ttl=AppConfig.JWT_CACHE_TTL)
+
+# Cache de snapshots de usuários ativos (chave: id do usuário; valor: (versão de autorização, snapshot))
+_principal_cache = TTLCache(maxsize=AppConfig.PRINCIPAL_CACHE_MAX_SIZE, ttl=AppConfig.PRINCIPAL_CACHE_TTL)
+
 class AuthService:
     """Serviço responsável pela autenticação e autorização"""
     
     @staticmethod
-    def create_access_token(user_id: int, expires_delta: timedelta = None) -> str:
+    def create_access_token(user_id: int, expires_delta: timedelta = None, user: User = None) -> str:
         """
         Cria um token JWT de acesso
         
+        Com JWT_AUTHZ_CLAIMS_ENABLED, o token também carrega os roles, as
+        permissões e a versão de autorização do usuário.
+        
         Args:
             user_id: ID do usuário
             expires_delta: Tempo de expiração personalizado
-            
+            user: Usuário já carregado (evita nova consulta ao embutir claims)
+        
         Returns:
             Token JWT codificado
         """
@@ -34,6 +48,12 @@ class AuthService:
             "iat": datetime.utcnow()
         }
         
+        if AppConfig.JWT_AUTHZ_CLAIMS_ENABLED:
+            if user is None:
+                user = User.query.get(user_id)
+            if user is not None:
+                to_encode.update(AuthService.build_authz_claims(user))
+        
         encoded_jwt = jwt.encode(
             to_encode, 
             AppConfig.JWT_SECRET_KEY, 
@@ -42,6 +62,28 @@ class AuthService:
         
         return encoded_jwt
     
+    @staticmethod
+    def build_authz_claims(user: User) -> dict:
+        """
+        Monta as claims de autorização de um usuário
+        
+        Returns:
+            dict: roles, permissões (perms) e versão de autorização (av)
+        """
+        principal = Principal.from_user(user)
+        version = AuthzVersionService.get_version(user.id, use_cache=False)
+        if not version:
+            # Sem versão gravada: cria uma agora, para que o token nunca carregue av=0
+            # (valor que um usuário novo com o mesmo id também teria)
+            AuthzVersionService.bump_users([user.id])
+            version = AuthzVersionService.get_version(user.id, use_cache=False)
+        
+        return {
+            "roles": sorted(principal.role_names),
+            "perms": sorted(principal.permissions),
+            "av": version or 0
+        }
+    
     @staticmethod
     def verify_token(token: str) -> dict:
         """
@@ -49,22 +91,44 @@ class AuthService:
         
         Args:
             token: Token JWT para verificar
-            
+        
         Returns:
             Payload decodificado do token
-            
+        
         Raises:
             JWTError: Se o token for inválido
         """
+        cache_key = None
+        if AppConfig.JWT_CACHE_ENABLED:
+            cache_key = hashlib.sha256(token.encode()).digest()
+            payload = _token_cache.get(cache_key)
+            if payload is not None:
+                return dict(payload)
+        
         try:
             payload = jwt.decode(
                 token, 
                 AppConfig.JWT_SECRET_KEY, 
                 algorithms=[AppConfig.JWT_ALGORITHM]
             )
-            return payload
         except JWTError:
             raise JWTError("Token inválido")
+        
+        # Apenas tokens válidos são armazenados, nunca além do próprio "exp"
+        if cache_key is not None:
+            _token_cache.set(cache_key, dict(payload), expires_at=payload.get('exp'))
+        
+        return payload
+    
+    @staticmethod
+    def get_token_cache_stats() -> dict:
+        """Retorna os contadores do cache de tokens verificados"""
+        return _token_cache.stats()
+    
+    @staticmethod
+    def clear_token_cache():
+        """Limpa o cache de tokens verificados"""
+        _token_cache.clear()
     
     @staticmethod
     def authenticate_user(email: str, password: str) -> tuple:
@@ -74,10 +138,13 @@ class AuthService:
         Args:
             email: Email do usuário
             password: Senha do usuário
-            
+        
         Returns:
             Tuple[User, str]: (usuário, token) se autenticado com sucesso
             Tuple[None, None]: Se autenticação falhar
+        
+        Raises:
+            HashingBusyError: Se a fila de hashing de senhas estiver cheia
         """
         user = User.query.filter_by(email=email).first()
         
@@ -87,8 +154,16 @@ class AuthService:
         if not user.is_active:
             return None, None
         
+        # Atualizar o hash para os parâmetros atuais (sem exigir troca de senha)
+        if user.needs_rehash():
+            try:
+                user.set_password(password)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+        
         # Criar token de acesso
-        access_token = AuthService.create_access_token(user.id)
+        access_token = AuthService.create_access_token(user.id, user=user)
         
         return user, access_token
     
@@ -99,10 +174,10 @@ class AuthService:
         
         Args:
             token: Token JWT
-            
+        
         Returns:
             User: Usuário autenticado
-            
+        
         Raises:
             JWTError: Se o token for inválido
         """
@@ -115,6 +190,80 @@ class AuthService:
         
         return user
     
+    @staticmethod
+    def get_current_principal(token: str) -> Principal:
+        """
+        Obtém o snapshot de autorização do usuário atual baseado no token
+        
+        Tokens com claims de autorização dispensam o carregamento do usuário;
+        nos demais, usuários já vistos são servidos do cache sem consultar o banco.
+        
+        Args:
+            token: Token JWT
+        
+        Returns:
+            Principal: Snapshot imutável do usuário autenticado
+        
+        Raises:
+            JWTError: Se o token for inválido
+        """
+        payload = AuthService.verify_token(token)
+        user_id = int(payload.get("sub"))
+        
+        # Token com claims de autorização: apenas a versão é conferida
+        if AppConfig.JWT_AUTHZ_CLAIMS_ENABLED and "av" in payload:
+            version = AuthzVersionService.get_version(user_id)
+            if version is None:
+                raise JWTError("Usuário não encontrado ou inativo")
+            if version != payload["av"]:
+                raise JWTError("Permissões do token desatualizadas")
+            
+            return Principal(user_id, True, payload.get("roles", []), payload.get("perms", []))
+        
+        version = None
+        if AppConfig.PRINCIPAL_CACHE_ENABLED:
+            # A invalidação do cache é local ao processo: o snapshot só é reutilizado se a
+            # versão de autorização (compartilhada pelo banco, cache de AUTHZ_VERSION_CACHE_TTL)
+            # não mudou; remoção, desativação e mudança de roles alteram a versão
+            version = AuthzVersionService.get_version(user_id)
+            if version is None:
+                _principal_cache.delete(user_id)
+                raise JWTError("Usuário não encontrado ou inativo")
+            
+            cached = _principal_cache.get(user_id)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+        
+        user = User.query.get(user_id)
+        if not user or not user.is_active:
+            raise JWTError("Usuário não encontrado ou inativo")
+        
+        principal = Principal.from_user(user)
+        if AppConfig.PRINCIPAL_CACHE_ENABLED:
+            _principal_cache.set(user_id, (version, principal))
+        
+        return principal
+    
+    @staticmethod
+    def invalidate_principal(user_id: int = None):
+        """
+        Invalida o snapshot em cache de um usuário
+        
+        Args:
+            user_id: ID do usuário; se omitido, invalida todos os snapshots
+        """
+        if user_id is None:
+            _principal_cache.clear()
+        else:
+            _principal_cache.delete(user_id)
+        
+        AuthzVersionService.invalidate(user_id)
+    
+    @staticmethod
+    def get_principal_cache_stats() -> dict:
+        """Retorna os contadores do cache de snapshots de usuários"""
+        return _principal_cache.stats()
+    
     @staticmethod
     def refresh_token(token: str) -> str:
         """
@@ -122,9 +271,9 @@ class AuthService:
         
         Args:
             token: Token atual
-            
+        
         Returns:
             Novo token JWT
         """
         user = AuthService.get_current_user(token)
-        return AuthService.create_access_token(user.id)
+        return AuthService.create_access_token(user.id, user=user)
@@ -0,0 +1,157 @@
+"""
+Serviço de versões de autorização - Detecta tokens com permissões desatualizadas
+"""
+from typing import Iterable, Optional
+from sqlalchemy import select
+from app.config.app import AppConfig
+from app.core.cache import TTLCache
+from app.models.authz_version import AuthzVersion
+from app.models.user import User, user_roles
+from app.services.version_stamp_service import VersionStampService
+from app import db
+
+# Contador global das versões de autorização (version_stamps)
+AUTHZ_STAMP = 'authz'
+
+# Marcador para usuários inexistentes ou inativos (cache negativo)
+_UNAVAILABLE = -1
+
+# Cache de versões por usuário (chave: id do usuário)
+_version_cache = TTLCache(maxsize=AppConfig.AUTHZ_VERSION_CACHE_MAX_SIZE, ttl=AppConfig.AUTHZ_VERSION_CACHE_TTL)
+
+class AuthzVersionService:
+    """Serviço responsável pelas versões de autorização dos usuários"""
+    
+    @staticmethod
+    def _load_versions(user_ids: Optional[Iterable[int]] = None) -> dict:
+        """Carrega (em uma única consulta) as versões dos usuários ativos"""
+        query = (
+            select(User.id, db.func.coalesce(AuthzVersion.version, 0))
+            .outerjoin(AuthzVersion, AuthzVersion.user_id == User.id)
+            .where(User.is_active.is_(True))
+        )
+        if user_ids is not None:
+            query = query.where(User.id.in_(list(user_ids)))
+        
+        return dict(db.session.execute(query).all())
+    
+    @staticmethod
+    def get_version(user_id: int, use_cache: bool = True) -> Optional[int]:
+        """
+        Retorna a versão de autorização atual de um usuário
+        
+        Returns:
+            Optional[int]: Versão atual, ou None se o usuário não existe ou está inativo
+        """
+        if use_cache:
+            version = _version_cache.get(user_id)
+            if version is not None:
+                return None if version == _UNAVAILABLE else version
+        
+        version = AuthzVersionService._load_versions([user_id]).get(user_id, _UNAVAILABLE)
+        _version_cache.set(user_id, version)
+        
+        return None if version == _UNAVAILABLE else version
+    
+    @staticmethod
+    def refresh_versions(user_ids: Optional[Iterable[int]] = None) -> int:
+        """
+        Recarrega em lote as versões no cache
+        
+        Args:
+            user_ids: IDs a recarregar; se omitido, recarrega todos os usuários ativos
+        
+        Returns:
+            int: Quantidade de versões carregadas
+        """
+        requested = None if user_ids is None else list(user_ids)
+        versions = AuthzVersionService._load_versions(requested)
+        
+        for user_id in (requested or []):
+            versions.setdefault(user_id, _UNAVAILABLE)
+        
+        for user_id, version in versions.items():
+            _version_cache.set(user_id, version)
+        
+        return len(versions)
+    
+    @staticmethod
+    def _next_version() -> int:
+        """
+        Próximo valor do contador global de versões (na transação atual)
+        
+        Na primeira vez o contador parte da maior versão já gravada, para nunca
+        repetir uma versão emitida antes dele existir.
+        """
+        if VersionStampService.get_version(AUTHZ_STAMP) == 0:
+            current = db.session.execute(select(db.func.max(AuthzVersion.version))).scalar()
+            VersionStampService.set_version(AUTHZ_STAMP, current or 0)
+            db.session.flush()
+        
+        VersionStampService.bump(AUTHZ_STAMP)
+        return VersionStampService.get_version(AUTHZ_STAMP)
+    
+    @staticmethod
+    def bump_users(user_ids: Iterable[int]):
+        """Renova (e persiste) a versão de autorização dos usuários com o próximo valor do contador global"""
+        user_ids = set(user_ids)
+        if not user_ids:
+            return
+        
+        try:
+            version = AuthzVersionService._next_version()
+            
+            existing = set(db.session.execute(
+                select(AuthzVersion.user_id).where(AuthzVersion.user_id.in_(user_ids))
+            ).scalars())
+            
+            if existing:
+                db.session.execute(
+                    AuthzVersion.__table__.update()
+                    .where(AuthzVersion.user_id.in_(existing))
+                    .values(version=version)
+                )
+            
+            missing = user_ids - existing
+            if missing:
+                db.session.execute(
+                    AuthzVersion.__table__.insert(),
+                    [{'user_id': user_id, 'version': version} for user_id in missing]
+                )
+            
+            db.session.commit()
+        
+        except Exception:
+            db.session.rollback()
+            raise
+        
+        finally:
+            for user_id in user_ids:
+                _version_cache.delete(user_id)
+    
+    @staticmethod
+    def delete_user(user_id: int):
+        """Remove a versão de um usuário na transação atual (o commit fica a cargo de quem chama)"""
+        db.session.execute(AuthzVersion.__table__.delete().where(AuthzVersion.user_id == user_id))
+    
+    @staticmethod
+    def bump_role(role_id: int):
+        """Incrementa a versão de autorização de todos os usuários de um role"""
+        user_ids = db.session.execute(
+            select(user_roles.c.user_id).where(user_roles.c.role_id == role_id)
+        ).scalars().all()
+        
+        AuthzVersionService.bump_users(user_ids)
+    
+    @staticmethod
+    def invalidate(user_id: int = None):
+        """Remove do cache a versão de um usuário (ou de todos)"""
+        if user_id is None:
+            _version_cache.clear()
+        else:
+            _version_cache.delete(user_id)
+    
+    @staticmethod
+    def get_cache_stats() -> dict:
+        """Retorna os contadores do cache de versões"""
+        return _version_cache.stats()
@@ -0,0 +1,103 @@
+"""
+Serviço de exportação - Gera NDJSON ou CSV em stream a partir das tabelas
+"""
+import csv
+import io
+import json
+from datetime import date
+from typing import Iterator
+from app.config.app import AppConfig
+from app.core.projection import get_projection
+from app.models.api_key import ApiKey
+from app.models.role import Role
+from app.models.user import User
+from app.utils.json_provider import json_default
+from app import db
+
+# Entidades exportáveis (cada linha segue o formato de to_dict() do modelo)
+EXPORTS = {
+    'users': User,
+    'roles': Role,
+    'api_keys': ApiKey
+}
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv'
+}
+
+class ExportService:
+    """Serviço responsável pela exportação em stream das entidades"""
+    
+    @staticmethod
+    def iter_records(entity: str) -> Iterator[dict]:
+        """
+        Percorre a tabela em lotes de EXPORT_BATCH_SIZE linhas (cursor no servidor)
+        
+        As linhas vêm de um SELECT Core convertido direto em dicionários (mesmo
+        formato de to_dict), sem objetos ORM nem identity map: a memória não
+        cresce com o tamanho da tabela.
+        """
+        model = EXPORTS[entity]
+        projection = get_projection(model)
+        statement = (
+            projection.select()
+            .order_by(model.id)
+            .execution_options(yield_per=AppConfig.EXPORT_BATCH_SIZE, stream_results=True)
+        )
+        
+        for row in db.session.execute(statement):
+            yield projection.to_dict(row)
+    
+    @staticmethod
+    def iter_ndjson(entity: str) -> Iterator[str]:
+        """Gera o NDJSON em blocos de EXPORT_BATCH_SIZE linhas"""
+        lines = []
+        for record in ExportService.iter_records(entity):
+            lines.append(json.dumps(record, ensure_ascii=False, default=json_default))
+            if len(lines) >= AppConfig.EXPORT_BATCH_SIZE:
+                yield '\n'.join(lines) + '\n'
+                lines = []
+        
+        if lines:
+            yield '\n'.join(lines) + '\n'
+    
+    @staticmethod
+    def iter_csv(entity: str) -> Iterator[str]:
+        """Gera o CSV (cabeçalho com as chaves de to_dict) em blocos de EXPORT_BATCH_SIZE linhas"""
+        buffer = io.StringIO()
+        writer = None
+        rows = 0
+        
+        for record in ExportService.iter_records(entity):
+            if writer is None:
+                writer = csv.DictWriter(buffer, fieldnames=list(record.keys()), extrasaction='ignore')
+                writer.writeheader()
+            
+            writer.writerow({key: ExportService._csv_value(value) for key, value in record.items()})
+            rows += 1
+            
+            if rows >= AppConfig.EXPORT_BATCH_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                rows = 0
+        
+        if buffer.tell():
+            yield buffer.getvalue()
+    
+    @staticmethod
+    def _csv_value(value):
+        """Célula do CSV: datas em ISO 8601; listas e dicionários (ex: permissões) como JSON"""
+        if isinstance(value, date):
+            return value.isoformat()
+        if isinstance(value, (list, dict)):
+            return json.dumps(value, ensure_ascii=False, default=json_default)
+        return value
+    
+    @staticmethod
+    def stream(entity: str, format: str) -> Iterator[str]:
+        """Retorna o gerador do formato solicitado"""
+        if format == 'csv':
+            return ExportService.iter_csv(entity)
+        return ExportService.iter_ndjson(entity)
@@ -1,29 +1,116 @@
 """
 Serviço de Role - Contém a lógica de negócio para operações com roles
 """
-from typing import List, Tuple, Optional
+import time
+from types import MappingProxyType
+from typing import List, NamedTuple, Tuple, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.config.app import AppConfig
 from app.models.role import Role
 from app.models.user import User
 from app.models.user import user_roles
+from app.services.auth_service import AuthService
+from app.services.authz_version_service import AuthzVersionService
+from app.services.version_stamp_service import VersionStampService
 from app import db
 
+# Nome da versão incrementada a cada alteração de roles
+ROLES_STAMP = 'roles'
+
+class RoleCatalog(NamedTuple):
+    """Snapshot imutável dos roles (instâncias desanexadas de sessão)"""
+    version: int
+    by_id: MappingProxyType
+    by_name: MappingProxyType
+    active: tuple
+
+# Catálogo atual e momento da última verificação de versão
+_catalog_state = {'catalog': None, 'checked_at': 0.0, 'loads': 0}
+
 class RoleService:
     """Serviço responsável pelas operações de roles"""
     
+    @staticmethod
+    def _load_catalog(version: int) -> RoleCatalog:
+        """Carrega todos os roles em uma sessão própria e os desanexa"""
+        with Session(db.engine) as session:
+            roles = session.scalars(select(Role).order_by(Role.id)).all()
+            session.expunge_all()
+        
+        _catalog_state['loads'] += 1
+        active = tuple(role for role in roles if role.is_active)
+        return RoleCatalog(
+            version,
+            MappingProxyType({role.id: role for role in roles}),
+            MappingProxyType({role.name: role for role in active}),
+            active
+        )
+    
+    @staticmethod
+    def _get_catalog() -> RoleCatalog:
+        """
+        Retorna o catálogo de roles, recarregando-o se a versão mudou
+        
+        A versão só é consultada a cada ROLE_CATALOG_CHECK_INTERVAL segundos;
+        alterações feitas neste processo invalidam o catálogo imediatamente.
+        """
+        catalog = _catalog_state['catalog']
+        now = time.monotonic()
+        if catalog is not None and now - _catalog_state['checked_at'] < AppConfig.ROLE_CATALOG_CHECK_INTERVAL:
+            return catalog
+        
+        version = VersionStampService.get_version(ROLES_STAMP)
+        if catalog is None or catalog.version != version:
+            catalog = RoleService._load_catalog(version)
+        
+        _catalog_state.update(catalog=catalog, checked_at=now)
+        return catalog
+    
+    @staticmethod
+    def _attach(role: Optional[Role]) -> Optional[Role]:
+        """Associa um role do catálogo à sessão atual sem consultar o banco"""
+        if role is None:
+            return None
+        
+        existing = db.session.identity_map.get(db.session.identity_key(Role, role.id))
+        if existing is not None:
+            return existing
+        
+        attached = db.session.merge(role, load=False)
+        attached._permission_mask = role.permission_mask
+        return attached
+    
+    @staticmethod
+    def invalidate_role_catalog():
+        """Descarta o catálogo deste processo (recarregado na próxima leitura)"""
+        _catalog_state.update(catalog=None, checked_at=0.0)
+    
+    @staticmethod
+    def get_role_catalog_stats() -> dict:
+        """Retorna as métricas do catálogo de roles"""
+        catalog = _catalog_state['catalog']
+        return {
+            'loaded': catalog is not None,
+            'version': catalog.version if catalog else None,
+            'roles': len(catalog.by_id) if catalog else 0,
+            'loads': _catalog_state['loads']
+        }
+    
     @staticmethod
     def get_all_roles() -> List[Role]:
         """Retorna todos os roles"""
-        return Role.query.filter_by(is_active=True).all()
+        return [RoleService._attach(role) for role in RoleService._get_catalog().active]
     
     @staticmethod
     def get_role_by_id(role_id: int) -> Optional[Role]:
         """Busca um role por ID"""
-        return Role.query.get(role_id)
+        return RoleService._attach(RoleService._get_catalog().by_id.get(role_id))
     
     @staticmethod
     def get_role_by_name(role_name: str) -> Optional[Role]:
         """Busca um role por nome"""
-        return Role.query.filter_by(name=role_name, is_active=True).first()
+        return RoleService._attach(RoleService._get_catalog().by_name.get(role_name))
     
     @staticmethod
     def create_role(role_data: dict) -> Tuple[Role, bool, str]:
@@ -47,7 +134,9 @@ class RoleService:
             # Criar role
             role = Role.from_dict(role_data)
             db.session.add(role)
+            VersionStampService.bump(ROLES_STAMP)
             db.session.commit()
+            RoleService.invalidate_role_catalog()
             
             return role, True, 'Role criado com sucesso'
         
@@ -76,7 +165,13 @@ class RoleService:
         try:
             # Atualizar role
             role.update_from_dict(role_data)
+            VersionStampService.bump(ROLES_STAMP)
             db.session.commit()
+            RoleService.invalidate_role_catalog()
+            
+            # Permissões do role mudaram para todos os seus usuários
+            AuthService.invalidate_principal()
+            AuthzVersionService.bump_role(role_id)
             
             return role, True, 'Role atualizado com sucesso'
         
@@ -99,7 +194,11 @@ class RoleService:
         try:
             # Soft delete - desativar role
             role.is_active = False
+            VersionStampService.bump(ROLES_STAMP)
             db.session.commit()
+            RoleService.invalidate_role_catalog()
+            AuthService.invalidate_principal()
+            AuthzVersionService.bump_role(role_id)
             
             return True, 'Role deletado com sucesso'
         
@@ -116,7 +215,7 @@ class RoleService:
             Tuple[bool, str]: (sucesso, mensagem)
         """
         user = User.query.get(user_id)
-        role = Role.query.get(role_id)
+        role = RoleService.get_role_by_id(role_id)
         
         if not user:
             return False, 'Usuário não encontrado'
@@ -132,8 +231,10 @@ class RoleService:
             return False, 'Usuário já possui este role'
         
         try:
-            # Adicionar role ao usuário
+            # Adicionar role ao usuário (add_role já persiste a associação)
             user.add_role(role)
+            AuthService.invalidate_principal(user_id)
+            AuthzVersionService.bump_users([user_id])
             
             # Registrar na tabela user_roles
             db.session.execute(
@@ -160,7 +261,7 @@ class RoleService:
             Tuple[bool, str]: (sucesso, mensagem)
         """
         user = User.query.get(user_id)
-        role = Role.query.get(role_id)
+        role = RoleService.get_role_by_id(role_id)
         
         if not user:
             return False, 'Usuário não encontrado'
@@ -173,8 +274,10 @@ class RoleService:
             return False, 'Usuário não possui este role'
         
         try:
-            # Remover role do usuário
+            # Remover role do usuário (remove_role já persiste a remoção)
             user.remove_role(role)
+            AuthService.invalidate_principal(user_id)
+            AuthzVersionService.bump_users([user_id])
             
             # Desativar na tabela user_roles
             db.session.execute(
@@ -203,7 +306,7 @@ class RoleService:
     @staticmethod
     def get_role_users(role_id: int) -> List[User]:
         """Retorna todos os usuários de um role"""
-        role = Role.query.get(role_id)
+        role = RoleService.get_role_by_id(role_id)
         if not role:
             return []
         
@@ -235,4 +338,4 @@ class RoleService:
     @staticmethod
     def get_roles_count() -> int:
         """Retorna o total de roles ativos"""
-        return Role.query.filter_by(is_active=True).count()
+        return len(RoleService._get_catalog().active)
@@ -0,0 +1,196 @@
+"""
+Serviço de preparação do banco - Schema, índices e dados padrão aplicados uma única vez
+
+flask init-db / flask seed fazem o trabalho pesado (DDL, hash da senha do admin)
+e registram carimbos na tabela version_stamps; na inicialização de cada processo
+create_app só confere esses carimbos com uma consulta.
+"""
+from datetime import datetime
+from typing import Dict, Tuple
+from sqlalchemy import func, text, update
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.schema import CreateIndex
+from app.config.app import AppConfig
+from app.services.version_stamp_service import VersionStampService
+from app import db
+
+# Carimbos de version_stamps e as versões esperadas por este código
+SCHEMA_STAMP = 'schema'
+SEED_STAMP = 'seed'
+
+# Incremente ao adicionar tabelas/índices (SCHEMA_VERSION) ou dados padrão (SEED_VERSION)
+SCHEMA_VERSION = 3
+SEED_VERSION = 1
+
+class SetupService:
+    """Serviço responsável por criar o schema e os dados padrão do banco"""
+    
+    @staticmethod
+    def get_status() -> Dict[str, int]:
+        """
+        Versões de schema e seed registradas no banco (uma consulta)
+        
+        Returns:
+            Dict[str, int]: {'schema': versão, 'seed': versão} (0 = nunca aplicado)
+        """
+        try:
+            return VersionStampService.get_versions([SCHEMA_STAMP, SEED_STAMP])
+        except (OperationalError, ProgrammingError):
+            # Tabela version_stamps ainda não existe
+            db.session.rollback()
+            return {SCHEMA_STAMP: 0, SEED_STAMP: 0}
+    
+    @staticmethod
+    def is_ready(status: Dict[str, int] = None) -> bool:
+        """Indica se schema e seed estão nas versões esperadas"""
+        status = status or SetupService.get_status()
+        return status[SCHEMA_STAMP] >= SCHEMA_VERSION and status[SEED_STAMP] >= SEED_VERSION
+    
+    @staticmethod
+    def init_db() -> Tuple[bool, str]:
+        """Cria tabelas, índices e o índice de busca textual e registra o carimbo de schema"""
+        try:
+            db.create_all()
+            
+            # Índices novos em tabelas já existentes (create_all só cria tabelas ausentes)
+            with db.engine.begin() as connection:
+                for table in db.metadata.sorted_tables:
+                    for index in table.indexes:
+                        connection.execute(CreateIndex(index, if_not_exists=True))
+            
+            # Bancos SQLite anteriores: api_keys sem AUTOINCREMENT reutilizava ids
+            SetupService._ensure_api_keys_autoincrement()
+            
+            # Bancos anteriores: users.created_at aceitava NULL
+            SetupService._backfill_users_created_at()
+            
+            # Índice de busca textual de usuários (FTS5 no SQLite)
+            from app.services.user_search_service import UserSearchService
+            UserSearchService.ensure_index()
+            
+            VersionStampService.set_version(SCHEMA_STAMP, SCHEMA_VERSION)
+            db.session.commit()
+            return True, f'Schema criado (versão {SCHEMA_VERSION})'
+        
+        except Exception as e:
+            db.session.rollback()
+            return False, f'Erro ao criar schema: {str(e)}'
+    
+    @staticmethod
+    def _ensure_api_keys_autoincrement():
+        """
+        Recria a tabela api_keys com AUTOINCREMENT em bancos SQLite antigos
+        
+        Sem ele o SQLite reutiliza o maior id após uma remoção, e uma nova chave
+        herdaria a revogação (por id) da chave removida. A sequência começa acima
+        de todos os ids já revogados.
+        """
+        if db.engine.dialect.name != 'sqlite':
+            return
+        
+        from app.models.api_key import ApiKey
+        table = ApiKey.__table__
+        
+        with db.engine.begin() as connection:
+            ddl = connection.execute(
+                text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"), {'name': table.name}
+            ).scalar()
+            if ddl is None or 'AUTOINCREMENT' in ddl.upper():
+                return
+            
+            connection.exec_driver_sql(f'ALTER TABLE {table.name} RENAME TO {table.name}_old')
+            indexes = connection.execute(
+                text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :name AND sql IS NOT NULL"),
+                {'name': f'{table.name}_old'}
+            ).scalars().all()
+            for index in indexes:
+                connection.exec_driver_sql(f'DROP INDEX {index}')
+            
+            table.create(connection)
+            columns = ', '.join(column.name for column in table.columns)
+            connection.exec_driver_sql(
+                f'INSERT INTO {table.name} ({columns}) SELECT {columns} FROM {table.name}_old'
+            )
+            connection.exec_driver_sql(f'DROP TABLE {table.name}_old')
+            
+            last_id = connection.execute(text(
+                'SELECT max(coalesce((SELECT max(id) FROM api_keys), 0), '
+                'coalesce((SELECT max(api_key_id) FROM api_key_revocations), 0))'
+            )).scalar()
+            connection.execute(text("DELETE FROM sqlite_sequence WHERE name = :name"), {'name': table.name})
+            connection.execute(
+                text('INSERT INTO sqlite_sequence (name, seq) VALUES (:name, :seq)'),
+                {'name': table.name, 'seq': last_id}
+            )
+    
+    @staticmethod
+    def _backfill_users_created_at():
+        """
+        Preenche created_at nulo (dados legados ou inserções manuais)
+        
+        A listagem pagina por (created_at, id) e o cursor é gerado a partir de
+        created_at. Usa updated_at quando existir, senão o instante atual;
+        bancos novos já criam a coluna como NOT NULL.
+        """
+        from app.models.user import User
+        
+        now = datetime.utcnow()
+        with db.engine.begin() as connection:
+            connection.execute(
+                update(User.__table__)
+                .where(User.__table__.c.created_at.is_(None))
+                .values(
+                    created_at=func.coalesce(User.__table__.c.updated_at, now),
+                    updated_at=func.coalesce(User.__table__.c.updated_at, now)
+                )
+            )
+    
+    @staticmethod
+    def seed() -> Tuple[bool, str]:
+        """Cria roles e o administrador padrão e registra o carimbo de seed"""
+        from app.utils.seed_data import initialize_default_data
+        
+        success, message = initialize_default_data()
+        if not success:
+            return False, message
+        
+        try:
+            VersionStampService.set_version(SEED_STAMP, SEED_VERSION)
+            db.session.commit()
+            return True, f'Dados padrão aplicados (versão {SEED_VERSION})'
+        
+        except Exception as e:
+            db.session.rollback()
+            return False, f'Erro ao registrar seed: {str(e)}'
+    
+    @staticmethod
+    def ensure_ready() -> bool:
+        """
+        Chamado por create_app: confere os carimbos e, se desatualizados, aplica
+        schema e seed quando AUTO_INIT_DB estiver habilitado
+        
+        Returns:
+            bool: True se o banco está pronto para uso
+        """
+        status = SetupService.get_status()
+        if SetupService.is_ready(status):
+            return True
+        
+        if not AppConfig.AUTO_INIT_DB:
+            print(f"AVISO: Banco não inicializado (schema {status[SCHEMA_STAMP]}/{SCHEMA_VERSION}, "
+                  f"seed {status[SEED_STAMP]}/{SEED_VERSION}); execute 'flask init-db'")
+            return False
+        
+        if status[SCHEMA_STAMP] < SCHEMA_VERSION:
+            success, message = SetupService.init_db()
+            if not success:
+                print(message)
+                return False
+        
+        if status[SEED_STAMP] < SEED_VERSION:
+            success, message = SetupService.seed()
+            if not success:
+                print(message)
+                return False
+        
+        return True
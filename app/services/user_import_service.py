@@ -0,0 +1,217 @@
+"""
+Serviço de importação de usuários - Criação em lote a partir de NDJSON ou CSV
+"""
+import codecs
+import csv
+import json
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy import insert, select
+from app.config.app import AppConfig
+from app.core.hashing import password_hasher
+from app.models.user import User, user_roles
+from app import db
+
+# Formatos aceitos e seus content types
+IMPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', 'application/jsonl', 'application/ndjson'),
+    'csv': ('text/csv',)
+}
+
+# Valores aceitos para is_active no CSV (comparados sem caixa e sem espaços)
+CSV_TRUE_VALUES = ('true', '1', 'sim', 'yes')
+CSV_FALSE_VALUES = ('false', '0', 'nao', 'não', 'no')
+
+class UserImportService:
+    """Serviço responsável pela importação de usuários em lote"""
+    
+    @staticmethod
+    def detect_format(mimetype: str, requested: str = None) -> Optional[str]:
+        """Determina o formato pelo parâmetro explícito ou pelo content type"""
+        if requested:
+            return requested if requested in IMPORT_FORMATS else None
+        
+        for name, mimetypes in IMPORT_FORMATS.items():
+            if mimetype in mimetypes:
+                return name
+        return None
+    
+    @staticmethod
+    def iter_rows(stream, format: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+        """
+        Lê as linhas do corpo da requisição sem carregá-lo inteiro em memória
+        
+        Yields:
+            Tuple[int, Optional[dict], Optional[str]]: (número da linha, dados, erro de leitura)
+        """
+        lines = codecs.iterdecode(stream, 'utf-8-sig')
+        
+        if format == 'csv':
+            reader = csv.DictReader(lines)
+            for row in reader:
+                # Colunas ausentes viram None; campos vazios são tratados como ausentes
+                data = {key: value for key, value in row.items() if key and value not in (None, '')}
+                if 'is_active' in data:
+                    value = data['is_active'].strip().lower()
+                    if value not in CSV_TRUE_VALUES + CSV_FALSE_VALUES:
+                        yield reader.line_num, None, 'Campo is_active deve ser booleano'
+                        continue
+                    data['is_active'] = value in CSV_TRUE_VALUES
+                yield reader.line_num, data, None
+            return
+        
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError:
+                yield line_number, None, 'JSON inválido'
+                continue
+            if not isinstance(data, dict):
+                yield line_number, None, 'Cada linha deve ser um objeto JSON'
+                continue
+            yield line_number, data, None
+    
+    @staticmethod
+    def import_users(rows: Iterable[Tuple[int, Optional[dict], Optional[str]]], chunk_size: int = None) -> dict:
+        """
+        Cria os usuários em transações de até chunk_size linhas
+        
+        Cada lote valida as linhas, descarta emails já cadastrados (uma consulta),
+        gera os hashes em paralelo no pool de processos e insere usuários e o
+        role 'client' em uma única transação. Linhas com erro não interrompem a
+        importação: são relatadas no resumo.
+        
+        Returns:
+            dict: Resumo com total, created, failed e errors (linha, email, erro)
+        """
+        chunk_size = chunk_size or AppConfig.USER_IMPORT_CHUNK_SIZE
+        summary = {'total': 0, 'created': 0, 'failed': 0, 'errors': [], 'errors_truncated': False}
+        
+        from app.services.role_service import RoleService
+        client_role = RoleService.get_role_by_name('client')
+        client_role_id = client_role.id if client_role else None
+        
+        seen_emails = set()
+        chunk = []
+        for line_number, data, error in rows:
+            summary['total'] += 1
+            
+            if error is None:
+                try:
+                    is_valid, error = User.validate_data(data, include_password=True)
+                except (TypeError, AttributeError):
+                    error = 'Campos name, email e password devem ser textos'
+            if error is None and not isinstance(data.get('is_active', True), bool):
+                error = 'Campo is_active deve ser booleano'
+            if error is None:
+                if data['email'] in seen_emails:
+                    error = 'Email duplicado no arquivo'
+                else:
+                    seen_emails.add(data['email'])
+                    chunk.append((line_number, data))
+            
+            if error is not None:
+                UserImportService._add_error(summary, line_number, data, error)
+            
+            if len(chunk) >= chunk_size:
+                UserImportService._import_chunk(chunk, client_role_id, summary)
+                chunk = []
+        
+        if chunk:
+            UserImportService._import_chunk(chunk, client_role_id, summary)
+        
+        summary['errors'].sort(key=lambda item: item['line'])
+        
+        if client_role_id is None and summary['created']:
+            print("AVISO: Role 'client' não encontrado; usuários importados sem role")
+        
+        return summary
+    
+    @staticmethod
+    def _import_chunk(chunk: List[Tuple[int, dict]], client_role_id: Optional[int], summary: dict):
+        """Insere um lote de linhas já validadas em uma única transação"""
+        emails = [data['email'] for _, data in chunk]
+        existing = set(db.session.execute(select(User.email).where(User.email.in_(emails))).scalars())
+        
+        pending = []
+        for line_number, data in chunk:
+            if data['email'] in existing:
+                UserImportService._add_error(summary, line_number, data, 'Email já cadastrado')
+            else:
+                pending.append((line_number, data))
+        
+        if not pending:
+            return
+        
+        try:
+            hashes = password_hasher.hash_many(
+                [data['password'] for _, data in pending],
+                AppConfig.PASSWORD_HASH_METHOD
+            )
+        except Exception as e:
+            # Ex: fila de hashing cheia; os lotes anteriores já foram gravados
+            for line_number, data in pending:
+                UserImportService._add_error(summary, line_number, data, f'Erro ao gerar hash da senha: {str(e)}')
+            return
+        
+        now = datetime.utcnow()
+        values = [
+            {
+                'name': data['name'],
+                'email': data['email'],
+                'password_hash': password_hash,
+                'is_active': data.get('is_active', True),
+                'created_at': now,
+                'updated_at': now
+            }
+            for (_, data), password_hash in zip(pending, hashes)
+        ]
+        
+        try:
+            user_ids = UserImportService._insert_users(values)
+            
+            if client_role_id is not None:
+                db.session.execute(
+                    user_roles.insert(),
+                    [{'user_id': user_id, 'role_id': client_role_id, 'assigned_at': now} for user_id in user_ids]
+                )
+            
+            db.session.commit()
+            summary['created'] += len(user_ids)
+        
+        except Exception as e:
+            db.session.rollback()
+            for line_number, data in pending:
+                UserImportService._add_error(summary, line_number, data, f'Erro ao inserir lote: {str(e)}')
+    
+    @staticmethod
+    def _insert_users(values: List[dict]) -> List[int]:
+        """
+        Insere os usuários e retorna os ids na ordem das linhas
+        
+        Usa um único INSERT ... RETURNING quando o banco garante a ordem (SQLite,
+        PostgreSQL); nos demais (ex: MySQL, sem RETURNING) insere linha a linha.
+        """
+        if db.engine.dialect.insert_executemany_returning_sort_by_parameter_order:
+            return db.session.execute(
+                insert(User).returning(User.id, sort_by_parameter_order=True),
+                values
+            ).scalars().all()
+        
+        return [db.session.execute(insert(User).values(**row)).inserted_primary_key[0] for row in values]
+    
+    @staticmethod
+    def _add_error(summary: dict, line_number: int, data: Optional[dict], error: str):
+        """Registra uma linha com erro no resumo (até USER_IMPORT_MAX_ERRORS detalhes)"""
+        summary['failed'] += 1
+        if len(summary['errors']) >= AppConfig.USER_IMPORT_MAX_ERRORS:
+            summary['errors_truncated'] = True
+            return
+        
+        summary['errors'].append({
+            'line': line_number,
+            'email': data.get('email') if isinstance(data, dict) else None,
+            'error': error
+        })
@@ -0,0 +1,171 @@
+"""
+Serviço de busca de usuários - Busca textual por nome e email
+
+No SQLite usa uma tabela virtual FTS5 (users_fts) mantida por triggers; nos
+demais bancos recorre a LIKE, sem ranking.
+"""
+import re
+from typing import List, Optional, Tuple
+from sqlalchemy import column, func, or_, select, table, text
+from sqlalchemy.exc import OperationalError
+from app.config.app import AppConfig
+from app.models.user import User
+from app import db
+
+# Tabela de conteúdo externo: o índice guarda apenas os termos, os dados ficam em users.
+# Índices de prefixo até 8 caracteres evitam expandir termos como "silva"* em todos os
+# tokens que começam assim (ex: "silva1987" em emails).
+_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS users_fts USING fts5(
+        name, email, content='users', content_rowid='id', prefix='2 3 4 5 6 7 8'
+    )
+    """,
+    # Ranking bm25 com peso maior para o nome
+    "INSERT INTO users_fts(users_fts, rank) VALUES ('rank', 'bm25(2.0, 1.0)')",
+    """
+    CREATE TRIGGER IF NOT EXISTS users_fts_ai AFTER INSERT ON users BEGIN
+        INSERT INTO users_fts(rowid, name, email) VALUES (new.id, new.name, new.email);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_fts_ad AFTER DELETE ON users BEGIN
+        INSERT INTO users_fts(users_fts, rowid, name, email) VALUES ('delete', old.id, old.name, old.email);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_fts_au AFTER UPDATE OF name, email ON users BEGIN
+        INSERT INTO users_fts(users_fts, rowid, name, email) VALUES ('delete', old.id, old.name, old.email);
+        INSERT INTO users_fts(rowid, name, email) VALUES (new.id, new.name, new.email);
+    END
+    """
+]
+
+_users_fts = table('users_fts', column('rowid'), column('rank'))
+
+# Disponibilidade do FTS5 no banco atual (None = ainda não verificado)
+_fts_state = {'enabled': None}
+
+class UserSearchService:
+    """Serviço responsável pela busca textual de usuários"""
+    
+    @staticmethod
+    def ensure_index() -> bool:
+        """
+        Cria (se necessário) o índice FTS5 e seus triggers de sincronização
+        
+        Na primeira criação o índice é preenchido com os usuários existentes.
+        
+        Returns:
+            bool: True se a busca por FTS5 está disponível
+        """
+        if db.engine.dialect.name != 'sqlite':
+            _fts_state['enabled'] = False
+            return False
+        
+        try:
+            with db.engine.begin() as connection:
+                exists = connection.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'users_fts'")
+                ).first()
+                
+                for statement in _FTS_DDL:
+                    connection.execute(text(statement))
+                
+                if not exists:
+                    connection.execute(text("INSERT INTO users_fts(users_fts) VALUES ('rebuild')"))
+        
+        except OperationalError:
+            # SQLite compilado sem FTS5
+            _fts_state['enabled'] = False
+            return False
+        
+        _fts_state['enabled'] = True
+        return True
+    
+    @staticmethod
+    def is_fts_enabled() -> bool:
+        """Indica se a busca usa o índice FTS5 (criado por flask init-db; criado aqui se ausente)"""
+        if _fts_state['enabled'] is None:
+            if db.engine.dialect.name == 'sqlite' and UserSearchService._index_exists():
+                _fts_state['enabled'] = True
+            else:
+                UserSearchService.ensure_index()
+        return _fts_state['enabled']
+    
+    @staticmethod
+    def _index_exists() -> bool:
+        """Verifica (só leitura) se a tabela users_fts já existe"""
+        with db.engine.connect() as connection:
+            return connection.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'users_fts'")
+            ).first() is not None
+    
+    @staticmethod
+    def _terms(query: str) -> List[str]:
+        """Extrai os termos da busca (palavras; pontuação e operadores são descartados)"""
+        return re.findall(r'\w+', query.lower())
+    
+    @staticmethod
+    def search(query: str, limit: int = None, offset: int = 0) -> Tuple[Optional[dict], bool, str]:
+        """
+        Busca usuários por prefixo de palavras do nome ou do email
+        
+        Todos os termos precisam ocorrer. Com FTS5, buscas com até
+        USER_SEARCH_RANK_WINDOW ocorrências vêm ordenadas por relevância (bm25);
+        buscas mais amplas (ex: prefixos de 2 letras) vêm na ordem do índice, pois
+        o bm25 precisaria percorrer todas as ocorrências. Sem FTS5, ordena por nome.
+        
+        Args:
+            query: Texto buscado (ex: "joa sil", "joao@email")
+            limit: Itens por página (padrão USERS_PAGE_SIZE, máximo USERS_PAGE_MAX)
+            offset: Quantidade de resultados a pular
+        
+        Returns:
+            Tuple[Optional[dict], bool, str]: ({'users', 'ranked', 'limit', 'offset', 'next_offset'}, sucesso, mensagem)
+        """
+        terms = UserSearchService._terms(query or '')
+        if not terms:
+            return None, False, 'Parâmetro q é obrigatório'
+        
+        limit = AppConfig.USERS_PAGE_SIZE if limit is None else limit
+        if limit < 1 or offset < 0:
+            return None, False, 'limit deve ser maior que zero e offset não pode ser negativo'
+        limit = min(limit, AppConfig.USERS_PAGE_MAX)
+        
+        ranked = False
+        if UserSearchService.is_fts_enabled():
+            match = text('users_fts MATCH :match').bindparams(match=' '.join(f'"{term}"*' for term in terms))
+            
+            # Contagem limitada: barata mesmo para prefixos muito comuns
+            window = AppConfig.USER_SEARCH_RANK_WINDOW
+            matches = select(_users_fts.c.rowid).where(match).limit(window + 1).subquery()
+            ranked = db.session.execute(select(func.count()).select_from(matches)).scalar() <= window
+            
+            if ranked:
+                candidates = select(_users_fts.c.rowid, _users_fts.c.rank).where(match).subquery()
+                order_by = (candidates.c.rank, User.id)
+            else:
+                candidates = select(_users_fts.c.rowid).where(match).subquery()
+                order_by = (candidates.c.rowid,)
+            
+            statement = select(User).join(candidates, candidates.c.rowid == User.id).order_by(*order_by)
+        else:
+            conditions = [
+                or_(
+                    func.lower(User.name).contains(term, autoescape=True),
+                    func.lower(User.email).contains(term, autoescape=True)
+                )
+                for term in terms
+            ]
+            statement = select(User).where(*conditions).order_by(User.name, User.id)
+        
+        # Um item a mais indica se existe próxima página
+        users = db.session.execute(statement.limit(limit + 1).offset(offset)).scalars().all()
+        next_offset = None
+        if len(users) > limit:
+            users = users[:limit]
+            next_offset = offset + limit
+        
+        page = {'users': users, 'ranked': ranked, 'limit': limit, 'offset': offset, 'next_offset': next_offset}
+        return page, True, 'Busca realizada com sucesso'
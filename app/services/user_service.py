@@ -2,7 +2,17 @@
 Serviço de usuário - Contém a lógica de negócio para operações com usuários
 """
 from typing import List, Tuple, Optional
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import selectinload
+from app.config.app import AppConfig
+from app.core.fieldsets import load_only_fields
+from app.core.hashing import HashingBusyError
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.projection import get_projection
+from app.core.sql import email_domain
 from app.models.user import User
+from app.services.auth_service import AuthService
+from app.services.authz_version_service import AuthzVersionService
 from app import db
 
 class UserService:
@@ -14,8 +24,96 @@ class UserService:
         return User.query.all()
     
     @staticmethod
-    def get_user_by_id(user_id: int) -> Optional[User]:
-        """Busca um usuário por ID"""
+    def list_users(filters: dict = None, limit: int = None, cursor: str = None, include_total: bool = False,
+                   include_roles: bool = False, include_api_keys: bool = False,
+                   fields: List[str] = None) -> Tuple[Optional[dict], bool, str]:
+        """
+        Lista usuários paginados por keyset em (created_at, id)
+        
+        Sem relacionamentos, a página é lida com um SELECT Core apenas das colunas
+        pedidas e serializada sem construir objetos ORM (ver app.core.projection).
+        
+        Args:
+            filters: is_active (bool), email_domain (str), created_from/created_to (datetime)
+            limit: Itens por página (padrão USERS_PAGE_SIZE, máximo USERS_PAGE_MAX)
+            cursor: Cursor opaco retornado na página anterior
+            include_total: Calcula o total exato de itens que atendem aos filtros
+            include_roles: Carrega os roles da página em uma única consulta (IN)
+            include_api_keys: Carrega as API Keys da página em uma única consulta (IN)
+            fields: Campos de User.FIELDS a retornar (padrão: todos)
+        
+        Returns:
+            Tuple[Optional[dict], bool, str]: ({'users' (dicionários), 'next_cursor', 'limit'[, 'total']}, sucesso, mensagem)
+        """
+        filters = filters or {}
+        limit = AppConfig.USERS_PAGE_SIZE if limit is None else limit
+        if limit < 1:
+            return None, False, 'limit deve ser maior que zero'
+        limit = min(limit, AppConfig.USERS_PAGE_MAX)
+        
+        conditions = []
+        if filters.get('is_active') is not None:
+            conditions.append(User.is_active.is_(filters['is_active']))
+        if filters.get('email_domain'):
+            conditions.append(email_domain(User.__table__.c.email) == filters['email_domain'].lower())
+        if filters.get('created_from'):
+            conditions.append(User.created_at >= filters['created_from'])
+        if filters.get('created_to'):
+            conditions.append(User.created_at < filters['created_to'])
+        
+        total = User.query.filter(*conditions).order_by(None).count() if include_total else None
+        
+        if cursor:
+            try:
+                cursor_created_at, cursor_id = decode_cursor(cursor)
+            except ValueError as e:
+                return None, False, str(e)
+            
+            conditions.append(or_(
+                User.created_at > cursor_created_at,
+                and_(User.created_at == cursor_created_at, User.id > cursor_id)
+            ))
+        
+        # Um item a mais indica se existe próxima página
+        if include_roles or include_api_keys:
+            query = User.query.filter(*conditions)
+            if include_roles:
+                query = query.options(selectinload(User.roles))
+            if include_api_keys:
+                query = query.options(selectinload(User.api_keys))
+            if fields is not None:
+                # created_at e id sempre são lidos: formam o cursor da próxima página
+                query = query.options(load_only_fields(User, fields, required=('id', 'created_at')))
+            
+            rows = query.order_by(User.created_at, User.id).limit(limit + 1).all()
+            cursor_values = lambda user: (user.created_at, user.id)
+            serialize = lambda user: user.to_dict(
+                include_roles=include_roles, include_api_keys=include_api_keys, fields=fields
+            )
+        else:
+            projection = get_projection(User, fields, required=('id', 'created_at'))
+            statement = projection.select().where(*conditions).order_by(User.created_at, User.id).limit(limit + 1)
+            
+            rows = db.session.execute(statement).all()
+            cursor_values = lambda row: (projection.value(row, 'created_at'), projection.value(row, 'id'))
+            serialize = projection.to_dict
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(*cursor_values(rows[-1]))
+        
+        page = {'users': [serialize(row) for row in rows], 'next_cursor': next_cursor, 'limit': limit}
+        if include_total:
+            page['total'] = total
+        
+        return page, True, 'Usuários listados com sucesso'
+    
+    @staticmethod
+    def get_user_by_id(user_id: int, include_roles: bool = False) -> Optional[User]:
+        """Busca um usuário por ID (com include_roles, os roles vêm em uma única consulta adicional)"""
+        if include_roles:
+            return db.session.get(User, user_id, options=[selectinload(User.roles)])
         return User.query.get(user_id)
     
     @staticmethod
@@ -30,6 +128,9 @@ class UserService:
         
         Returns:
             Tuple[User, bool, str]: (usuário, sucesso, mensagem)
+        
+        Raises:
+            HashingBusyError: Se a fila de hashing de senhas estiver cheia
         """
         # Validar dados incluindo senha
         is_valid, error_message = User.validate_data(user_data, include_password=True)
@@ -58,6 +159,10 @@ class UserService:
             
             return user, True, 'Usuário criado com sucesso'
         
+        except HashingBusyError:
+            db.session.rollback()
+            raise
+        
         except Exception as e:
             db.session.rollback()
             return None, False, f'Erro ao criar usuário: {str(e)}'
@@ -69,6 +174,9 @@ class UserService:
         
         Returns:
             Tuple[Optional[User], bool, str]: (usuário, sucesso, mensagem)
+        
+        Raises:
+            HashingBusyError: Se a fila de hashing de senhas estiver cheia (troca de senha)
         """
         user = UserService.get_user_by_id(user_id)
         if not user:
@@ -80,13 +188,24 @@ class UserService:
             if existing_user:
                 return None, False, 'Email já cadastrado'
         
+        was_active = user.is_active
+        
         try:
             # Atualizar usuário
             user.update_from_dict(user_data)
             db.session.commit()
+            AuthService.invalidate_principal(user_id)
+            
+            # Ativação/desativação invalida os tokens com claims de autorização
+            if user.is_active != was_active:
+                AuthzVersionService.bump_users([user_id])
             
             return user, True, 'Usuário atualizado com sucesso'
         
+        except HashingBusyError:
+            db.session.rollback()
+            raise
+        
         except Exception as e:
             db.session.rollback()
             return None, False, f'Erro ao atualizar usuário: {str(e)}'
@@ -104,8 +223,12 @@ class UserService:
             return False, 'Usuário não encontrado'
         
         try:
+            # A versão de autorização sai junto (FK); tokens antigos deixam de conferir
+            AuthzVersionService.delete_user(user_id)
             db.session.delete(user)
             db.session.commit()
+            AuthService.invalidate_principal(user_id)
+            AuthzVersionService.invalidate(user_id)
             
             return True, 'Usuário deletado com sucesso'
         
@@ -0,0 +1,55 @@
+"""
+Serviço de versões nomeadas - Permite que outros processos detectem alterações com uma consulta barata
+"""
+from datetime import datetime
+from typing import Dict, Iterable
+from sqlalchemy import select, update
+from app.models.version_stamp import VersionStamp
+from app import db
+
+class VersionStampService:
+    """Serviço responsável pelos contadores de versão (tabela version_stamps)"""
+    
+    @staticmethod
+    def get_version(name: str) -> int:
+        """Retorna a versão atual (0 se nunca incrementada)"""
+        version = db.session.execute(
+            select(VersionStamp.version).where(VersionStamp.name == name)
+        ).scalar()
+        return version or 0
+    
+    @staticmethod
+    def get_versions(names: Iterable[str]) -> Dict[str, int]:
+        """Retorna as versões de vários nomes em uma única consulta (0 para os ausentes)"""
+        names = list(names)
+        rows = db.session.execute(
+            select(VersionStamp.name, VersionStamp.version).where(VersionStamp.name.in_(names))
+        ).all()
+        versions = dict.fromkeys(names, 0)
+        versions.update({name: version for name, version in rows})
+        return versions
+    
+    @staticmethod
+    def set_version(name: str, version: int):
+        """Define a versão na transação atual (o commit fica a cargo de quem chama)"""
+        stamp = db.session.get(VersionStamp, name)
+        if stamp is None:
+            db.session.add(VersionStamp(name=name, version=version))
+        else:
+            stamp.version = version
+            stamp.updated_at = datetime.utcnow()
+    
+    @staticmethod
+    def bump(name: str):
+        """
+        Incrementa a versão na transação atual
+        
+        O commit fica a cargo de quem chama, junto com a alteração que motivou o incremento.
+        """
+        result = db.session.execute(
+            update(VersionStamp)
+            .where(VersionStamp.name == name)
+            .values(version=VersionStamp.version + 1, updated_at=datetime.utcnow())
+        )
+        if result.rowcount == 0:
+            db.session.add(VersionStamp(name=name, version=1))
@@ -0,0 +1,139 @@
+"""
+Documentação da API - Swagger UI (flasgger) e especificação OpenAPI gerada uma única vez
+
+O flasgger só é importado com DOCS_ENABLED (ou pelo comando flask build-spec).
+A especificação vem de OPENAPI_SPEC_FILE, quando o arquivo existe, ou é montada
+a partir das docstrings na primeira requisição. Nos dois casos fica em memória
+já codificada, com ETag e versões comprimidas.
+"""
+import os
+from flask import current_app
+from app.config.app import AppConfig
+from app.utils.precomputed_response import PrecomputedResponse
+
+SPEC_ENDPOINT = 'apispec'
+SPEC_ROUTE = '/apispec.json'
+
+SWAGGER_CONFIG = {
+    "headers": [],
+    "specs": [
+        {
+            "endpoint": SPEC_ENDPOINT,
+            "route": SPEC_ROUTE,
+            "rule_filter": lambda rule: True,
+            "model_filter": lambda tag: True,
+        }
+    ],
+    "static_url_path": "/flasgger_static",
+    "swagger_ui": True,
+    "specs_route": "/docs"
+}
+
+SWAGGER_TEMPLATE = {
+    "swagger": "2.0",
+    "info": {
+        "title": "Hello World Flask API",
+        "description": "API REST com autenticação JWT, API Keys e sistema de roles",
+        "version": "1.0.0",
+        "contact": {
+            "name": "API Support",
+            "email": "admin@system.com"
+        }
+    },
+    "host": "localhost:5000",
+    "basePath": "/",
+    "schemes": ["http", "https"],
+    "securityDefinitions": {
+        "Bearer": {
+            "type": "apiKey",
+            "name": "Authorization",
+            "in": "header",
+            "description": "JWT token no formato: Bearer {token}"
+        },
+        "ApiKey": {
+            "type": "apiKey",
+            "name": "X-API-Key",
+            "in": "header",
+            "description": "API Key para autenticação"
+        }
+    },
+    "tags": [
+        {
+            "name": "Main",
+            "description": "Endpoints principais da aplicação"
+        },
+        {
+            "name": "Auth",
+            "description": "Autenticação e autorização"
+        },
+        {
+            "name": "Users",
+            "description": "Gerenciamento de usuários"
+        },
+        {
+            "name": "API Keys",
+            "description": "Gerenciamento de API Keys"
+        },
+        {
+            "name": "Roles",
+            "description": "Sistema de roles e permissões"
+        },
+        {
+            "name": "Export",
+            "description": "Exportação de dados em stream"
+        }
+    ]
+}
+
+def _get_swagger(app):
+    """Instância do flasgger da aplicação (criada sob demanda, ex: no flask build-spec)"""
+    swagger = getattr(app, 'swag', None)
+    if swagger is None:
+        from flasgger import Swagger
+        swagger = Swagger(app, config=SWAGGER_CONFIG, template=SWAGGER_TEMPLATE)
+    return swagger
+
+def build_spec(app) -> dict:
+    """Monta a especificação OpenAPI a partir das docstrings das views (requer app context)"""
+    return _get_swagger(app).get_apispecs(SPEC_ENDPOINT)
+
+def _load_spec(app) -> PrecomputedResponse:
+    """Lê a especificação do arquivo gerado no build ou a monta a partir das docstrings"""
+    spec_file = AppConfig.OPENAPI_SPEC_FILE
+    if spec_file and os.path.exists(spec_file):
+        with open(spec_file, 'rb') as f:
+            return PrecomputedResponse(f.read(), 'application/json')
+    return PrecomputedResponse.from_json(app, build_spec(app))
+
+def get_spec(app) -> PrecomputedResponse:
+    """Especificação da aplicação, carregada na primeira chamada (ou no aquecimento pré-fork)"""
+    docs = app.extensions['api_docs']
+    spec = docs['spec']
+    if spec is None:
+        spec = docs['spec'] = _load_spec(app)
+    return spec
+
+def is_spec_served(app) -> bool:
+    """Indica se /apispec.json foi registrado por init_docs"""
+    return f'flasgger.{SPEC_ENDPOINT}' in app.view_functions or SPEC_ENDPOINT in app.view_functions
+
+def spec_view():
+    """GET /apispec.json: especificação gerada uma vez e servida já codificada"""
+    return get_spec(current_app).make_response()
+
+def init_docs(app):
+    """
+    Registra a documentação da API
+    
+    Com DOCS_ENABLED, registra o flasgger (/docs) e troca a view de /apispec.json
+    pela versão em cache. Sem ela, /apispec.json só existe se OPENAPI_SPEC_FILE
+    apontar para um arquivo gerado por flask build-spec.
+    """
+    app.extensions['api_docs'] = {'spec': None}
+    
+    if AppConfig.DOCS_ENABLED:
+        _get_swagger(app)
+        # A view original do flasgger serializa a especificação a cada acesso
+        app.view_functions[f'flasgger.{SPEC_ENDPOINT}'] = spec_view
+    elif AppConfig.OPENAPI_SPEC_FILE and os.path.exists(AppConfig.OPENAPI_SPEC_FILE):
+        app.add_url_rule(SPEC_ROUTE, SPEC_ENDPOINT, spec_view)
@@ -0,0 +1,90 @@
+"""
+Contexto de autenticação da requisição
+
+Os headers de credenciais são lidos uma única vez em um before_request e o
+resultado fica em flask.g.auth. O principal (JWT) e a API Key são resolvidos
+sob demanda, no máximo uma vez por requisição, e reutilizados pelos decoradores.
+"""
+from flask import g, request
+from app.services.auth_service import AuthService
+from app.services.api_key_service import ApiKeyService
+
+_UNRESOLVED = object()
+
+class AuthContext:
+    """Credenciais da requisição atual e seus resultados de validação"""
+    
+    __slots__ = ('is_malformed', 'is_bearer', 'token', 'api_key', '_principal', '_principal_error', '_api_key_result')
+    
+    def __init__(self, authorization: str = None, api_key_header: str = None):
+        self.is_malformed = False
+        self.is_bearer = False
+        self.token = None
+        self.api_key = api_key_header
+        self._principal = _UNRESOLVED
+        self._principal_error = None
+        self._api_key_result = None
+        
+        if authorization is not None:
+            parts = authorization.split(" ")
+            credential = parts[1] if len(parts) > 1 else None
+            
+            if authorization.startswith('ApiKey '):
+                # Formato: "ApiKey <key>" (X-API-Key tem precedência)
+                if self.api_key is None:
+                    self.api_key = credential
+            else:
+                # Formato: "Bearer <token>"
+                self.is_bearer = authorization.startswith('Bearer ')
+                self.token = credential
+                self.is_malformed = credential is None
+    
+    @classmethod
+    def from_request(cls) -> 'AuthContext':
+        """Lê os headers de credenciais da requisição atual"""
+        headers = request.headers
+        return cls(headers.get('Authorization'), headers.get('X-API-Key'))
+    
+    def get_principal(self):
+        """
+        Resolve (uma única vez) o principal do token JWT
+        
+        Raises:
+            JWTError: Se o token for inválido (a mesma exceção é relançada nas chamadas seguintes)
+        """
+        if self._principal is _UNRESOLVED:
+            try:
+                self._principal = AuthService.get_current_principal(self.token)
+            except Exception as e:
+                self._principal = None
+                self._principal_error = e
+        
+        if self._principal_error is not None:
+            raise self._principal_error
+        return self._principal
+    
+    def validate_api_key(self):
+        """
+        Valida (uma única vez) a API Key informada
+        
+        Returns:
+            Tuple[ApiKeyRecord, bool, str]: (api_key, válida, mensagem)
+        """
+        if self._api_key_result is None:
+            self._api_key_result = ApiKeyService.validate_api_key(self.api_key)
+        return self._api_key_result
+
+def load_auth_context():
+    """before_request: registra as credenciais da requisição em flask.g"""
+    g.auth = AuthContext.from_request()
+
+def get_auth_context() -> AuthContext:
+    """Retorna o contexto de autenticação da requisição (criando-o se necessário)"""
+    auth = g.get('auth')
+    if auth is None:
+        auth = g.auth = AuthContext.from_request()
+    return auth
+
+def init_auth(app):
+    """Registra a etapa de autenticação na aplicação"""
+    app.before_request(load_auth_context)
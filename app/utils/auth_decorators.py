@@ -1,57 +1,58 @@
 """
 Decoradores de autenticação para proteger rotas
+
+As credenciais são lidas uma única vez por requisição (ver auth_context); os
+decoradores apenas consultam o principal/API Key já resolvidos em flask.g.
 """
 from functools import wraps
-from flask import request, jsonify
+from flask import jsonify
 from jose import JWTError
-from app.services.auth_service import AuthService
-from app.services.api_key_service import ApiKeyService
+from app.core.permissions import permission_registry
+from app.utils.auth_context import get_auth_context
+
+def _error(message, status_code):
+    """Resposta de erro padrão dos decoradores"""
+    return jsonify({
+        'error': message,
+        'status': 'error'
+    }), status_code
+
+def _authenticate(bearer_only=False):
+    """
+    Obtém o principal da requisição atual
+    
+    Returns:
+        Tuple[Principal, Response]: (principal, None) ou (None, resposta de erro)
+    """
+    auth = get_auth_context()
+    
+    if auth.is_malformed and not bearer_only:
+        return None, _error('Token mal formatado', 401)
+    
+    if not auth.token or (bearer_only and not auth.is_bearer):
+        return None, _error('Token de acesso é obrigatório', 401)
+    
+    try:
+        return auth.get_principal(), None
+    except JWTError:
+        return None, _error('Token inválido ou expirado', 401)
+    except Exception as e:
+        return None, _error(f'Erro de autenticação: {str(e)}', 500)
 
 def token_required(f):
     """
     Decorador para proteger rotas que requerem autenticação
     
     Adiciona o usuário autenticado ao contexto da função como 'current_user'
+    (um Principal: snapshot imutável com id, roles e permissões)
     """
     @wraps(f)
     def decorated(*args, **kwargs):
-        token = None
-        
-        # Verificar se o token está no header Authorization
-        if 'Authorization' in request.headers:
-            auth_header = request.headers['Authorization']
-            try:
-                # Formato: "Bearer <token>"
-                token = auth_header.split(" ")[1]
-            except IndexError:
-                return jsonify({
-                    'error': 'Token mal formatado',
-                    'status': 'error'
-                }), 401
-        
-        if not token:
-            return jsonify({
-                'error': 'Token de acesso é obrigatório',
-                'status': 'error'
-            }), 401
+        current_user, error = _authenticate()
+        if error:
+            return error
         
-        try:
-            # Verificar e obter usuário do token
-            current_user = AuthService.get_current_user(token)
-            
-            # Adicionar usuário ao contexto da função
-            return f(current_user, *args, **kwargs)
-            
-        except JWTError as e:
-            return jsonify({
-                'error': 'Token inválido ou expirado',
-                'status': 'error'
-            }), 401
-        except Exception as e:
-            return jsonify({
-                'error': f'Erro de autenticação: {str(e)}',
-                'status': 'error'
-            }), 500
+        return f(current_user, *args, **kwargs)
     
     return decorated
 
@@ -63,44 +64,20 @@ def api_key_required(f):
     """
     @wraps(f)
     def decorated(*args, **kwargs):
-        api_key = None
+        auth = get_auth_context()
         
-        # Verificar se a API Key está no header X-API-Key ou Authorization
-        if 'X-API-Key' in request.headers:
-            api_key = request.headers['X-API-Key']
-        elif 'Authorization' in request.headers:
-            auth_header = request.headers['Authorization']
-            try:
-                # Formato: "ApiKey <key>"
-                if auth_header.startswith('ApiKey '):
-                    api_key = auth_header.split(" ")[1]
-            except IndexError:
-                pass
-        
-        if not api_key:
-            return jsonify({
-                'error': 'API Key é obrigatória',
-                'status': 'error'
-            }), 401
+        if not auth.api_key:
+            return _error('API Key é obrigatória', 401)
         
         try:
-            # Validar API Key
-            api_key_obj, is_valid, message = ApiKeyService.validate_api_key(api_key)
-            
-            if not is_valid:
-                return jsonify({
-                    'error': message,
-                    'status': 'error'
-                }), 401
-            
-            # Adicionar API Key ao contexto da função
-            return f(api_key_obj, *args, **kwargs)
-            
+            api_key_obj, is_valid, message = auth.validate_api_key()
         except Exception as e:
-            return jsonify({
-                'error': f'Erro de validação da API Key: {str(e)}',
-                'status': 'error'
-            }), 500
+            return _error(f'Erro de validação da API Key: {str(e)}', 500)
+        
+        if not is_valid:
+            return _error(message, 401)
+        
+        return f(api_key_obj, *args, **kwargs)
     
     return decorated
 
@@ -110,47 +87,14 @@ def admin_required(f):
     """
     @wraps(f)
     def decorated(*args, **kwargs):
-        # Aplicar autenticação primeiro
-        token = None
-        
-        if 'Authorization' in request.headers:
-            auth_header = request.headers['Authorization']
-            try:
-                if auth_header.startswith('Bearer '):
-                    token = auth_header.split(" ")[1]
-            except IndexError:
-                pass
+        current_user, error = _authenticate(bearer_only=True)
+        if error:
+            return error
         
-        if not token:
-            return jsonify({
-                'error': 'Token de acesso é obrigatório',
-                'status': 'error'
-            }), 401
+        if not current_user or not current_user.has_role('admin'):
+            return _error('Acesso negado. Privilégios de administrador são necessários.', 403)
         
-        try:
-            # Verificar token e obter usuário
-            current_user = AuthService.get_current_user(token)
-            
-            # Verificar se o usuário tem role de admin
-            if not current_user or not current_user.has_role('admin'):
-                return jsonify({
-                    'error': 'Acesso negado. Privilégios de administrador são necessários.',
-                    'status': 'error'
-                }), 403
-            
-            # Executar função com o usuário autenticado
-            return f(current_user, *args, **kwargs)
-            
-        except JWTError:
-            return jsonify({
-                'error': 'Token inválido ou expirado',
-                'status': 'error'
-            }), 401
-        except Exception as e:
-            return jsonify({
-                'error': f'Erro de autenticação: {str(e)}',
-                'status': 'error'
-            }), 500
+        return f(current_user, *args, **kwargs)
     
     return decorated
 
@@ -161,26 +105,21 @@ def permission_required(permission):
     Args:
         permission (str): Permissão necessária (ex: 'users:read', 'api_keys:write')
     """
+    # Bit da permissão resolvido uma única vez, na declaração da rota
+    permission_bit = permission_registry.register(permission)
+    
     def decorator(f):
         @wraps(f)
         def decorated(*args, **kwargs):
-            # Primeiro aplicar autenticação
-            auth_result = token_required(f)(*args, **kwargs)
-            
-            # Se retornou uma resposta de erro (não é uma função), retornar
-            if not callable(auth_result):
-                return auth_result
-            
-            # Verificar se o usuário tem a permissão necessária
-            current_user = args[0] if args else None
+            current_user, error = _authenticate()
+            if error:
+                return error
             
-            if not current_user or not current_user.has_permission(permission):
-                return jsonify({
-                    'error': f'Acesso negado. Permissão "{permission}" é necessária.',
-                    'status': 'error'
-                }), 403
+            # Verificar a permissão antes de executar a rota
+            if not current_user or not current_user.permission_mask & permission_bit:
+                return _error(f'Acesso negado. Permissão "{permission}" é necessária.', 403)
             
-            return auth_result
+            return f(current_user, *args, **kwargs)
         
         return decorated
     return decorator
@@ -195,23 +134,15 @@ def role_required(role_name):
     def decorator(f):
         @wraps(f)
         def decorated(*args, **kwargs):
-            # Primeiro aplicar autenticação
-            auth_result = token_required(f)(*args, **kwargs)
-            
-            # Se retornou uma resposta de erro (não é uma função), retornar
-            if not callable(auth_result):
-                return auth_result
-            
-            # Verificar se o usuário tem o role necessário
-            current_user = args[0] if args else None
+            current_user, error = _authenticate()
+            if error:
+                return error
             
+            # Verificar o role antes de executar a rota
             if not current_user or not current_user.has_role(role_name):
-                return jsonify({
-                    'error': f'Acesso negado. Role "{role_name}" é necessário.',
-                    'status': 'error'
-                }), 403
+                return _error(f'Acesso negado. Role "{role_name}" é necessário.', 403)
             
-            return auth_result
+            return f(current_user, *args, **kwargs)
         
         return decorated
     return decorator
@@ -222,51 +153,31 @@ def auth_or_api_key_required(f):
     """
     @wraps(f)
     def decorated(*args, **kwargs):
-        current_user = None
-        current_api_key = None
+        auth = get_auth_context()
         
         # Verificar se há token JWT
-        if 'Authorization' in request.headers:
-            auth_header = request.headers['Authorization']
-            if auth_header.startswith('Bearer '):
-                try:
-                    token = auth_header.split(" ")[1]
-                    current_user = AuthService.get_current_user(token)
-                    
-                    # SEGURANÇA: Verificar se usuário tem pelo menos um role
-                    if current_user and not current_user.roles:
-                        return jsonify({
-                            'error': 'Usuário não possui roles atribuídos. Acesso negado.',
-                            'status': 'error'
-                        }), 403
-                    
-                    return f(current_user=current_user, current_api_key=None, *args, **kwargs)
-                except JWTError:
-                    pass
-        
-        # Se não há token JWT válido, verificar API Key
-        api_key = None
-        if 'X-API-Key' in request.headers:
-            api_key = request.headers['X-API-Key']
-        elif 'Authorization' in request.headers:
-            auth_header = request.headers['Authorization']
+        if auth.is_bearer and auth.token:
             try:
-                if auth_header.startswith('ApiKey '):
-                    api_key = auth_header.split(" ")[1]
-            except IndexError:
-                pass
+                current_user = auth.get_principal()
+            except JWTError:
+                current_user = None
+            
+            if current_user is not None:
+                # SEGURANÇA: Verificar se usuário tem pelo menos um role
+                if not current_user.roles:
+                    return _error('Usuário não possui roles atribuídos. Acesso negado.', 403)
+                
+                return f(current_user=current_user, current_api_key=None, *args, **kwargs)
         
-        if api_key:
+        # Se não há token JWT válido, verificar API Key
+        if auth.api_key:
             try:
-                api_key_obj, is_valid, message = ApiKeyService.validate_api_key(api_key)
+                api_key_obj, is_valid, message = auth.validate_api_key()
                 if is_valid:
                     return f(current_user=None, current_api_key=api_key_obj, *args, **kwargs)
             except Exception:
                 pass
         
-        return jsonify({
-            'error': 'Token JWT ou API Key é obrigatório',
-            'status': 'error'
-        }), 401
+        return _error('Token JWT ou API Key é obrigatório', 401)
     
     return decorated
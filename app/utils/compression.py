@@ -0,0 +1,88 @@
+"""
+Compressão de respostas - gzip ou brotli negociados pelo Accept-Encoding
+
+Só respostas de tipos textuais acima de COMPRESSION_MIN_SIZE bytes são
+comprimidas; respostas em stream (ex: exportação) e já codificadas passam
+intactas. O brotli é opcional (pacote brotli ou brotlicffi).
+"""
+import gzip
+from flask import request
+from app.config.app import AppConfig
+
+try:
+    import brotli
+except ImportError:  # Dependência opcional
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+# Tipos de conteúdo que valem a pena comprimir
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/javascript',
+    'application/x-ndjson',
+    'image/svg+xml',
+    'text/css',
+    'text/csv',
+    'text/html',
+    'text/javascript',
+    'text/plain'
+}
+
+def available_encodings():
+    """Codificações suportadas, na ordem de preferência do servidor"""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Comprime o corpo com a codificação e o nível configurados"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=AppConfig.COMPRESSION_BROTLI_LEVEL)
+    return gzip.compress(data, compresslevel=AppConfig.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+def negotiate_encoding(size: int):
+    """
+    Codificação a usar para um corpo de size bytes
+    
+    Returns:
+        Optional[str]: 'br', 'gzip' ou None (compressão desabilitada, corpo pequeno ou não aceita)
+    """
+    if not AppConfig.COMPRESSION_ENABLED or size < AppConfig.COMPRESSION_MIN_SIZE:
+        return None
+    return request.accept_encodings.best_match(available_encodings())
+
+def compress_response(response):
+    """after_request: comprime a resposta se o cliente aceitar e ela for grande o bastante"""
+    if (response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or response.direct_passthrough
+            or response.is_streamed
+            or response.status_code < 200
+            or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers):
+        return response
+    
+    # O conteúdo varia com o Accept-Encoding mesmo quando não é comprimido
+    response.vary.add('Accept-Encoding')
+    
+    if response.content_length is not None and response.content_length < AppConfig.COMPRESSION_MIN_SIZE:
+        return response
+    
+    data = response.get_data()
+    encoding = negotiate_encoding(len(data))
+    if encoding is None:
+        return response
+    
+    response.set_data(compress(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    
+    # O corpo deixou de ser idêntico byte a byte: ETags fortes viram fracas
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    
+    return response
+
+def init_compression(app):
+    """Registra a compressão de respostas na aplicação (se habilitada)"""
+    if AppConfig.COMPRESSION_ENABLED:
+        app.after_request(compress_response)
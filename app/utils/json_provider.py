@@ -0,0 +1,75 @@
+"""
+Provedor JSON da aplicação - Usa orjson quando instalado e o json da stdlib como alternativa
+
+Datas são serializadas nativamente em ISO 8601, então os modelos entregam
+objetos datetime em to_dict() sem formatá-los.
+"""
+from datetime import date
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # Dependência opcional: sem ela, usa o json da stdlib
+    orjson = None
+
+JSON_ENCODERS = ('auto', 'orjson', 'stdlib')
+
+def json_default(value):
+    """Serializa tipos que o encoder não conhece (datas em ISO 8601; os demais como no Flask)"""
+    if isinstance(value, date):
+        return value.isoformat()
+    return DefaultJSONProvider.default(value)
+
+class JSONProvider(DefaultJSONProvider):
+    """Provedor JSON com datas em ISO 8601 e encoder plugável (orjson ou stdlib)"""
+    
+    default = staticmethod(json_default)
+    
+    def __init__(self, app, encoder: str = 'auto'):
+        """
+        Args:
+            app: Aplicação Flask
+            encoder: 'auto' (orjson se instalado), 'orjson' ou 'stdlib'
+        
+        Raises:
+            ValueError: Se o encoder for inválido ou 'orjson' não estiver instalado
+        """
+        super().__init__(app)
+        
+        if encoder not in JSON_ENCODERS:
+            raise ValueError(f"JSON_ENCODER inválido: {encoder} (use {', '.join(JSON_ENCODERS)})")
+        if encoder == 'orjson' and orjson is None:
+            raise ValueError('JSON_ENCODER=orjson, mas o pacote orjson não está instalado')
+        
+        self.encoder = 'orjson' if encoder != 'stdlib' and orjson is not None else 'stdlib'
+    
+    def _orjson_options(self, pretty: bool = False) -> int:
+        """Opções do orjson equivalentes às do provedor padrão"""
+        options = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if pretty:
+            options |= orjson.OPT_INDENT_2
+        return options
+    
+    def dumps(self, obj, **kwargs) -> str:
+        """Serializa para texto (com argumentos extras, usa a stdlib)"""
+        if self.encoder == 'orjson' and not kwargs:
+            return orjson.dumps(obj, default=json_default, option=self._orjson_options()).decode()
+        return super().dumps(obj, **kwargs)
+    
+    def loads(self, s, **kwargs):
+        """Desserializa texto ou bytes"""
+        if self.encoder == 'orjson' and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+    
+    def response(self, *args, **kwargs):
+        """Resposta JSON (usada por jsonify); com orjson, o corpo já sai em bytes"""
+        if self.encoder != 'orjson':
+            return super().response(*args, **kwargs)
+        
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=json_default, option=self._orjson_options(pretty))
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
@@ -0,0 +1,63 @@
+"""
+Respostas pré-computadas - Corpos constantes codificados uma única vez
+
+Para conteúdo fixo (ex: /, /health, a especificação OpenAPI): o corpo, a ETag
+forte e as versões comprimidas são gerados uma vez; cada requisição só monta
+os headers, respondendo 304 quando o If-None-Match confere.
+"""
+import hashlib
+from flask import current_app, request
+from werkzeug.http import parse_etags, quote_etag
+from app.config.app import AppConfig
+from app.utils.compression import compress, negotiate_encoding
+
+class PrecomputedResponse:
+    """Corpo já codificado com ETag forte derivada do conteúdo"""
+    
+    __slots__ = ('body', 'content_type', 'etag', '_etag_header', '_compressed')
+    
+    def __init__(self, body: bytes, content_type: str):
+        self.body = body
+        self.content_type = content_type
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+        self._etag_header = quote_etag(self.etag)
+        
+        # Corpos comprimidos por codificação (gerados na primeira requisição que aceitar cada uma)
+        self._compressed = {}
+    
+    @classmethod
+    def from_json(cls, app, payload) -> 'PrecomputedResponse':
+        """Codifica o payload exatamente como jsonify faria na aplicação"""
+        response = app.json.response(payload)
+        return cls(response.get_data(), response.content_type)
+    
+    def _compressed_body(self, encoding: str) -> bytes:
+        """Corpo comprimido na codificação pedida (calculado uma única vez)"""
+        body = self._compressed.get(encoding)
+        if body is None:
+            body = self._compressed[encoding] = compress(self.body, encoding)
+        return body
+    
+    def make_response(self):
+        """Resposta condicional: 304 sem corpo se o If-None-Match conferir, senão 200 com o corpo"""
+        # Comparação fraca, como pede o RFC 9110 para If-None-Match
+        if_none_match = request.environ.get('HTTP_IF_NONE_MATCH')
+        if if_none_match and (if_none_match == self._etag_header
+                              or parse_etags(if_none_match).contains_weak(self.etag)):
+            response = current_app.response_class(status=304)
+            response.headers['ETag'] = self._etag_header
+            return response
+        
+        encoding = negotiate_encoding(len(self.body))
+        if encoding is None:
+            response = current_app.response_class(self.body, content_type=self.content_type)
+            response.headers['ETag'] = self._etag_header
+        else:
+            # Já comprimida: o after_request de compressão não a processa de novo
+            response = current_app.response_class(self._compressed_body(encoding), content_type=self.content_type)
+            response.headers['Content-Encoding'] = encoding
+            response.headers['ETag'] = 'W/' + self._etag_header
+        
+        if AppConfig.COMPRESSION_ENABLED and len(self.body) >= AppConfig.COMPRESSION_MIN_SIZE:
+            response.vary.add('Accept-Encoding')
+        return response
@@ -57,6 +57,22 @@ class ResponseUtils:
         
         return jsonify(response), status_code
     
+    @staticmethod
+    def unavailable_response(message: str, retry_after: int = 1) -> tuple:
+        """
+        Cria uma resposta 503 padronizada para sobrecarga temporária
+        
+        Args:
+            message: Mensagem de erro
+            retry_after: Segundos sugeridos ao cliente antes de tentar novamente
+            
+        Returns:
+            Tuple contendo resposta JSON e código de status
+        """
+        response, status_code = ResponseUtils.error_response(message, status_code=503)
+        response.headers['Retry-After'] = str(retry_after)
+        return response, status_code
+    
     @staticmethod
     def validation_error_response(errors: Dict[str, str], status_code: int = 422) -> tuple:
         """
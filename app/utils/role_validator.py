@@ -4,6 +4,8 @@ Utilitário para validação e consistência de roles
 from app.models.user import User
 from app.models.role import Role
 from app.services.role_service import RoleService
+from app.services.auth_service import AuthService
+from app.services.authz_version_service import AuthzVersionService
 from app import db
 
 class RoleValidator:
@@ -113,6 +115,8 @@ class RoleValidator:
                 return False, "Role 'client' não encontrado"
             
             user.add_role(client_role)
+            AuthService.invalidate_principal(user_id)
+            AuthzVersionService.bump_users([user_id])
             return True, f"Role 'client' atribuído ao usuário {user.email}"
             
         except Exception as e:
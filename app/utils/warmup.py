@@ -0,0 +1,47 @@
+"""
+Aquecimento pré-fork - Estado somente leitura carregado uma vez no processo mestre
+
+Com o servidor de produção (wsgi.py + gunicorn.conf.py) a aplicação é criada no
+mestre; o que for carregado aqui é herdado pelos workers no fork (cópia sob
+demanda) em vez de ser montado por cada um na primeira requisição.
+"""
+from app import db
+from app.core.hashing import password_hasher
+
+def warm_up(app) -> dict:
+    """
+    Carrega o catálogo de roles, a especificação OpenAPI e a resposta de /info
+    
+    Returns:
+        dict: O que foi carregado (para log do servidor)
+    """
+    from app.controllers.main_controller import get_info_response
+    from app.services.role_service import RoleService
+    from app.utils.api_docs import get_spec, is_spec_served
+    
+    loaded = {}
+    with app.app_context():
+        loaded['roles'] = len(RoleService.get_all_roles())
+        loaded['info'] = len(get_info_response(app).body)
+        if is_spec_served(app):
+            loaded['spec'] = len(get_spec(app).body)
+        
+        # Conexões abertas no mestre não podem ser compartilhadas com os workers
+        for engine in db.engines.values():
+            engine.dispose()
+    
+    # O pool de hashing usado pelo seed no mestre não pode ser herdado pelos workers
+    password_hasher.shutdown()
+    
+    return loaded
+
+def dispose_engines(app):
+    """
+    Descarta o pool herdado do mestre em um worker recém-criado (post_fork)
+    
+    close=False: as conexões do mestre não são fechadas pelo filho, só abandonadas;
+    o worker abre as suas sob demanda.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
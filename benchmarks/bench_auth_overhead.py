@@ -0,0 +1,116 @@
+"""
+Benchmark do custo de autenticação por requisição
+
+Compara uma rota pública com rotas protegidas pelos decoradores (JWT e API Key)
+e conta quantas vezes o principal é resolvido por requisição.
+
+Uso:
+    python benchmarks/bench_auth_overhead.py [--requests 3000]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db'))
+
+from app import create_app
+from app.models.user import User
+from app.services.api_key_service import ApiKeyService
+from app.services.auth_service import AuthService
+from app.utils.auth_decorators import admin_required, api_key_required, permission_required, role_required
+
+def build_app():
+    """Cria a aplicação com rotas mínimas para cada decorador"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        app = create_app()
+    
+    @app.route('/_bench/public')
+    def bench_public():
+        return 'ok'
+    
+    @app.route('/_bench/admin')
+    @admin_required
+    def bench_admin(current_user):
+        return 'ok'
+    
+    @app.route('/_bench/stacked')
+    @role_required('admin')
+    def bench_stacked(current_user):
+        return _stacked_inner()
+    
+    @permission_required('users:read')
+    def _stacked_inner(current_user):
+        return 'ok'
+    
+    @app.route('/_bench/api-key')
+    @api_key_required
+    def bench_api_key(current_api_key):
+        return 'ok'
+    
+    return app
+
+def count_resolutions():
+    """Instrumenta AuthService.get_current_principal e retorna o contador"""
+    counter = {'calls': 0}
+    original = AuthService.get_current_principal
+    
+    def counted(token):
+        counter['calls'] += 1
+        return original(token)
+    
+    AuthService.get_current_principal = staticmethod(counted)
+    return counter
+
+def run(client, path, headers, requests):
+    """Mede a latência média de uma rota"""
+    for _ in range(50):
+        assert client.get(path, headers=headers).status_code == 200, path
+    
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get(path, headers=headers)
+    return (time.perf_counter() - start) / requests * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=3000)
+    args = parser.parse_args()
+    
+    app = build_app()
+    client = app.test_client()
+    
+    with app.app_context():
+        admin = User.query.filter_by(email='admin@system.com').first()
+        token = AuthService.create_access_token(admin.id, user=admin)
+        api_key, _, _ = ApiKeyService.create_api_key({'name': 'bench', 'user_id': admin.id})
+        plain_key = api_key._plain_key
+    
+    bearer = {'Authorization': f'Bearer {token}'}
+    routes = [
+        ('public', '/_bench/public', {}),
+        ('admin', '/_bench/admin', bearer),
+        ('stacked', '/_bench/stacked', bearer),
+        ('api-key', '/_bench/api-key', {'X-API-Key': plain_key}),
+    ]
+    
+    counter = count_resolutions()
+    baseline = None
+    
+    print(f"{'rota':<10} {'us/req':>10} {'auth us':>10} {'principal/req':>14}")
+    for name, path, headers in routes:
+        latency = run(client, path, headers, args.requests)
+        if baseline is None:
+            baseline = latency
+        
+        counter['calls'] = 0
+        client.get(path, headers=headers)
+        
+        print(f"{name:<10} {latency:>10.1f} {latency - baseline:>10.1f} {counter['calls']:>14}")
+
+if __name__ == '__main__':
+    main()
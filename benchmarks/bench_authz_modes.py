@@ -0,0 +1,77 @@
+"""
+Benchmark de throughput da autorização em uma rota protegida por admin_required
+
+Modos comparados:
+    db         - usuário e roles carregados do banco a cada requisição
+    principal  - snapshot do usuário servido pelo cache de principals
+    claims     - roles/permissões embutidos no JWT (apenas a versão é conferida)
+
+Uso:
+    python benchmarks/bench_authz_modes.py [--requests 3000]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db'))
+
+from app import create_app
+from app.config.app import AppConfig
+from app.models.user import User
+from app.services.auth_service import AuthService
+from app.utils.auth_decorators import admin_required
+
+def build_app():
+    """Cria a aplicação com uma rota mínima protegida por admin_required"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        app = create_app()
+    
+    @app.route('/_bench/admin')
+    @admin_required
+    def bench_admin(current_user):
+        return 'ok'
+    
+    return app
+
+def run_mode(app, client, mode, requests):
+    """Mede requisições por segundo em um modo de autorização"""
+    AppConfig.PRINCIPAL_CACHE_ENABLED = mode == 'principal'
+    AppConfig.JWT_AUTHZ_CLAIMS_ENABLED = mode == 'claims'
+    AuthService.invalidate_principal()
+    
+    with app.app_context():
+        admin = User.query.filter_by(email='admin@system.com').first()
+        token = AuthService.create_access_token(admin.id, user=admin)
+    headers = {'Authorization': f'Bearer {token}'}
+    
+    # Aquecimento (cache de tokens e principals)
+    for _ in range(50):
+        assert client.get('/_bench/admin', headers=headers).status_code == 200
+    
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get('/_bench/admin', headers=headers)
+    elapsed = time.perf_counter() - start
+    
+    return requests / elapsed, elapsed / requests * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=3000)
+    args = parser.parse_args()
+    
+    app = build_app()
+    client = app.test_client()
+    
+    print(f"{'modo':<10} {'req/s':>10} {'us/req':>10}")
+    for mode in ('db', 'principal', 'claims'):
+        rps, latency = run_mode(app, client, mode, args.requests)
+        print(f"{mode:<10} {rps:>10.0f} {latency:>10.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark da compressão de respostas: CPU gasta x bytes economizados
+
+Gera respostas reais (listagem de usuários, de API Keys e a especificação
+OpenAPI) e mede, para cada codificação e nível, o tempo de compressão, o
+tamanho final e os bytes economizados por milissegundo de CPU. Serve para
+escolher COMPRESSION_GZIP_LEVEL, COMPRESSION_BROTLI_LEVEL e COMPRESSION_MIN_SIZE.
+
+Uso:
+    python benchmarks/bench_compression.py [--users 200] [--repeat 20]
+"""
+import argparse
+import contextlib
+import gzip
+import io
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db'))
+os.environ.setdefault('USERS_PAGE_MAX', '100000')
+
+from app import create_app, db
+from app.models.api_key import ApiKey
+from app.models.user import User
+from app.services.auth_service import AuthService
+from app.utils.compression import brotli
+
+def populate(total):
+    """Insere usuários e API Keys sintéticos"""
+    now = datetime.utcnow()
+    with db.engine.begin() as connection:
+        connection.execute(User.__table__.insert(), [
+            {
+                'name': f'Usuário {i}',
+                'email': f'usuario{i}@bench.com',
+                'password_hash': '!',
+                'is_active': True,
+                'created_at': now,
+                'updated_at': now
+            }
+            for i in range(total)
+        ])
+        connection.execute(ApiKey.__table__.insert(), [
+            {
+                'name': f'key {i}',
+                'key_hash': f'{i:064x}',
+                'description': f'API Key do serviço {i}',
+                'is_active': True,
+                'user_id': 1,
+                'created_at': now
+            }
+            for i in range(total)
+        ])
+
+def codecs():
+    """(codificação, nível, função de compressão) de cada configuração medida"""
+    for level in (1, 3, 6, 9):
+        yield 'gzip', level, lambda data, level=level: gzip.compress(data, compresslevel=level, mtime=0)
+    if brotli is not None:
+        for quality in (1, 4, 6, 9, 11):
+            yield 'br', quality, lambda data, quality=quality: brotli.compress(data, quality=quality)
+
+def measure(function, data, repeat):
+    """Melhor tempo (ms) de compressão e o tamanho comprimido"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        compressed = function(data)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(compressed)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        app = create_app()
+    client = app.test_client()
+    
+    with app.app_context():
+        populate(args.users)
+        admin = User.query.filter_by(email='admin@system.com').first()
+        headers = {'Authorization': f'Bearer {AuthService.create_access_token(admin.id, user=admin)}'}
+    
+    # Corpos sem compressão (sem Accept-Encoding)
+    bodies = {
+        'users': client.get(f'/api/users?limit={args.users}', headers=headers).get_data(),
+        'api-keys': client.get('/api/api-keys', headers=headers).get_data(),
+        'apispec': client.get('/apispec.json').get_data()
+    }
+    
+    if brotli is None:
+        print('brotli não instalado: medindo apenas gzip')
+    
+    print(f"{'resposta':<10} {'original':>9} {'codec':<6} {'nível':>5} {'final':>8} {'razão':>6} {'ms':>7} {'KB salvos/ms':>13}")
+    for name, data in bodies.items():
+        for encoding, level, function in codecs():
+            elapsed, size = measure(function, data, args.repeat)
+            saved_per_ms = (len(data) - size) / 1024 / elapsed
+            print(f'{name:<10} {len(data):>9} {encoding:<6} {level:>5} {size:>8} '
+                  f'{len(data) / size:>5.1f}x {elapsed:>7.2f} {saved_per_ms:>13.0f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark da listagem de usuários com roles (include_roles)
+
+Popula o banco com usuários vinculados a roles e conta quantos comandos SQL
+cada requisição executa para diferentes tamanhos de página. Com o carregamento
+antecipado (selectinload) a quantidade deve ser constante; o script termina com
+erro se ela variar com o tamanho da página.
+
+Uso:
+    python benchmarks/bench_include_roles.py [--users 1000] [--pages 10,50,200]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db'))
+
+from sqlalchemy import event
+from app import create_app, db
+from app.models.role import Role
+from app.models.user import User, user_roles
+from app.services.auth_service import AuthService
+
+def populate(total):
+    """Insere usuários sintéticos, cada um com dois roles"""
+    role_ids = [role.id for role in Role.query.filter(Role.name.in_(['client', 'moderator', 'admin'])).all()]
+    now = datetime.utcnow()
+    
+    with db.engine.begin() as connection:
+        existing = connection.execute(db.select(db.func.count()).select_from(User.__table__)).scalar()
+        if existing >= total:
+            return
+        
+        rows = [
+            {
+                'name': f'Usuário {i}',
+                'email': f'usuario{i}@bench.com',
+                'password_hash': '!',
+                'is_active': True,
+                'created_at': now,
+                'updated_at': now
+            }
+            for i in range(existing, total)
+        ]
+        user_ids = connection.execute(
+            User.__table__.insert().returning(User.__table__.c.id, sort_by_parameter_order=True), rows
+        ).scalars().all()
+        connection.execute(user_roles.insert(), [
+            {'user_id': user_id, 'role_id': role_id, 'assigned_at': now}
+            for index, user_id in enumerate(user_ids)
+            for role_id in (role_ids[index % len(role_ids)], role_ids[(index + 1) % len(role_ids)])
+        ])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--pages', default='10,50,200')
+    parser.add_argument('--requests', type=int, default=50)
+    args = parser.parse_args()
+    page_sizes = [int(size) for size in args.pages.split(',')]
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        app = create_app()
+    client = app.test_client()
+    
+    with app.app_context():
+        populate(args.users)
+        admin = User.query.filter_by(email='admin@system.com').first()
+        headers = {'Authorization': f'Bearer {AuthService.create_access_token(admin.id, user=admin)}'}
+        admin_id = admin.id
+        
+        counter = {'statements': 0}
+        
+        @event.listens_for(db.engine, 'before_cursor_execute')
+        def count_statement(*_):
+            counter['statements'] += 1
+    
+    routes = [(f'lista limit={size}', f'/api/users?limit={size}&include_roles=true') for size in page_sizes]
+    routes.append(('detalhe', f'/api/users/{admin_id}?include_roles=true'))
+    
+    # Aquecimento (caches de principal e do catálogo de roles)
+    for _, path in routes:
+        assert client.get(path, headers=headers).status_code == 200, path
+    
+    print(f"{'requisição':<18} {'sql/req':>8} {'ms/req':>8}")
+    list_counts = set()
+    for name, path in routes:
+        counter['statements'] = 0
+        client.get(path, headers=headers)
+        statements = counter['statements']
+        if name != 'detalhe':
+            list_counts.add(statements)
+        
+        start = time.perf_counter()
+        for _ in range(args.requests):
+            client.get(path, headers=headers)
+        elapsed = (time.perf_counter() - start) / args.requests * 1000
+        
+        print(f'{name:<18} {statements:>8} {elapsed:>8.2f}')
+    
+    if len(list_counts) > 1:
+        sys.exit('ERRO: a quantidade de comandos SQL varia com o tamanho da página (N+1)')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark da serialização JSON de listas grandes de usuários
+
+Compara o caminho anterior (datas formatadas em to_dict + provedor padrão do
+Flask) com o JSONProvider da aplicação usando a stdlib e o orjson (se
+instalado). Mede a geração da resposta, como em jsonify.
+
+Uso:
+    python benchmarks/bench_json_encode.py [--users 1000,10000,100000] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from app.utils.json_provider import JSONProvider, orjson
+
+def build_users(total):
+    """Usuários no formato de User.to_dict() (datas como datetime)"""
+    now = datetime.utcnow()
+    return [
+        {
+            'id': i,
+            'name': f'Usuário {i}',
+            'email': f'usuario{i}@bench.com',
+            'is_active': i % 10 != 0,
+            'created_at': now - timedelta(seconds=i),
+            'updated_at': now
+        }
+        for i in range(total)
+    ]
+
+def preformatted(users):
+    """Caminho anterior: to_dict já devolvia as datas como texto"""
+    return [
+        dict(user, created_at=user['created_at'].isoformat(), updated_at=user['updated_at'].isoformat())
+        for user in users
+    ]
+
+def measure(app, provider, payload_factory, users, repeat):
+    """Melhor tempo (ms) para montar o payload e gerar a resposta JSON, e o corpo gerado"""
+    app.json = provider
+    best = None
+    with app.test_request_context():
+        for _ in range(repeat):
+            start = time.perf_counter()
+            body = provider.response({'status': 'success', 'data': {'users': payload_factory(users)}}).get_data()
+            elapsed = (time.perf_counter() - start) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+    return best, body
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', default='1000,10000,100000')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    
+    app = Flask(__name__)
+    variants = [
+        ('anterior', DefaultJSONProvider(app), preformatted),
+        ('stdlib', JSONProvider(app, encoder='stdlib'), list),
+    ]
+    if orjson is not None:
+        variants.append(('orjson', JSONProvider(app, encoder='orjson'), list))
+    else:
+        print('orjson não instalado: medindo apenas a stdlib')
+    
+    print(f"{'usuários':>9} {'encoder':<9} {'ms':>9} {'MB':>7} {'ganho':>7}")
+    for total in (int(size) for size in args.users.split(',')):
+        users = build_users(total)
+        baseline = None
+        reference = None
+        for name, provider, payload_factory in variants:
+            elapsed, body = measure(app, provider, payload_factory, users, args.repeat)
+            decoded = json.loads(body)
+            if reference is None:
+                baseline, reference = elapsed, decoded
+            elif decoded != reference:
+                sys.exit(f'ERRO: saída do encoder {name} difere do caminho anterior')
+            
+            print(f'{total:>9} {name:<9} {elapsed:>9.1f} {len(body) / 1e6:>7.1f} {baseline / elapsed:>6.1f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark da serialização de listagens: objetos ORM + to_dict() x projeção Core
+
+Popula o banco com usuários e API Keys sintéticos e mede, para cada tamanho,
+o tempo de ler e serializar todas as linhas pelos dois caminhos. O script
+confere que as duas saídas são idênticas.
+
+Uso:
+    python benchmarks/bench_serializers.py [--rows 10000,100000] [--repeat 3]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db'))
+
+from app import create_app, db
+from app.core.projection import get_projection
+from app.models.api_key import ApiKey
+from app.models.user import User
+
+def populate(total, batch_size=10000):
+    """Insere usuários e API Keys sintéticos até atingir total linhas de cada"""
+    now = datetime.utcnow()
+    
+    with db.engine.begin() as connection:
+        existing = connection.execute(db.select(db.func.count()).select_from(ApiKey.__table__)).scalar()
+        for start in range(existing, total, batch_size):
+            stop = min(start + batch_size, total)
+            connection.execute(User.__table__.insert(), [
+                {
+                    'name': f'Usuário {i}',
+                    'email': f'usuario{i}@bench.com',
+                    'password_hash': '!',
+                    'is_active': i % 10 != 0,
+                    'created_at': now,
+                    'updated_at': now
+                }
+                for i in range(start, stop)
+            ])
+            connection.execute(ApiKey.__table__.insert(), [
+                {
+                    'name': f'key {i}',
+                    'key_hash': f'{i:064x}',
+                    'description': None if i % 2 else f'API Key {i}',
+                    'is_active': True,
+                    'user_id': 1,
+                    'created_at': now,
+                    'expires_at': now + timedelta(days=(i % 60) - 30) if i % 3 else None,
+                    'last_used_at': None
+                }
+                for i in range(start, stop)
+            ])
+
+def orm_path(model):
+    """Caminho atual: objetos ORM no identity map + to_dict()"""
+    data = [obj.to_dict() for obj in model.query.order_by(model.id).all()]
+    db.session.expunge_all()
+    return data
+
+def projection_path(model):
+    """SELECT Core das colunas + acessores pré-compilados"""
+    projection = get_projection(model)
+    rows = db.session.execute(projection.select().order_by(model.id)).all()
+    return [projection.to_dict(row) for row in rows]
+
+def measure(function, model, repeat):
+    """Melhor tempo (ms) entre as repetições e a última saída"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        data = function(model)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, data
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', default='10000,100000')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        app = create_app()
+    
+    with app.app_context():
+        print(f"{'tabela':<10} {'linhas':>8} {'orm ms':>9} {'core ms':>9} {'ganho':>7}")
+        for total in sorted(int(size) for size in args.rows.split(',')):
+            populate(total)
+            
+            for model in (User, ApiKey):
+                orm_ms, orm_data = measure(orm_path, model, args.repeat)
+                core_ms, core_data = measure(projection_path, model, args.repeat)
+                if orm_data != core_data:
+                    sys.exit(f'ERRO: saídas diferentes para {model.__tablename__}')
+                
+                print(f'{model.__tablename__:<10} {len(orm_data):>8} {orm_ms:>9.1f} {core_ms:>9.1f} {orm_ms / core_ms:>6.1f}x')
+
+if __name__ == '__main__':
+    main()
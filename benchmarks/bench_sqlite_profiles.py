@@ -0,0 +1,132 @@
+"""
+Benchmark de leitura/escrita concorrente no SQLite por perfil de PRAGMAs
+
+Para cada perfil de SQLITE_PROFILES cria um banco novo (journal_mode fica
+gravado no arquivo), popula usuários e dispara processos que, durante
+--seconds, fazem uma mistura de leituras (usuário por id e página da
+listagem) e escritas (UPDATE com commit), como vários workers do gunicorn.
+Reporta operações por segundo, latência p95 de cada tipo e erros de lock.
+
+Uso:
+    python benchmarks/bench_sqlite_profiles.py [--workers 4] [--seconds 5] [--write-ratio 0.2]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from app import db
+from app.core.sqlite import SQLITE_PROFILES, apply_pragmas, read_pragmas, resolve_pragmas
+import app.models  # noqa: F401 (registra as tabelas em db.metadata)
+
+READ_BY_ID = text('SELECT id, name, email, is_active, created_at FROM users WHERE id = :id')
+READ_PAGE = text('SELECT id, name, email, is_active, created_at FROM users ORDER BY id LIMIT 50 OFFSET :offset')
+WRITE = text('UPDATE users SET updated_at = :now WHERE id = :id')
+
+def make_engine(url, profile):
+    """Engine com os PRAGMAs do perfil aplicados em cada conexão"""
+    engine = create_engine(url)
+    apply_pragmas(engine, resolve_pragmas(profile))
+    return engine
+
+def prepare(url, profile, users):
+    """Cria o schema e insere usuários sintéticos"""
+    engine = make_engine(url, profile)
+    db.metadata.create_all(engine)
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        connection.execute(db.metadata.tables['users'].insert(), [
+            {
+                'name': f'Usuário {i}',
+                'email': f'usuario{i}@bench.com',
+                'password_hash': '!',
+                'is_active': True,
+                'created_at': now,
+                'updated_at': now
+            }
+            for i in range(users)
+        ])
+    with engine.connect() as connection:
+        pragmas = read_pragmas(connection, ['journal_mode', 'synchronous', 'busy_timeout'])
+    engine.dispose()
+    return pragmas
+
+def worker(url, profile, users, seconds, write_ratio, seed):
+    """Processo de carga: retorna latências (s) de leitura, de escrita e erros de lock"""
+    engine = make_engine(url, profile)
+    rng = random.Random(seed)
+    reads, writes, errors = [], [], 0
+    deadline = time.perf_counter() + seconds
+    
+    while time.perf_counter() < deadline:
+        is_write = rng.random() < write_ratio
+        start = time.perf_counter()
+        try:
+            if is_write:
+                with engine.begin() as connection:
+                    connection.execute(WRITE, {'now': datetime.utcnow(), 'id': rng.randint(1, users)})
+            else:
+                with engine.connect() as connection:
+                    if rng.random() < 0.5:
+                        connection.execute(READ_BY_ID, {'id': rng.randint(1, users)}).first()
+                    else:
+                        connection.execute(READ_PAGE, {'offset': rng.randint(0, max(0, users - 50))}).all()
+        except OperationalError:
+            errors += 1
+            continue
+        (writes if is_write else reads).append(time.perf_counter() - start)
+    
+    engine.dispose()
+    return reads, writes, errors
+
+def p95(samples):
+    """Percentil 95 em ms"""
+    if len(samples) < 2:
+        return 0.0
+    return statistics.quantiles(samples, n=20)[-1] * 1000
+
+def run_profile(profile, args):
+    """Executa a carga de um perfil em um banco novo"""
+    url = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), f'{profile}.db')
+    pragmas = prepare(url, profile, args.users)
+    
+    context = multiprocessing.get_context('fork' if 'fork' in multiprocessing.get_all_start_methods() else None)
+    with context.Pool(args.workers) as pool:
+        results = pool.starmap(worker, [
+            (url, profile, args.users, args.seconds, args.write_ratio, seed) for seed in range(args.workers)
+        ])
+    
+    reads = [sample for result in results for sample in result[0]]
+    writes = [sample for result in results for sample in result[1]]
+    errors = sum(result[2] for result in results)
+    return pragmas, reads, writes, errors
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--profiles', default=','.join(SQLITE_PROFILES))
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--write-ratio', type=float, default=0.2)
+    parser.add_argument('--users', type=int, default=5000)
+    args = parser.parse_args()
+    
+    print(f'{args.workers} processos, {args.seconds:.0f} s, {args.write_ratio:.0%} escritas, {args.users} usuários')
+    print(f"{'perfil':<12} {'journal':<8} {'sync':>4} {'leit/s':>8} {'escr/s':>8} "
+          f"{'p95 leit ms':>12} {'p95 escr ms':>12} {'erros':>6}")
+    for profile in args.profiles.split(','):
+        pragmas, reads, writes, errors = run_profile(profile, args)
+        print(f"{profile:<12} {pragmas['journal_mode']:<8} {pragmas['synchronous']:>4} "
+              f'{len(reads) / args.seconds:>8.0f} {len(writes) / args.seconds:>8.0f} '
+              f'{p95(reads):>12.2f} {p95(writes):>12.2f} {errors:>6}')
+
+if __name__ == '__main__':
+    main()
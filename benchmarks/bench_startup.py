@@ -0,0 +1,81 @@
+"""
+Benchmark da inicialização de um worker: importação x create_app
+
+Cada medição roda em um processo Python novo (como um worker recém-criado) e
+reporta separadamente o tempo de importar o pacote app e o de executar
+create_app. Compara o banco já preparado (flask init-db: só a conferência dos
+carimbos) com o banco sem carimbos (schema, índices e seed a cada boot, como
+antes), com a documentação habilitada ou não.
+
+Uso:
+    python benchmarks/bench_startup.py [--runs 7]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Executado em cada processo filho: mede importação e factory e imprime um JSON
+CHILD = '''
+import contextlib, io, json, sys, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    app.create_app()
+created = time.perf_counter()
+print(json.dumps({'import': (imported - start) * 1000, 'factory': (created - imported) * 1000}))
+'''
+
+def run_child(env):
+    """Executa um boot em processo novo e retorna os tempos (ms)"""
+    output = subprocess.run(
+        [sys.executable, '-c', CHILD], cwd=ROOT, env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def reset_stamps(database):
+    """Remove os carimbos para forçar schema e seed no próximo boot"""
+    import sqlite3
+    with sqlite3.connect(database) as connection:
+        connection.execute("DELETE FROM version_stamps WHERE name IN ('schema', 'seed')")
+
+def measure(env, runs, database=None):
+    """Medianas de importação e factory em runs processos"""
+    samples = []
+    for _ in range(runs):
+        if database is not None:
+            reset_stamps(database)
+        samples.append(run_child(env))
+    return (statistics.median(sample['import'] for sample in samples),
+            statistics.median(sample['factory'] for sample in samples))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=7)
+    args = parser.parse_args()
+    
+    database = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    base_env = dict(os.environ, DATABASE_URL=f'sqlite:///{database}', PYTHONPATH=ROOT)
+    
+    # Prepara o banco uma vez (equivalente a flask init-db)
+    run_child(dict(base_env, AUTO_INIT_DB='True'))
+    
+    scenarios = [
+        ('carimbos ok, docs on', dict(base_env, AUTO_INIT_DB='False'), None),
+        ('carimbos ok, docs off', dict(base_env, AUTO_INIT_DB='False', DOCS_ENABLED='False'), None),
+        ('init a cada boot, docs on', dict(base_env, AUTO_INIT_DB='True'), database),
+    ]
+    
+    print(f"{'cenário':<27} {'import ms':>10} {'factory ms':>11} {'total ms':>9}")
+    for name, env, reset in scenarios:
+        imported, factory = measure(env, args.runs, reset)
+        print(f'{name:<27} {imported:>10.1f} {factory:>11.1f} {imported + factory:>9.1f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Benchmark do cache de tokens verificados em AuthService.verify_token
+
+Compara o custo por requisição da decodificação completa (python-jose + HMAC)
+com o caminho servido pelo cache LRU.
+
+Uso:
+    python benchmarks/bench_token_cache.py [--requests 20000] [--tokens 2000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config.app import AppConfig
+from app.services.auth_service import AuthService
+
+def run(tokens, requests):
+    """Executa verify_token para uma sequência de tokens reutilizados"""
+    sequence = [random.choice(tokens) for _ in range(requests)]
+    start = time.perf_counter()
+    for token in sequence:
+        AuthService.verify_token(token)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--tokens', type=int, default=2000)
+    args = parser.parse_args()
+    
+    tokens = [AuthService.create_access_token(user_id) for user_id in range(1, args.tokens + 1)]
+    
+    AppConfig.JWT_CACHE_ENABLED = False
+    uncached = run(tokens, args.requests)
+    
+    AppConfig.JWT_CACHE_ENABLED = True
+    AuthService.clear_token_cache()
+    cached = run(tokens, args.requests)
+    stats = AuthService.get_token_cache_stats()
+    
+    print(f"Tokens ativos: {args.tokens} | Requisições: {args.requests}")
+    print(f"Sem cache: {uncached / args.requests * 1e6:8.2f} us/req")
+    print(f"Com cache: {cached / args.requests * 1e6:8.2f} us/req")
+    print(f"Speedup:   {uncached / cached:8.2f}x")
+    print(f"Cache:     {stats}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark da busca textual de usuários (FTS5)
+
+Popula o banco com usuários sintéticos e mede a latência de buscas por prefixo
+(UserSearchService.search, primeira página) com percentis.
+
+Uso:
+    python benchmarks/bench_user_search.py [--users 1000000] [--queries 500]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db'))
+
+from app import create_app, db
+from app.models.user import User
+from app.services.user_search_service import UserSearchService
+
+FIRST_NAMES = ['ana', 'joao', 'maria', 'pedro', 'lucas', 'julia', 'marcos', 'paula', 'rafael', 'beatriz',
+               'carlos', 'fernanda', 'gabriel', 'helena', 'igor', 'larissa', 'mateus', 'natalia', 'otavio', 'renata']
+LAST_NAMES = ['silva', 'souza', 'oliveira', 'santos', 'pereira', 'lima', 'carvalho', 'ferreira', 'rodrigues', 'almeida',
+              'costa', 'gomes', 'martins', 'araujo', 'barbosa', 'ribeiro', 'alves', 'monteiro', 'cardoso', 'teixeira']
+DOMAINS = ['email.com', 'corp.io', 'empresa.com.br', 'mail.net', 'exemplo.org']
+
+def populate(total, batch_size=10000):
+    """Insere usuários sintéticos em lote (os triggers alimentam o índice FTS5)"""
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    statement = User.__table__.insert()
+    
+    with db.engine.begin() as connection:
+        existing = connection.execute(db.select(db.func.count()).select_from(User.__table__)).scalar()
+        for start in range(existing, total, batch_size):
+            rows = []
+            for i in range(start, min(start + batch_size, total)):
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                rows.append({
+                    'name': f'{first.title()} {last.title()} {i}',
+                    'email': f'{first}.{last}{i}@{rng.choice(DOMAINS)}',
+                    'password_hash': '!',
+                    'is_active': True,
+                    'created_at': now,
+                    'updated_at': now
+                })
+            connection.execute(statement, rows)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=1000000)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        app = create_app()
+    
+    with app.app_context():
+        if not UserSearchService.is_fts_enabled():
+            sys.exit('FTS5 indisponível neste banco/SQLite')
+        
+        start = time.perf_counter()
+        populate(args.users)
+        print(f'{args.users} usuários populados em {time.perf_counter() - start:.1f}s')
+        
+        rng = random.Random(7)
+        words = FIRST_NAMES + LAST_NAMES
+        queries = []
+        for _ in range(args.queries):
+            word = rng.choice(words)
+            prefix = word[:rng.randint(2, len(word))]
+            # Metade das buscas combina dois prefixos (ex: "mar sil")
+            if rng.random() < 0.5:
+                other = rng.choice(LAST_NAMES)
+                prefix = f'{prefix} {other[:rng.randint(2, len(other))]}'
+            queries.append(prefix)
+        
+        # Aquecimento (páginas do índice em cache)
+        for query in queries[:20]:
+            UserSearchService.search(query, limit=args.limit)
+        
+        timings = {'todas': [], 'bm25': [], 'índice': []}
+        for query in queries:
+            start = time.perf_counter()
+            page, success, _ = UserSearchService.search(query, limit=args.limit)
+            elapsed = (time.perf_counter() - start) * 1000
+            assert success
+            timings['todas'].append(elapsed)
+            timings['bm25' if page['ranked'] else 'índice'].append(elapsed)
+            db.session.expunge_all()
+        
+        print(f"{'ordem':<8} {'buscas':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        for name, values in timings.items():
+            if not values:
+                continue
+            values.sort()
+            print(f'{name:<8} {len(values):>7} {statistics.median(values):>8.2f} '
+                  f'{values[int(len(values) * 0.95)]:>8.2f} '
+                  f'{values[int(len(values) * 0.99)]:>8.2f} '
+                  f'{values[-1]:>8.2f}')
+
+if __name__ == '__main__':
+    main()
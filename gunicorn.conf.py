@@ -0,0 +1,58 @@
+"""
+Configuração do gunicorn - Servidor de produção com workers pré-forkados
+
+Uso:
+    flask init-db          # uma vez por deploy (ou AUTO_INIT_DB=True, executado só no mestre)
+    gunicorn wsgi:app      # este arquivo é carregado automaticamente do diretório atual
+
+A aplicação é criada e aquecida uma vez no mestre (preload_app) e cada worker
+descarta o pool de conexões herdado e cria seu pool de hashing logo após o fork.
+"""
+import os
+from dotenv import load_dotenv
+
+# .env primeiro, para que os valores abaixo só valham quando não configurados
+load_dotenv()
+
+# Produção: debug desabilitado antes de AppConfig ser lido
+os.environ['FLASK_DEBUG'] = 'False'
+
+# Cada worker tem seu próprio pool de hashing: por padrão um processo por worker,
+# em vez de um por CPU em cada worker
+os.environ.setdefault('PASSWORD_HASH_WORKERS', '1')
+
+from app.config.app import AppConfig
+
+_cpus = os.cpu_count() or 1
+
+bind = f'{AppConfig.HOST}:{AppConfig.PORT}'
+
+# (2 x CPUs) + 1 processos e 2 threads cada: as threads cobrem a espera por
+# banco/rede, os processos o trabalho de CPU (limitado pelo GIL em cada um)
+workers = AppConfig.SERVER_WORKERS or 2 * _cpus + 1
+threads = AppConfig.SERVER_THREADS or 2
+worker_class = 'gthread'
+
+timeout = AppConfig.SERVER_TIMEOUT
+keepalive = AppConfig.SERVER_KEEPALIVE
+
+# Aplicação criada uma vez no mestre e compartilhada (cópia sob demanda) com os workers
+preload_app = True
+
+accesslog = '-' if AppConfig.SERVER_ACCESS_LOG else None
+
+def when_ready(server):
+    """Mestre pronto: registra o dimensionamento e o que foi pré-carregado"""
+    from wsgi import warmed
+    server.log.info('Workers: %s x %s threads (%s CPUs); pré-carregado: %s', workers, threads, _cpus, warmed)
+
+def post_fork(server, worker):
+    """
+    Worker recém-criado: abandona as conexões herdadas do mestre e inicia o
+    pool de hashing enquanto o worker ainda não tem threads
+    """
+    from wsgi import app
+    from app.core.hashing import password_hasher
+    from app.utils.warmup import dispose_engines
+    dispose_engines(app)
+    password_hasher.start()
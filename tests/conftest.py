@@ -0,0 +1,50 @@
+"""
+Fixtures compartilhadas dos testes (banco SQLite temporário por sessão)
+"""
+import contextlib
+import io
+import os
+import tempfile
+
+# O banco é lido de DATABASE_URL na importação da configuração
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'test.db')
+# Hash barato: os testes não medem o custo das senhas
+os.environ['PASSWORD_HASH_METHOD'] = 'pbkdf2:sha256:1000'
+
+import pytest
+from app import create_app, db
+from app.models.user import User
+from app.services.auth_service import AuthService
+
+@pytest.fixture(scope='session')
+def app():
+    """Aplicação com schema e dados padrão criados"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return create_app()
+
+@pytest.fixture(scope='session')
+def client(app):
+    return app.test_client()
+
+@pytest.fixture(scope='session')
+def admin_headers(app):
+    """Header Authorization com um token do administrador padrão"""
+    with app.app_context():
+        admin = User.query.filter_by(email='admin@system.com').first()
+        return {'Authorization': f'Bearer {AuthService.create_access_token(admin.id, user=admin)}'}
+
+@pytest.fixture
+def count_statements(app):
+    """Conta os comandos SQL executados (before_cursor_execute) enquanto ativo"""
+    from sqlalchemy import event
+    
+    counter = {'statements': 0}
+    
+    def count(*_):
+        counter['statements'] += 1
+    
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', count)
+    yield counter
+    event.remove(engine, 'before_cursor_execute', count)
@@ -0,0 +1,91 @@
+"""
+Importação de usuários em stream (NDJSON e CSV): lotes, role client e resumo por linha
+"""
+import json
+import pytest
+from app.config.app import AppConfig
+from app.models.user import User
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    """Lotes de 2 linhas: as importações abaixo passam por vários INSERT ... RETURNING"""
+    monkeypatch.setattr(AppConfig, 'USER_IMPORT_CHUNK_SIZE', 2)
+
+def post_import(client, headers, body, content_type):
+    response = client.post('/api/users/import', data=body.encode('utf-8'),
+                           headers={**headers, 'Content-Type': content_type})
+    assert response.status_code == 200
+    return response.get_json()['data']
+
+def assert_imported(app, valid, inactive):
+    """Usuários válidos gravados com o role client e o is_active informado"""
+    with app.app_context():
+        for email in valid:
+            user = User.query.filter_by(email=email).first()
+            assert user is not None, email
+            assert [role.name for role in user.roles] == ['client']
+            assert user.is_active == (email not in inactive)
+            assert user.check_password('senha123')
+
+def errors_by_line(summary):
+    return {error['line']: error['error'] for error in summary['errors']}
+
+def test_import_ndjson_mixed_rows(app, client, admin_headers):
+    rows = [
+        {'name': 'Ana Lima', 'email': 'ana@ndjson.com', 'password': 'senha123'},
+        {'name': 'Bruno Reis', 'email': 'bruno@ndjson.com', 'password': 'senha123', 'is_active': False},
+        {'name': 'Ana Dupla', 'email': 'ana@ndjson.com', 'password': 'senha123'},
+        {'name': 'Carla Dias', 'email': 'carla@ndjson.com', 'password': 'senha123', 'is_active': 'sim'},
+        {'name': 'Sem Senha', 'email': 'semsenha@ndjson.com'},
+        {'name': 'Admin', 'email': 'admin@system.com', 'password': 'senha123'},
+        {'name': 'Davi Costa', 'email': 'davi@ndjson.com', 'password': 'senha123', 'is_active': True}
+    ]
+    body = '\n'.join(json.dumps(row) for row in rows) + '\n{invalido\n'
+    
+    summary = post_import(client, admin_headers, body, 'application/x-ndjson')
+    
+    assert summary['total'] == 8
+    assert summary['created'] == 3
+    assert summary['failed'] == 5
+    errors = errors_by_line(summary)
+    assert sorted(errors) == [3, 4, 5, 6, 8]
+    assert errors[3] == 'Email duplicado no arquivo'
+    assert errors[4] == 'Campo is_active deve ser booleano'
+    assert errors[6] == 'Email já cadastrado'
+    assert errors[8] == 'JSON inválido'
+    
+    assert_imported(app, ['ana@ndjson.com', 'bruno@ndjson.com', 'davi@ndjson.com'], {'bruno@ndjson.com'})
+    with app.app_context():
+        assert User.query.filter_by(email='carla@ndjson.com').first() is None
+        assert User.query.filter_by(email='semsenha@ndjson.com').first() is None
+
+def test_import_csv_mixed_rows(app, client, admin_headers):
+    body = (
+        'name,email,password,is_active\n'
+        'Ana Lima,ana@csv.com,senha123,\n'
+        'Bruno Reis,bruno@csv.com,senha123,Não\n'
+        'Ana Dupla,ana@csv.com,senha123,true\n'
+        'Carla Dias,carla@csv.com,senha123,ture\n'
+        'Sem Email,,senha123,1\n'
+        'Davi Costa,davi@csv.com,senha123,SIM\n'
+    )
+    
+    summary = post_import(client, admin_headers, body, 'text/csv')
+    
+    assert summary['total'] == 6
+    assert summary['created'] == 3
+    assert summary['failed'] == 3
+    errors = errors_by_line(summary)
+    # Números de linha do arquivo (o cabeçalho é a linha 1)
+    assert sorted(errors) == [4, 5, 6]
+    assert errors[4] == 'Email duplicado no arquivo'
+    assert errors[5] == 'Campo is_active deve ser booleano'
+    
+    assert_imported(app, ['ana@csv.com', 'bruno@csv.com', 'davi@csv.com'], {'bruno@csv.com'})
+    with app.app_context():
+        assert User.query.filter_by(email='carla@csv.com').first() is None
+
+def test_import_rejects_unknown_format(client, admin_headers):
+    response = client.post('/api/users/import', data=b'{}',
+                           headers={**admin_headers, 'Content-Type': 'application/xml'})
+    assert response.status_code == 400
@@ -0,0 +1,165 @@
+"""
+Listagem de usuários: paginação por cursor, filtros e quantidade de comandos SQL com roles (sem N+1)
+"""
+import base64
+from datetime import datetime
+import pytest
+from app import db
+from app.models.role import Role
+from app.models.user import User, user_roles
+
+TOTAL_USERS = 60
+
+# Usuários do domínio usado nos testes de paginação: um lote com o mesmo
+# created_at (como uma importação) e alguns criados depois
+PAGED_DOMAIN = 'paginacao.com'
+SHARED_CREATED_AT = datetime(2024, 1, 1, 12, 0, 0)
+LATER_CREATED_AT = datetime(2024, 2, 1, 12, 0, 0)
+SHARED_USERS = 23
+LATER_USERS = 5
+INACTIVE_USERS = 7
+
+@pytest.fixture(scope='module', autouse=True)
+def users_with_roles(app):
+    """Usuários sintéticos, cada um com dois roles"""
+    now = datetime.utcnow()
+    with app.app_context():
+        role_ids = [role.id for role in Role.query.filter(Role.name.in_(['client', 'admin'])).all()]
+        with db.engine.begin() as connection:
+            user_ids = connection.execute(
+                User.__table__.insert().returning(User.__table__.c.id, sort_by_parameter_order=True),
+                [
+                    {
+                        'name': f'Usuário {i}',
+                        'email': f'listagem{i}@test.com',
+                        'password_hash': '!',
+                        'is_active': True,
+                        'created_at': now,
+                        'updated_at': now
+                    }
+                    for i in range(TOTAL_USERS)
+                ]
+            ).scalars().all()
+            connection.execute(user_roles.insert(), [
+                {'user_id': user_id, 'role_id': role_id, 'assigned_at': now}
+                for user_id in user_ids
+                for role_id in role_ids
+            ])
+
+@pytest.fixture(scope='module')
+def paged_user_ids(app):
+    """Ids dos usuários do domínio de paginação na ordem da listagem (created_at, id)"""
+    rows = [
+        {
+            'name': f'Paginado {i}',
+            'email': f'paginado{i}@{PAGED_DOMAIN}',
+            'password_hash': '!',
+            'is_active': i >= INACTIVE_USERS,
+            'created_at': SHARED_CREATED_AT if i < SHARED_USERS else LATER_CREATED_AT,
+            'updated_at': SHARED_CREATED_AT
+        }
+        for i in range(SHARED_USERS + LATER_USERS)
+    ]
+    with app.app_context():
+        with db.engine.begin() as connection:
+            return connection.execute(
+                User.__table__.insert().returning(User.__table__.c.id, sort_by_parameter_order=True),
+                rows
+            ).scalars().all()
+
+def list_users(client, headers, query):
+    response = client.get(f'/api/users?email_domain={PAGED_DOMAIN}&{query}', headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()['data']
+
+def walk_pages(client, headers, query):
+    """Percorre todas as páginas seguindo next_cursor; retorna os ids e o número de páginas"""
+    ids, pages, cursor = [], 0, None
+    while True:
+        # Um cursor que não avança repetiria a mesma página para sempre
+        assert pages <= SHARED_USERS + LATER_USERS, 'next_cursor não avança'
+        data = list_users(client, headers, query + (f'&cursor={cursor}' if cursor else ''))
+        ids += [user['id'] for user in data['users']]
+        pages += 1
+        cursor = data['next_cursor']
+        if cursor is None:
+            return ids, pages
+
+@pytest.mark.parametrize('limit', [1, 4, 23, 50])
+def test_cursor_walks_every_user_once(client, admin_headers, paged_user_ids, limit):
+    ids, pages = walk_pages(client, admin_headers, f'limit={limit}')
+    
+    # Sem duplicados nem lacunas, inclusive dentro do lote com o mesmo created_at
+    assert ids == paged_user_ids
+    assert pages == -(-len(paged_user_ids) // limit)
+
+def test_filters(client, admin_headers, paged_user_ids):
+    inactive, _ = walk_pages(client, admin_headers, 'limit=3&is_active=false')
+    assert inactive == paged_user_ids[:INACTIVE_USERS]
+    
+    active, _ = walk_pages(client, admin_headers, 'limit=3&is_active=true')
+    assert active == paged_user_ids[INACTIVE_USERS:]
+    
+    later, _ = walk_pages(client, admin_headers, f'limit=3&created_from={LATER_CREATED_AT.isoformat()}')
+    assert later == paged_user_ids[SHARED_USERS:]
+    
+    # created_to é exclusivo
+    earlier, _ = walk_pages(client, admin_headers, f'limit=3&created_to={LATER_CREATED_AT.isoformat()}')
+    assert earlier == paged_user_ids[:SHARED_USERS]
+
+def test_include_total(client, admin_headers, paged_user_ids):
+    assert 'total' not in list_users(client, admin_headers, 'limit=2')
+    
+    data = list_users(client, admin_headers, 'limit=2&include_total=true&is_active=true')
+    assert data['total'] == len(paged_user_ids) - INACTIVE_USERS
+    assert len(data['users']) == 2
+    
+    # O total considera os filtros, não a página do cursor
+    second = list_users(client, admin_headers, f"limit=2&include_total=true&is_active=true&cursor={data['next_cursor']}")
+    assert second['total'] == data['total']
+
+def encode(payload: bytes) -> str:
+    return base64.urlsafe_b64encode(payload).rstrip(b'=').decode()
+
+@pytest.mark.parametrize('tamper', [
+    lambda cursor: cursor[:-4],
+    lambda cursor: '!' + cursor[1:],
+    lambda cursor: encode(b'{"id":1}'),
+    lambda cursor: encode(b'["ontem",1]'),
+    lambda cursor: encode(b'["2024-01-01T12:00:00","um"]'),
+    lambda cursor: 'nao-e-um-cursor'
+])
+def test_tampered_cursor_returns_400(client, admin_headers, paged_user_ids, tamper):
+    cursor = list_users(client, admin_headers, 'limit=2')['next_cursor']
+    
+    response = client.get(f'/api/users?email_domain={PAGED_DOMAIN}&limit=2&cursor={tamper(cursor)}',
+                          headers=admin_headers)
+    
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Cursor inválido'
+
+def test_invalid_list_params_return_400(client, admin_headers):
+    for query in ('limit=abc', 'limit=0', 'is_active=talvez', 'created_from=ontem'):
+        assert client.get(f'/api/users?{query}', headers=admin_headers).status_code == 400, query
+
+def statements_for(client, headers, counter, path):
+    """Comandos SQL de uma requisição (após uma requisição de aquecimento dos caches)"""
+    assert client.get(path, headers=headers).status_code == 200
+    counter['statements'] = 0
+    response = client.get(path, headers=headers)
+    assert response.status_code == 200
+    return counter['statements'], response.get_json()['data']['users']
+
+@pytest.mark.parametrize('include', ['include=roles', 'include_roles=true'])
+def test_include_roles_statement_count_is_constant(client, admin_headers, count_statements, include):
+    # Só os usuários com roles criados acima (os de paginação não têm roles)
+    path = f'/api/users?email_domain=test.com&{include}'
+    small, small_users = statements_for(client, admin_headers, count_statements, f'{path}&limit=5')
+    large, large_users = statements_for(client, admin_headers, count_statements, f'{path}&limit=50')
+    
+    assert len(small_users) == 5 and len(large_users) == 50
+    assert all(user['roles'] for user in large_users)
+    
+    # Usuários + roles (selectinload): não cresce com o tamanho da página
+    assert small == large
+    assert large <= 2
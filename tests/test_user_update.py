@@ -0,0 +1,30 @@
+"""
+Atualização de usuário: fila de hashing cheia na troca de senha responde 503
+"""
+from app import db
+from app.core.hashing import HashingBusyError, password_hasher
+from app.models.user import User
+from app.services.auth_service import AuthService
+
+def test_update_password_with_hashing_busy_returns_503(app, client, monkeypatch):
+    with app.app_context():
+        user = User(name='Eva Souza', email='eva@update.com')
+        user.set_password('senha123')
+        db.session.add(user)
+        db.session.commit()
+        user_id, old_hash = user.id, user.password_hash
+        headers = {'Authorization': f'Bearer {AuthService.create_access_token(user.id, user=user)}'}
+    
+    def busy(*_):
+        raise HashingBusyError('Fila de hashing de senhas cheia')
+    
+    monkeypatch.setattr(password_hasher, 'hash', busy)
+    response = client.put(f'/api/users/{user_id}', json={'name': 'Eva Lima', 'password': 'nova-senha'},
+                          headers=headers)
+    
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    with app.app_context():
+        user = db.session.get(User, user_id)
+        assert user.name == 'Eva Souza'
+        assert user.password_hash == old_hash
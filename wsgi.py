@@ -0,0 +1,27 @@
+"""
+Ponto de entrada WSGI de produção (gunicorn wsgi:app, configurado por gunicorn.conf.py)
+
+Diferente de app.py (servidor de desenvolvimento), o modo debug nunca é
+habilitado aqui, independentemente de FLASK_DEBUG, e o estado somente leitura
+é carregado antes do fork dos workers.
+"""
+import os
+
+# Produção: debug (e o debugger interativo do Werkzeug) desabilitado sempre
+os.environ['FLASK_DEBUG'] = 'False'
+
+from app import create_app
+from app.config.app import AppConfig
+from app.utils.warmup import warm_up
+
+# AppConfig pode já ter sido importado (ex: por gunicorn.conf.py) com outro valor
+AppConfig.DEBUG = False
+
+# Criar instância da aplicação (no mestre, com preload_app)
+app = create_app()
+
+if app.debug:
+    raise RuntimeError('Modo debug não pode ser habilitado no servidor de produção')
+
+# Catálogo de roles, especificação OpenAPI e /info herdados pelos workers
+warmed = warm_up(app)